@@ -1,15 +1,16 @@
 from users.services.auth_service import AuthService
 from users.helpers.response import APIResponse
-from users.helpers.request import get_token_from_request
+from users.helpers import rate_limit
+from users.helpers.auth_context import get_request_auth
 
 
 def require_admin(view_func):
     def wrapper(request, *args, **kwargs):
-        token = get_token_from_request(request)
-        if not token:
+        auth = get_request_auth(request)
+        if not auth.token:
             return APIResponse.unauthorized(message='Token not provided')
         
-        user = AuthService.get_user_from_token(token)
+        user = auth.user
         if not user:
             return APIResponse.unauthorized(message='Invalid or expired token')
         
@@ -17,5 +18,11 @@ def require_admin(view_func):
             return APIResponse.forbidden(message='Admin access required')
         
         request.user = user
-        return view_func(request, *args, **kwargs)
-    return wrapper
\ No newline at end of file
+        
+        limited = rate_limit.enforce(request, f'user:{user.id}')
+        if limited:
+            return limited
+        
+        response = view_func(request, *args, **kwargs)
+        return rate_limit.add_headers(request, response)
+    return wrapper
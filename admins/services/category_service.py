@@ -1,124 +1,127 @@
-from django.db.models import Q, Count
+from django.db import transaction
+from django.db.models import Q, Count, Sum
 from django.core.paginator import Paginator
-from django.core.cache import cache
+from users.helpers.cache_ns import CacheNamespace, succeeded
 from django.utils.text import slugify
-from users.models import Category
+from users.models import Category, Order
+from admins.services.service_service import ServiceService
+from users.helpers import cache_warmup, catalog_snapshot, catalog_version, category_summary, order_rollup
 
 
 class CategoryService:
     CACHE_TTL = 300  
+    CACHE = CacheNamespace('categories', ttl=CACHE_TTL)
     
     @staticmethod
     def get_all_categories(page=1, per_page=20, search=None, status=None, order_by='sort_order'):
         cache_key = f'categories:all:{page}:{per_page}:{search}:{status}:{order_by}'
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        queryset = Category.objects.all()
-        
-        if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | 
-                Q(description__icontains=search) |
-                Q(slug__icontains=search)
-            )
-        
-        if status:
-            queryset = queryset.filter(status=status)
-        
-        queryset = queryset.order_by(order_by)
-        
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
-        
-        result = {
-            'categories': list(page_obj.object_list.values()),
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_categories': paginator.count,
-                'per_page': per_page,
-                'has_next': page_obj.has_next(),
-                'has_previous': page_obj.has_previous()
+
+        def load():
+            queryset = Category.objects.all()
+
+            if search:
+                queryset = queryset.filter(
+                    Q(name__icontains=search) | 
+                    Q(description__icontains=search) |
+                    Q(slug__icontains=search)
+                )
+
+            if status:
+                queryset = queryset.filter(status=status)
+
+            queryset = queryset.order_by(order_by)
+
+            paginator = Paginator(queryset, per_page)
+            page_obj = paginator.get_page(page)
+
+            result = {
+                'categories': list(page_obj.object_list.values()),
+                'pagination': {
+                    'current_page': page_obj.number,
+                    'total_pages': paginator.num_pages,
+                    'total_categories': paginator.count,
+                    'per_page': per_page,
+                    'has_next': page_obj.has_next(),
+                    'has_previous': page_obj.has_previous()
+                }
             }
-        }
-        
-        cache.set(cache_key, result, CategoryService.CACHE_TTL)
-        return result
+
+            return result
+
+        return CategoryService.CACHE.fetch(cache_key, load)
     
     @staticmethod
     def get_active_categories():
-        cache_key = 'categories:active'
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        categories = Category.objects.filter(status='ACTIVE').order_by('sort_order').values(
-            'id', 'name', 'slug', 'description', 'icon', 'sort_order'
-        )
-        
-        result = {'success': True, 'categories': list(categories)}
-        cache.set(cache_key, result, CategoryService.CACHE_TTL)
-        return result
+        snapshot = catalog_snapshot.current()
+        if snapshot is not None:
+            return {'success': True, 'categories': list(snapshot.categories)}
+
+        # Versioned: entries written before the prices became floats must not be served.
+        cache_key = 'categories:active:v2'
+
+        def load():
+            categories = Category.objects.filter(status='ACTIVE').order_by('sort_order').values(
+                'id', 'name', 'slug', 'description', 'icon', 'sort_order', *category_summary.SUMMARY_FIELDS
+            )
+
+            result = {'success': True, 'categories': [category_summary.public(row) for row in categories]}
+            return result
+
+        return CategoryService.CACHE.fetch(cache_key, load)
     
     @staticmethod
     def get_category_by_id(category_id):
         cache_key = f'category:id:{category_id}'
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        try:
-            category = Category.objects.get(id=category_id)
-            result = {
-                'success': True,
-                'category': {
-                    'id': category.id,
-                    'name': category.name,
-                    'slug': category.slug,
-                    'description': category.description,
-                    'icon': category.icon,
-                    'sort_order': category.sort_order,
-                    'status': category.status,
-                    'meta_title': category.meta_title,
-                    'meta_description': category.meta_description
+
+        def load():
+            try:
+                category = Category.objects.get(id=category_id)
+                result = {
+                    'success': True,
+                    'category': {
+                        'id': category.id,
+                        'name': category.name,
+                        'slug': category.slug,
+                        'description': category.description,
+                        'icon': category.icon,
+                        'sort_order': category.sort_order,
+                        'status': category.status,
+                        'meta_title': category.meta_title,
+                        'meta_description': category.meta_description,
+                        **CategoryService._summary(category)
+                    }
                 }
-            }
-            cache.set(cache_key, result, CategoryService.CACHE_TTL)
-            return result
-        except Category.DoesNotExist:
-            return {'success': False, 'message': 'Category not found'}
+                return result
+            except Category.DoesNotExist:
+                return {'success': False, 'message': 'Category not found'}
+
+        return CategoryService.CACHE.fetch(cache_key, load, cache_if=succeeded)
     
     @staticmethod
     def get_category_by_slug(slug):
         cache_key = f'category:slug:{slug}'
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        try:
-            category = Category.objects.get(slug=slug, status='ACTIVE')
-            result = {
-                'success': True,
-                'category': {
-                    'id': category.id,
-                    'name': category.name,
-                    'slug': category.slug,
-                    'description': category.description,
-                    'icon': category.icon,
-                    'meta_title': category.meta_title,
-                    'meta_description': category.meta_description
+
+        def load():
+            try:
+                category = Category.objects.get(slug=slug, status='ACTIVE')
+                result = {
+                    'success': True,
+                    'category': {
+                        'id': category.id,
+                        'name': category.name,
+                        'slug': category.slug,
+                        'description': category.description,
+                        'icon': category.icon,
+                        'meta_title': category.meta_title,
+                        'meta_description': category.meta_description,
+                        **CategoryService._summary(category)
+                    }
                 }
-            }
-            cache.set(cache_key, result, CategoryService.CACHE_TTL)
-            return result
-        except Category.DoesNotExist:
-            return {'success': False, 'message': 'Category not found'}
+                return result
+            except Category.DoesNotExist:
+                return {'success': False, 'message': 'Category not found'}
+
+        return CategoryService.CACHE.fetch(cache_key, load, cache_if=succeeded)
     
     @staticmethod
     def create_category(name, description, icon, sort_order, status='ACTIVE', 
@@ -183,9 +186,13 @@ class CategoryService:
     def delete_category(category_id):
         try:
             category = Category.objects.get(id=category_id)
-            category.delete()
-            
+            with transaction.atomic():
+                # Services and their orders cascade; take the orders out of the rollups too.
+                order_rollup.discard(Order.objects.filter(service_id__category=category))
+                category.delete()
+            category_summary.touch(category_id)
             CategoryService._clear_cache()
+            ServiceService._clear_cache()
             
             return {'success': True, 'message': 'Category deleted successfully'}
         except Category.DoesNotExist:
@@ -217,31 +224,44 @@ class CategoryService:
     @staticmethod
     def get_category_stats():
         cache_key = 'categories:stats'
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        total = Category.objects.count()
-        active = Category.objects.filter(status='ACTIVE').count()
-        inactive = Category.objects.filter(status='INACTIVE').count()
-        
-        result = {
-            'success': True,
-            'stats': {
-                'total_categories': total,
-                'active_categories': active,
-                'inactive_categories': inactive
+
+        def load():
+            total = Category.objects.count()
+            active = Category.objects.filter(status='ACTIVE').count()
+            inactive = Category.objects.filter(status='INACTIVE').count()
+            services = Category.objects.aggregate(
+                services=Sum('active_services'),
+                featured=Sum('featured_services'),
+                empty=Count('id', filter=Q(active_services=0))
+            )
+
+            result = {
+                'success': True,
+                'stats': {
+                    'total_categories': total,
+                    'active_categories': active,
+                    'inactive_categories': inactive,
+                    'empty_categories': services['empty'],
+                    'active_services': services['services'] or 0,
+                    'featured_services': services['featured'] or 0
+                }
             }
-        }
-        
-        cache.set(cache_key, result, CategoryService.CACHE_TTL)
-        return result
+
+            return result
+
+        return CategoryService.CACHE.fetch(cache_key, load)
     
+    @staticmethod
+    def _summary(category):
+        return {
+            'active_services': category.active_services,
+            'featured_services': category.featured_services,
+            'min_price_per_100': float(category.min_price_per_100) if category.min_price_per_100 is not None else None,
+            'max_price_per_100': float(category.max_price_per_100) if category.max_price_per_100 is not None else None
+        }
+
     @staticmethod
     def _clear_cache():
-        try:
-            cache.delete_pattern('categories:*')
-            cache.delete_pattern('category:*')
-        except AttributeError:
-            cache.clear()
\ No newline at end of file
+        catalog_version.bump()
+        CategoryService.CACHE.invalidate()
+        cache_warmup.schedule()
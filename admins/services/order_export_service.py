@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+from datetime import datetime, time, timedelta
+
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from users.helpers import order_search
+from users.models import Order
+
+
+class OrderExportService:
+    # Rows per keyset query; each query is "id > last ORDER BY id LIMIT n" on the primary key.
+    BATCH_SIZE = 2000
+    FORMATS = ('csv', 'ndjson')
+
+    # Output column: values_list() path.
+    COLUMNS = {
+        'id': 'id',
+        'order_number': 'order_number',
+        'user_id': 'user_id',
+        'user_email': 'user_id__email',
+        'service_id': 'service_id',
+        'service_name': 'service_id__name',
+        'category': 'service_id__category__name',
+        'link': 'link',
+        'quantity': 'quantity',
+        'price_paid': 'price_paid',
+        'profit': 'profit',
+        'status': 'status',
+        'start_count': 'start_count',
+        'remains': 'remains',
+        'customer_note': 'customer_note',
+        'admin_note': 'admin_note',
+        'submitted_at': 'submitted_at',
+        'completed_at': 'completed_at',
+        'cancelled_at': 'cancelled_at',
+        'refunded_at': 'refunded_at',
+    }
+
+    @staticmethod
+    def latest_id():
+        """Upper bound for a new export, so a resumed download covers the same orders."""
+        return Order.objects.aggregate(latest=Max('id'))['latest'] or 0
+
+    @staticmethod
+    def filter_orders(status=None, user_id=None, service_id=None, search=None, start_date=None, end_date=None):
+        """The ``list_orders`` filters plus a submitted_at range; raises ValueError on a bad date."""
+        queryset = Order.objects.all()
+        if status:
+            queryset = queryset.filter(status=status)
+        if user_id:
+            queryset = queryset.filter(user_id=user_id)
+        if service_id:
+            queryset = queryset.filter(service_id=service_id)
+        if search:
+            queryset = order_search.filter_orders(queryset, search)
+        if start_date:
+            start, _ = OrderExportService._parse_moment(start_date)
+            queryset = queryset.filter(submitted_at__gte=start)
+        if end_date:
+            end, whole_day = OrderExportService._parse_moment(end_date)
+            if whole_day:
+                # A plain end date includes that whole day.
+                queryset = queryset.filter(submitted_at__lt=end + timedelta(days=1))
+            else:
+                queryset = queryset.filter(submitted_at__lte=end)
+        return queryset
+
+    @staticmethod
+    def _parse_moment(value):
+        """``(aware datetime, is_plain_date)`` from an ISO date or datetime string."""
+        parsed = parse_datetime(value)
+        if parsed is not None:
+            return (timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed), False
+
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Invalid date: {value}')
+        return timezone.make_aware(datetime.combine(day, time.min)), True
+
+    @staticmethod
+    def export_orders(queryset, fmt='csv', after=None, until=None):
+        """Yield ``queryset`` as CSV or NDJSON, ``BATCH_SIZE`` orders at a time, in id order.
+
+        Only orders with ``after < id <= until`` are written; a client resumes an
+        interrupted download by passing the last id it received as ``after``
+        (the CSV header is only written on the first request).
+        """
+        names = list(OrderExportService.COLUMNS)
+        paths = list(OrderExportService.COLUMNS.values())
+        queryset = queryset.order_by('id')
+        if until is not None:
+            queryset = queryset.filter(id__lte=until)
+
+        if fmt == 'csv' and after is None:
+            yield OrderExportService._csv([names])
+
+        last_id = after or 0
+        while True:
+            rows = list(queryset.filter(id__gt=last_id).values_list(*paths)[:OrderExportService.BATCH_SIZE])
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            rows = [[OrderExportService._cell(value) for value in row] for row in rows]
+
+            if fmt == 'csv':
+                yield OrderExportService._csv(rows)
+            else:
+                yield ''.join(
+                    json.dumps(dict(zip(names, row)), separators=(',', ':')) + '\n' for row in rows
+                )
+            if len(rows) < OrderExportService.BATCH_SIZE:
+                return
+
+    @staticmethod
+    def _csv(rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _cell(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if value is None or isinstance(value, (int, str)):
+            return value
+        return str(value)
@@ -0,0 +1,288 @@
+import codecs
+import csv
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+from users.models import Service, Category, Supplier
+from users.helpers import category_summary
+from admins.services.service_service import ServiceService
+
+
+class _Echo:
+    """csv.writer target that hands each formatted line straight back."""
+
+    def write(self, value):
+        return value
+
+
+class ServiceBulkService:
+    CHUNK_SIZE = 500
+    # bulk_update builds one CASE per column per batch; small batches keep that cheap.
+    UPDATE_BATCH_SIZE = 100
+    EXPORT_CHUNK_SIZE = 2000
+
+    # Columns accepted on import and written on export, in export order.
+    FIELDS = [
+        'slug', 'name', 'category_id', 'supplier_id', 'supplier_service_id',
+        'price_per_100', 'supplier_price_per_100', 'min_quantity', 'max_quantity',
+        'description', 'average_time', 'refill_enabled', 'cancel_enabled',
+        'sort_order', 'is_featured', 'status', 'meta_title', 'meta_description'
+    ]
+    REQUIRED = [
+        'name', 'category_id', 'supplier_id', 'supplier_service_id',
+        'price_per_100', 'supplier_price_per_100', 'min_quantity', 'max_quantity'
+    ]
+    KEYS = ('slug', 'supplier')
+    FORMATS = ('csv', 'ndjson')
+
+    @staticmethod
+    def read_rows(stream, fmt):
+        """Yield one dict per record from a binary line stream, without reading it all."""
+        lines = codecs.iterdecode(stream, 'utf-8-sig')
+        if fmt == 'csv':
+            yield from csv.DictReader(lines)
+            return
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield row if isinstance(row, dict) else {'__invalid__': 'Not a JSON object'}
+
+    @staticmethod
+    def import_services(rows, key='slug', dry_run=False):
+        """Create or update services from ``rows``, ``CHUNK_SIZE`` at a time.
+
+        Rows match existing services on ``slug`` or, with ``key='supplier'``, on
+        ``(supplier_id, supplier_service_id)``. Rows that fail validation or
+        conflict with another service are reported and skipped; the rest are
+        written with ``bulk_create``/``bulk_update``, updating only the columns
+        that changed. Caches are cleared once, at the end.
+        """
+        if key not in ServiceBulkService.KEYS:
+            return {'success': False, 'message': f'key must be one of: {", ".join(ServiceBulkService.KEYS)}'}
+
+        state = {
+            'categories': set(Category.objects.values_list('id', flat=True)),
+            'suppliers': set(Supplier.objects.values_list('id', flat=True)),
+            'seen_keys': set(),
+            'seen_slugs': set(),
+            'seen_names': set(),
+            'touched_categories': set(),
+        }
+        summary = {'created': 0, 'updated': 0, 'unchanged': 0, 'errors': []}
+
+        chunk = []
+        for number, row in enumerate(rows, start=1):
+            chunk.append((number, row))
+            if len(chunk) >= ServiceBulkService.CHUNK_SIZE:
+                ServiceBulkService._import_chunk(chunk, key, dry_run, state, summary)
+                chunk = []
+        if chunk:
+            ServiceBulkService._import_chunk(chunk, key, dry_run, state, summary)
+
+        if (summary['created'] or summary['updated']) and not dry_run:
+            category_summary.touch(*state['touched_categories'])
+            ServiceService._clear_cache()
+
+        summary['errors'].sort(key=lambda error: error['row'])
+        summary['rows'] = summary['created'] + summary['updated'] + summary['unchanged'] + len(summary['errors'])
+        return {'success': True, 'dry_run': dry_run, **summary}
+
+    @staticmethod
+    def _import_chunk(chunk, key, dry_run, state, summary):
+        parsed = []
+        for number, row in chunk:
+            data, error = ServiceBulkService._parse_row(row, state)
+            if error:
+                summary['errors'].append({'row': number, 'message': error})
+            else:
+                parsed.append((number, data))
+
+        if key == 'slug':
+            for _, data in parsed:
+                if 'name' in data:
+                    data.setdefault('slug', slugify(data['name']))
+        existing = ServiceBulkService._existing(parsed, key)
+
+        rows = []
+        for number, data in parsed:
+            row_key = data.get('slug') if key == 'slug' else (data.get('supplier_id'), data.get('supplier_service_id'))
+            service = existing.get(row_key)
+            if service is None:
+                data = ServiceBulkService._with_defaults(data)
+            rows.append((number, row_key, service, data))
+
+        slugs = [data['slug'] for _, _, _, data in rows if 'slug' in data]
+        names = [data['name'] for _, _, _, data in rows if 'name' in data]
+        taken = list(Service.objects.filter(Q(slug__in=slugs) | Q(name__in=names)).values('id', 'slug', 'name'))
+        slug_owner = {item['slug']: item['id'] for item in taken}
+        name_owner = {item['name']: item['id'] for item in taken}
+
+        creates, updates, update_fields = [], [], set()
+        for number, row_key, service, data in rows:
+            if row_key in state['seen_keys']:
+                error = 'Duplicate row for the same service in this import'
+            elif service is None:
+                error = ServiceBulkService._missing(data)
+            else:
+                error = None
+            if not error:
+                error = ServiceBulkService._conflict(data, service, slug_owner, name_owner, state)
+            if error:
+                summary['errors'].append({'row': number, 'message': error})
+                continue
+
+            state['seen_keys'].add(row_key)
+            state['seen_slugs'].add(data.get('slug', service.slug if service else None))
+            state['seen_names'].add(data.get('name', service.name if service else None))
+
+            if service is None:
+                creates.append((number, Service(**data, total_orders=0, total_completed=0)))
+                state['touched_categories'].add(data['category_id'])
+                continue
+
+            changed = {field: value for field, value in data.items() if getattr(service, field) != value}
+            if not changed:
+                summary['unchanged'] += 1
+                continue
+            state['touched_categories'].update((service.category_id, data.get('category_id')))
+            for field, value in changed.items():
+                setattr(service, field, value)
+            update_fields.update(changed)
+            updates.append((number, service))
+
+        if dry_run:
+            summary['created'] += len(creates)
+            summary['updated'] += len(updates)
+            return
+
+        try:
+            with transaction.atomic():
+                Service.objects.bulk_create([service for _, service in creates])
+                if updates:
+                    Service.objects.bulk_update(
+                        [service for _, service in updates], sorted(update_fields),
+                        batch_size=ServiceBulkService.UPDATE_BATCH_SIZE
+                    )
+        except DatabaseError as e:
+            # A concurrent write took a slug or name; none of this chunk was written.
+            for number, _ in creates + updates:
+                summary['errors'].append({'row': number, 'message': f'Not saved: {e}'})
+            return
+
+        summary['created'] += len(creates)
+        summary['updated'] += len(updates)
+
+    @staticmethod
+    def _parse_row(row, state):
+        if '__invalid__' in row:
+            return None, row['__invalid__']
+
+        data = {}
+        for name in ServiceBulkService.FIELDS:
+            value = row.get(name)
+            if value is None or value == '':
+                continue
+            field = Service._meta.get_field(name)
+            if isinstance(value, str):
+                value = value.strip()
+                if field.get_internal_type() == 'BooleanField':
+                    value = value.lower() in ('true', '1', 'yes', 't')
+            try:
+                value = field.to_python(value)
+                field.run_validators(value)
+            except ValidationError as e:
+                return None, f'{name}: {"; ".join(e.messages)}'
+            data[field.attname] = value
+
+        if not data:
+            return None, 'Empty row'
+        if 'category_id' in data and data['category_id'] not in state['categories']:
+            return None, f'category_id: category {data["category_id"]} not found'
+        if 'supplier_id' in data and data['supplier_id'] not in state['suppliers']:
+            return None, f'supplier_id: supplier {data["supplier_id"]} not found'
+        return data, None
+
+    @staticmethod
+    def _existing(parsed, key):
+        if key == 'slug':
+            slugs = [data['slug'] for _, data in parsed if 'slug' in data]
+            return {service.slug: service for service in Service.objects.filter(slug__in=slugs)}
+
+        pairs = {
+            (data['supplier_id'], data['supplier_service_id'])
+            for _, data in parsed if 'supplier_id' in data and 'supplier_service_id' in data
+        }
+        if not pairs:
+            return {}
+        services = Service.objects.filter(
+            supplier_id__in={supplier_id for supplier_id, _ in pairs},
+            supplier_service_id__in={service_id for _, service_id in pairs}
+        )
+        return {
+            (service.supplier_id, service.supplier_service_id): service
+            for service in services
+            if (service.supplier_id, service.supplier_service_id) in pairs
+        }
+
+    @staticmethod
+    def _with_defaults(data):
+        data = dict(data)
+        if 'name' in data:
+            data.setdefault('slug', slugify(data['name']))
+            data.setdefault('meta_title', data['name'][:100])
+        if 'description' in data:
+            data.setdefault('meta_description', data['description'])
+        return data
+
+    @staticmethod
+    def _missing(data):
+        missing = [name for name in ServiceBulkService.REQUIRED if name not in data]
+        return f'Missing required fields for a new service: {", ".join(missing)}' if missing else None
+
+    @staticmethod
+    def _conflict(data, service, slug_owner, name_owner, state):
+        service_id = service.id if service else None
+        slug, name = data.get('slug'), data.get('name')
+        if slug is not None and slug_owner.get(slug, service_id) != service_id:
+            return f'slug "{slug}" belongs to another service'
+        if name is not None and name_owner.get(name, service_id) != service_id:
+            return f'name "{name}" belongs to another service'
+        if slug is not None and slug in state['seen_slugs'] and (service is None or slug != service.slug):
+            return f'slug "{slug}" is used by an earlier row'
+        if name is not None and name in state['seen_names'] and (service is None or name != service.name):
+            return f'name "{name}" is used by an earlier row'
+        return None
+
+    @staticmethod
+    def export_services(fmt='csv', status=None, supplier_id=None, category_id=None):
+        """Yield the services as CSV or NDJSON lines, reading ``EXPORT_CHUNK_SIZE`` rows at a time."""
+        queryset = Service.objects.order_by('id')
+        if status:
+            queryset = queryset.filter(status=status)
+        if supplier_id:
+            queryset = queryset.filter(supplier_id=supplier_id)
+        if category_id:
+            queryset = queryset.filter(category_id=category_id)
+
+        rows = queryset.values_list(*ServiceBulkService.FIELDS).iterator(chunk_size=ServiceBulkService.EXPORT_CHUNK_SIZE)
+
+        if fmt == 'csv':
+            writer = csv.writer(_Echo())
+            yield writer.writerow(ServiceBulkService.FIELDS)
+            for row in rows:
+                yield writer.writerow(row)
+            return
+
+        for row in rows:
+            yield json.dumps(
+                dict(zip(ServiceBulkService.FIELDS, row)), default=str, separators=(',', ':')
+            ) + '\n'
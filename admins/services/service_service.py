@@ -1,160 +1,219 @@
 from django.db.models import Q, F, Count, Avg
 from django.core.paginator import Paginator
-from django.core.cache import cache
+from users.helpers.cache_ns import CacheNamespace, succeeded
 from django.utils.text import slugify
 from django.db import transaction
-from users.models import Service, Category, Supplier
+from users.models import Order, Service, Category, Supplier
+from users.helpers import cache_warmup, catalog_snapshot, catalog_version, category_summary, image_variants, order_rollup, service_search
+from users.helpers.json_render import WIRE_VERSION, dumps
+from users.helpers.projection import Column, Projection, full_name, media_url
 
 class ServiceService:
     CACHE_TTL = 300
+    CACHE = CacheNamespace('services', ttl=CACHE_TTL)
+
+    ADMIN_LISTING = Projection('admin', {
+        'id': 'id',
+        'name': 'name',
+        'slug': 'slug',
+        'photo': Column('photo', convert=media_url),
+        'photo_variants': Column('photo_variants', convert=image_variants.variant_urls),
+        'description': 'description',
+        'price_per_100': Column('price_per_100', convert=float),
+        'min_quantity': 'min_quantity',
+        'max_quantity': 'max_quantity',
+        'average_time': 'average_time',
+        'is_featured': 'is_featured',
+        'refill_enabled': 'refill_enabled',
+        'cancel_enabled': 'cancel_enabled',
+        'status': 'status',
+        'category': {
+            'id': 'category__id',
+            'name': 'category__name',
+            'slug': 'category__slug'
+        },
+        'supplier': {
+            'id': 'supplier__id',
+            'name': Column('supplier__first_name', 'supplier__last_name', convert=full_name),
+            'api_url': 'supplier__api_url'
+        },
+        'supplier_service_id': 'supplier_service_id',
+        'supplier_price_per_100': Column('supplier_price_per_100', convert=float),
+        'total_orders': 'total_orders',
+        'total_completed': 'total_completed'
+    })
+    # The public listing never exposes supplier details or cost prices.
+    PUBLIC_LISTING = ADMIN_LISTING.without('supplier', 'supplier_service_id', 'supplier_price_per_100', name='public')
 
     @staticmethod
     def get_all_services(page=1, per_page=20, search=None, category_id=None, 
                         supplier_id=None, status='ACTIVE', is_featured=None, 
-                        order_by='sort_order'):
-        cache_key = f"services:all:{page}:{per_page}:{search}:{category_id}:{supplier_id}:{status}:{is_featured}:{order_by}"
-        cached_data = cache.get(cache_key)
+                        order_by='sort_order', fields=None, public=False):
+        """One page of services; ``fields`` (from ``projection.select``) limits the columns read."""
+        if search:
+            search = service_search.normalize(search) or search
+        projection = ServiceService.PUBLIC_LISTING if public else ServiceService.ADMIN_LISTING
+        selected = projection.select(fields)
+        cache_key = (
+            f"services:all:{page}:{per_page}:{search}:{category_id}:{supplier_id}:{status}:{is_featured}:{order_by}"
+            f":{projection.name}:{','.join(selected)}"
+        )
 
-        if cached_data:
-            return cached_data
-        
-        queryset = Service.objects.select_related('category', 'supplier').filter(status=status)
+        def load():
+            queryset = Service.objects.filter(status=status)
 
-        if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | 
-                Q(description__icontains=search) |
-                Q(slug__icontains=search)
-            )
+            if category_id:
+                queryset = queryset.filter(category_id=category_id)
 
-        if category_id:
-            queryset = queryset.filter(category_id=category_id)
+            if supplier_id:
+                queryset = queryset.filter(supplier_id=supplier_id)
 
-        if supplier_id:
-            queryset = queryset.filter(supplier_id=supplier_id)
+            if is_featured is not None:
+                queryset = queryset.filter(is_featured=is_featured)
 
-        if is_featured is not None:
-            queryset = queryset.filter(is_featured=is_featured)
+            # Last, so the index query only ranks services these filters allow.
+            ranked = truncated = False
+            if search:
+                queryset, ranked, truncated = service_search.filter_services(queryset, search)
 
-        queryset = queryset.order_by(order_by)
+            if ranked and order_by == 'sort_order':
+                queryset = queryset.order_by('search_rank')
+            else:
+                queryset = queryset.order_by(order_by)
 
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+            paginator = Paginator(queryset.values(*projection.columns(selected)), per_page)
+            page_obj = paginator.get_page(page)
 
-        services = []
-        for service in page_obj.object_list:
-            services.append({
-                'id': service.id,
-                'name': service.name,
-                'slug': service.slug,
-                'photo': service.photo.url if service.photo else None,
-                'description': service.description,
-                'price_per_100': float(service.price_per_100),
-                'min_quantity': service.min_quantity,
-                'max_quantity': service.max_quantity,
-                'average_time': service.average_time,
-                'is_featured': service.is_featured,
-                'refill_enabled': service.refill_enabled,
-                'cancel_enabled': service.cancel_enabled,
-                'status': service.status,
-                'category': {
-                    'id': service.category.id,
-                    'name': service.category.name,
-                    'slug': service.category.slug
-                },
-                'supplier': {
-                    'id': service.supplier.id,
-                    'name': f"{service.supplier.first_name} {service.supplier.last_name}",
-                    'api_url': service.supplier.api_url,
-                },
-                'supplier_service_id': service.supplier_service_id,
-                'supplier_price_per_100': float(service.supplier_price_per_100),
-                'total_orders': service.total_orders,
-                'total_completed': service.total_completed
-            })
+            services = [projection.row(row, selected) for row in page_obj.object_list]
 
-        result = {
-            'services': services,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_services': paginator.count,
-                'per_page': per_page,
-                'has_next': page_obj.has_next(),
-                'has_previous': page_obj.has_previous()
+            result = {
+                'services': services,
+                'pagination': {
+                    'current_page': page_obj.number,
+                    'total_pages': paginator.num_pages,
+                    'total_services': paginator.count,
+                    'per_page': per_page,
+                    'has_next': page_obj.has_next(),
+                    'has_previous': page_obj.has_previous()
+                }
             }
-        }
-        
-        cache.set(cache_key, result, ServiceService.CACHE_TTL)
-        return result
+            if search:
+                # Only the best SERVICE_SEARCH_LIMIT matches are listed; say so when more matched.
+                result['pagination']['search_truncated'] = truncated
+
+            return result
+
+        return ServiceService.CACHE.fetch(cache_key, load)
+
+    @staticmethod
+    def get_all_services_encoded(**filters):
+        """``get_all_services`` as cached, pre-encoded JSON bytes for the public listing.
+
+        Plain listings of active services are paged out of the catalog snapshot
+        and memoized on it; searches keep the shared cache.
+        """
+        filters['public'] = True
+        if filters.get('search'):
+            filters['search'] = service_search.normalize(filters['search']) or filters['search']
+        cache_key = f'services:json:v{WIRE_VERSION}:all:' + ':'.join(f'{key}={value}' for key, value in sorted(filters.items()))
+        snapshot = catalog_snapshot.current()
+        from_snapshot = (
+            snapshot is not None and filters.get('status', 'ACTIVE') == 'ACTIVE' and not filters.get('search')
+            and not filters.get('supplier_id') and filters.get('order_by', 'sort_order') == 'sort_order'
+        )
+        if not from_snapshot:
+            return ServiceService.CACHE.fetch(cache_key, lambda: dumps(ServiceService.get_all_services(**filters)))
+
+        encoded = snapshot.memo.get(cache_key)
+        if encoded is None:
+            encoded = dumps(snapshot.services_page(
+                filters.get('page', 1), filters.get('per_page', 20),
+                category_id=filters.get('category_id'), is_featured=filters.get('is_featured'),
+                fields=filters.get('fields')
+            ))
+            snapshot.memo.set(cache_key, encoded)
+        return encoded
 
     @staticmethod
     def get_featured_services(limit=10):
+        snapshot = catalog_snapshot.current()
+        if snapshot is not None:
+            return {'services': [item['featured'] for item in snapshot.featured[:limit]]}
+
         cache_key = f'services:featured:{limit}'
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            return cached_data
-
-        services = Service.objects.select_related('category').filter(
-            status='ACTIVE', 
-            is_featured=True
-        ).order_by('sort_order')[:limit]
-
-        result = {
-            'services': [{
-                'id': s.id,
-                'name': s.name,
-                'slug': s.slug,
-                'photo': s.photo.url if s.photo else None,
-                'price_per_100': float(s.price_per_100),
-                'category_name': s.category.name,
-                'average_time': s.average_time
-            } for s in services]
-        }
 
-        cache.set(cache_key, result, ServiceService.CACHE_TTL)
-        return result
+        def load():
+            services = Service.objects.select_related('category').filter(
+                status='ACTIVE', 
+                is_featured=True
+            ).order_by('sort_order')[:limit]
+
+            result = {
+                'services': [ServiceService._serialize_featured(s) for s in services]
+            }
+
+            return result
+
+        return ServiceService.CACHE.fetch(cache_key, load)
 
     @staticmethod
     def get_services_by_category(category_slug, page, per_page, request):
+        snapshot = catalog_snapshot.current()
+        if snapshot is not None:
+            return ServiceService._services_by_category_from_snapshot(snapshot, category_slug, page, per_page, request)
+
         cache_key = f'services:category:{category_slug}:{page}:{per_page}'
-        cached_data = cache.get(cache_key)
 
-        if cached_data:
-            return cached_data
+        def load():
+            try:
+                category = Category.objects.get(slug=category_slug, status='ACTIVE')
+            except Category.DoesNotExist:
+                return {'success': False, 'message': 'Category not found'}
 
-        try:
-            category = Category.objects.get(slug=category_slug, status='ACTIVE')
-        except Category.DoesNotExist:
-            return {'success': False, 'message': 'Category not found'}
+            queryset = Service.objects.select_related('supplier').filter(
+                category=category,
+                status='ACTIVE'
+            ).order_by('sort_order', 'name')
 
-        queryset = Service.objects.select_related('supplier').filter(
-            category=category,
-            status='ACTIVE'
-        ).order_by('sort_order', 'name')
+            paginator = Paginator(queryset, per_page)
+            page_obj = paginator.get_page(page)
 
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+            services = [
+                ServiceService._absolute_photo(ServiceService._serialize_category_service(s), request)
+                for s in page_obj.object_list
+            ]
 
-        services = [{
-            'id': s.id,
-            'name': s.name,
-            'slug': s.slug,
-            "photo": request.build_absolute_uri(s.photo.url) if s.photo else None,
-            'description': s.description,
-            'price_per_100': float(s.price_per_100),
-            'min_quantity': s.min_quantity,
-            'max_quantity': s.max_quantity,
-            'average_time': s.average_time,
-            'refill_enabled': s.refill_enabled,
-            'cancel_enabled': s.cancel_enabled
-        } for s in page_obj.object_list]
+            result = {
+                'success': True,
+                'category': {'id': category.id, 'name': category.name, 'slug': category.slug},
+                'services': services,
+                'pagination': {
+                    'current_page': page_obj.number,
+                    'total_pages': paginator.num_pages,
+                    'total_services': paginator.count
+                }
+            }
+
+            return result
+
+        return ServiceService.CACHE.fetch(cache_key, load, cache_if=succeeded)
+
+    @staticmethod
+    def _services_by_category_from_snapshot(snapshot, category_slug, page, per_page, request):
+        category = snapshot.category_by_slug.get(category_slug)
+        if category is None:
+            return {'success': False, 'message': 'Category not found'}
 
-        result = {
+        paginator = Paginator(snapshot.by_category.get(str(category['id']), ()), per_page)
+        page_obj = paginator.get_page(page)
+
+        return {
             'success': True,
-            'category': {'id': category.id, 'name': category.name, 'slug': category.slug},
-            'services': services,
+            'category': {'id': category['id'], 'name': category['name'], 'slug': category['slug']},
+            'services': [
+                ServiceService._absolute_photo(item['category_item'], request)
+                for item in page_obj.object_list
+            ],
             'pagination': {
                 'current_page': page_obj.number,
                 'total_pages': paginator.num_pages,
@@ -162,46 +221,46 @@ class ServiceService:
             }
         }
 
-        cache.set(cache_key, result, ServiceService.CACHE_TTL)
-        return result
-
     @staticmethod
     def get_service_by_id(service_id):
         cache_key = f'service:id:{service_id}'
-        cached_data = cache.get(cache_key)
 
-        if cached_data:
-            return cached_data
+        def load():
+            try:
+                service = Service.objects.select_related('category', 'supplier').get(id=service_id)
+                result = {
+                    'success': True,
+                    'service': ServiceService._serialize_service(service, full=True)
+                }
+                return result
+            except Service.DoesNotExist:
+                return {'success': False, 'message': 'Service not found'}
 
-        try:
-            service = Service.objects.select_related('category', 'supplier').get(id=service_id)
-            result = {
-                'success': True,
-                'service': ServiceService._serialize_service(service, full=True)
-            }
-            cache.set(cache_key, result, ServiceService.CACHE_TTL)
-            return result
-        except Service.DoesNotExist:
-            return {'success': False, 'message': 'Service not found'}
+        return ServiceService.CACHE.fetch(cache_key, load, cache_if=succeeded)
 
     @staticmethod
     def get_service_by_slug(slug):
+        snapshot = catalog_snapshot.current()
+        if snapshot is not None:
+            service = snapshot.details.get(slug)
+            if service is None:
+                return {'success': False, 'message': 'Service not found'}
+            return {'success': True, 'service': service}
+
         cache_key = f'service:slug:{slug}'
-        cached_data = cache.get(cache_key)
 
-        if cached_data:
-            return cached_data
+        def load():
+            try:
+                service = Service.objects.select_related('category', 'supplier').get(slug=slug, status='ACTIVE')
+                result = {
+                    'success': True,
+                    'service': ServiceService._serialize_service(service, full=False)
+                }
+                return result
+            except Service.DoesNotExist:
+                return {'success': False, 'message': 'Service not found'}
 
-        try:
-            service = Service.objects.select_related('category', 'supplier').get(slug=slug, status='ACTIVE')
-            result = {
-                'success': True,
-                'service': ServiceService._serialize_service(service, full=False)
-            }
-            cache.set(cache_key, result, ServiceService.CACHE_TTL)
-            return result
-        except Service.DoesNotExist:
-            return {'success': False, 'message': 'Service not found'}
+        return ServiceService.CACHE.fetch(cache_key, load, cache_if=succeeded)
 
     @staticmethod
     @transaction.atomic
@@ -244,7 +303,9 @@ class ServiceService:
                 total_completed=0
             )
 
+            category_summary.touch(service.category_id)
             ServiceService._clear_cache()
+            image_variants.enqueue(service)
             return {'success': True, 'service': service, 'message': 'Service created successfully'}
         except Exception as e:
             return {'success': False, 'message': f'Failed to create service: {str(e)}'}
@@ -254,6 +315,7 @@ class ServiceService:
     def update_service(service_id, data, files=None):
         try:
             service = Service.objects.select_related('category', 'supplier').get(id=service_id)
+            old_category_id = service.category_id
 
             # CRITICAL: Work with a real mutable dict
             data = dict(data)
@@ -303,11 +365,17 @@ class ServiceService:
                     setattr(service, key, value)
 
             # === File upload ===
-            if files and "photo" in files:
+            photo_changed = bool(files and "photo" in files)
+            if photo_changed:
                 service.photo = files["photo"]
+                # Old variants belong to the old photo; serve the original until new ones exist.
+                service.photo_variants = {}
 
             service.save()
+            category_summary.touch(old_category_id, service.category_id)
             ServiceService._clear_cache()
+            if photo_changed:
+                image_variants.enqueue(service)
 
             return {
                 "success": True,
@@ -328,7 +396,11 @@ class ServiceService:
     def delete_service(service_id):
         try:
             service = Service.objects.get(id=service_id)
-            service.delete()
+            with transaction.atomic():
+                # The service's orders cascade; take them out of the per-customer rollups too.
+                order_rollup.discard(Order.objects.filter(service_id=service))
+                service.delete()
+            category_summary.touch(service.category_id)
             ServiceService._clear_cache()
             return {'success': True, 'message': 'Service deleted successfully'}
         except Service.DoesNotExist:
@@ -338,6 +410,7 @@ class ServiceService:
     def update_service_status(service_id, status):
         try:
             Service.objects.filter(id=service_id).update(status=status)
+            category_summary.touch(*Service.objects.filter(id=service_id).values_list('category_id', flat=True))
             ServiceService._clear_cache()
             return {'success': True, 'message': f'Service status updated to {status}'}
         except Exception as e:
@@ -346,9 +419,10 @@ class ServiceService:
     @staticmethod
     def toggle_featured(service_id):
         try:
-            service = Service.objects.only('id', 'is_featured').get(id=service_id)
+            service = Service.objects.only('id', 'is_featured', 'category_id').get(id=service_id)
             new_status = not service.is_featured
             Service.objects.filter(id=service_id).update(is_featured=new_status)
+            category_summary.touch(service.category_id)
             ServiceService._clear_cache()
             return {'success': True, 'is_featured': new_status}
         except Service.DoesNotExist:
@@ -357,30 +431,70 @@ class ServiceService:
     @staticmethod
     def get_service_stats():
         cache_key = 'services:stats'
-        cached_data = cache.get(cache_key)
 
-        if cached_data:
-            return cached_data
+        def load():
+            total = Service.objects.count()
+            active = Service.objects.filter(status='ACTIVE').count()
+            inactive = Service.objects.filter(status='INACTIVE').count()
+            featured = Service.objects.filter(is_featured=True, status='ACTIVE').count()
+            total_orders = Service.objects.aggregate(total=Count('total_orders'))['total'] or 0
 
-        total = Service.objects.count()
-        active = Service.objects.filter(status='ACTIVE').count()
-        inactive = Service.objects.filter(status='INACTIVE').count()
-        featured = Service.objects.filter(is_featured=True, status='ACTIVE').count()
-        total_orders = Service.objects.aggregate(total=Count('total_orders'))['total'] or 0
-
-        result = {
-            'success': True,
-            'stats': {
-                'total_services': total,
-                'active_services': active,
-                'inactive_services': inactive,
-                'featured_services': featured,
-                'total_orders': total_orders
+            result = {
+                'success': True,
+                'stats': {
+                    'total_services': total,
+                    'active_services': active,
+                    'inactive_services': inactive,
+                    'featured_services': featured,
+                    'total_orders': total_orders
+                }
             }
+
+            return result
+
+        return ServiceService.CACHE.fetch(cache_key, load)
+
+    @staticmethod
+    def _serialize_featured(s):
+        return {
+            'id': s.id,
+            'name': s.name,
+            'slug': s.slug,
+            'photo': s.photo.url if s.photo else None,
+            'photo_variants': image_variants.variant_urls(s.photo_variants),
+            'price_per_100': float(s.price_per_100),
+            'category_name': s.category.name,
+            'average_time': s.average_time
+        }
+
+    @staticmethod
+    def _serialize_category_service(s):
+        return {
+            'id': s.id,
+            'name': s.name,
+            'slug': s.slug,
+            "photo": s.photo.url if s.photo else None,
+            'photo_variants': image_variants.variant_urls(s.photo_variants),
+            'description': s.description,
+            'price_per_100': float(s.price_per_100),
+            'min_quantity': s.min_quantity,
+            'max_quantity': s.max_quantity,
+            'average_time': s.average_time,
+            'refill_enabled': s.refill_enabled,
+            'cancel_enabled': s.cancel_enabled
         }
 
-        cache.set(cache_key, result, ServiceService.CACHE_TTL)
-        return result
+    @staticmethod
+    def _absolute_photo(data, request):
+        if data['photo']:
+            data = {
+                **data,
+                'photo': request.build_absolute_uri(data['photo']),
+                'photo_variants': {
+                    name: request.build_absolute_uri(url) for name, url in data['photo_variants'].items()
+                }
+            }
+        return data
 
     @staticmethod
     def _serialize_service(service, full=True):
@@ -389,6 +503,7 @@ class ServiceService:
             'name': service.name,
             'slug': service.slug,
             'photo': service.photo.url if service.photo else None,
+            'photo_variants': image_variants.variant_urls(service.photo_variants),
             'description': service.description,
             'price_per_100': float(service.price_per_100),
             'min_quantity': service.min_quantity,
@@ -424,8 +539,6 @@ class ServiceService:
 
     @staticmethod
     def _clear_cache():
-        try:
-            cache.delete_pattern('services:*')
-            cache.delete_pattern('service:*')
-        except AttributeError:
-            cache.clear()
\ No newline at end of file
+        catalog_version.bump()
+        ServiceService.CACHE.invalidate()
+        cache_warmup.schedule()
@@ -1,104 +1,101 @@
+from django.db import transaction
 from django.db.models import Q
 from django.core.paginator import Paginator
-from django.core.cache import cache
-from users.models import Supplier
+from users.helpers.cache_ns import CacheNamespace, succeeded
+from users.models import Order, Supplier
+from users.helpers import catalog_version, category_summary, order_rollup
 
 
 class SupplierService:
     CACHE_TTL = 300
+    CACHE = CacheNamespace('suppliers', ttl=CACHE_TTL)
 
     @staticmethod
     def get_all_suppliers(page=1, per_page=20, search=None, status=None, order_by='-id'):
         cache_key = f"suppliers:all:{page}:{per_page}:{search}:{status}:{order_by}"
-        cached_data = cache.get(cache_key)
 
-        if cached_data:
-            return cached_data
-        
-        queryset = Supplier.objects.all()
+        def load():
+            queryset = Supplier.objects.all()
 
-        if search:
-            queryset = queryset.filter(
-                Q(first_name__icontains=search) | 
-                Q(last_name__icontains=search) |
-                Q(description__icontains=search)
-            )
+            if search:
+                queryset = queryset.filter(
+                    Q(first_name__icontains=search) | 
+                    Q(last_name__icontains=search) |
+                    Q(description__icontains=search)
+                )
 
-        if status:
-            queryset = queryset.filter(status=status)
+            if status:
+                queryset = queryset.filter(status=status)
 
-        queryset = queryset.order_by(order_by)
+            queryset = queryset.order_by(order_by)
 
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+            paginator = Paginator(queryset, per_page)
+            page_obj = paginator.get_page(page)
 
-        result = {
-            'success': True,
-            'suppliers': list(page_obj.object_list.values()),
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_suppliers': paginator.count,
-                'per_page': per_page,
-                'has_next': page_obj.has_next(),
-                'has_previous': page_obj.has_previous()
+            result = {
+                'success': True,
+                'suppliers': list(page_obj.object_list.values()),
+                'pagination': {
+                    'current_page': page_obj.number,
+                    'total_pages': paginator.num_pages,
+                    'total_suppliers': paginator.count,
+                    'per_page': per_page,
+                    'has_next': page_obj.has_next(),
+                    'has_previous': page_obj.has_previous()
+                }
             }
-        }
-        cache.set(cache_key, result, SupplierService.CACHE_TTL)
-        return result
+            return result
+
+        return SupplierService.CACHE.fetch(cache_key, load)
     
 
     @staticmethod
     def get_active_suppliers():
         cache_key = 'suppliers:active'
-        cached_data = cache.get(cache_key)
 
-        if cached_data:
-            return cached_data
-        
-        suppliers = Supplier.objects.filter(status='ACTIVE').values(
-            'id', 'first_name', 'last_name', 'api_type', 'currency', 
-            'status', 'min_order_amount', 'max_order_amount', 'description'
-        )
-        result = {'success': True, 'suppliers': list(suppliers)}
-        cache.set(cache_key, result, SupplierService.CACHE_TTL)
-        return result
+        def load():
+            suppliers = Supplier.objects.filter(status='ACTIVE').values(
+                'id', 'first_name', 'last_name', 'api_type', 'currency', 
+                'status', 'min_order_amount', 'max_order_amount', 'description'
+            )
+            result = {'success': True, 'suppliers': list(suppliers)}
+            return result
+
+        return SupplierService.CACHE.fetch(cache_key, load)
     
     @staticmethod
     def get_supplier_by_id(supplier_id):
         cache_key = f'supplier:id:{supplier_id}'
-        cached_data = cache.get(cache_key)
 
-        if cached_data:
-            return cached_data
-        
-        try:
-            supplier = Supplier.objects.get(id=supplier_id)
-            result = {
-                'success': True,
-                'supplier': {
-                    'id': supplier.id,
-                    'first_name': supplier.first_name,
-                    'last_name': supplier.last_name,
-                    'api_url': supplier.api_url,
-                    'api_key': supplier.api_key,
-                    'api_type': supplier.api_type,
-                    'currency': supplier.currency,
-                    'rate_multipler': supplier.rate_multipler,
-                    'status': supplier.status,
-                    'min_order_amount': supplier.min_order_amount,
-                    'max_order_amount': supplier.max_order_amount,
-                    'last_sync_at': str(supplier.last_sync_at) if supplier.last_sync_at else None,
-                    'sync_enabled': supplier.sync_enabled,
-                    'description': supplier.description,
-                    'support_url': supplier.support_url,
-                    'terms_url': supplier.terms_url
+        def load():
+            try:
+                supplier = Supplier.objects.get(id=supplier_id)
+                result = {
+                    'success': True,
+                    'supplier': {
+                        'id': supplier.id,
+                        'first_name': supplier.first_name,
+                        'last_name': supplier.last_name,
+                        'api_url': supplier.api_url,
+                        'api_key': supplier.api_key,
+                        'api_type': supplier.api_type,
+                        'currency': supplier.currency,
+                        'rate_multipler': supplier.rate_multipler,
+                        'status': supplier.status,
+                        'min_order_amount': supplier.min_order_amount,
+                        'max_order_amount': supplier.max_order_amount,
+                        'last_sync_at': str(supplier.last_sync_at) if supplier.last_sync_at else None,
+                        'sync_enabled': supplier.sync_enabled,
+                        'description': supplier.description,
+                        'support_url': supplier.support_url,
+                        'terms_url': supplier.terms_url
+                    }
                 }
-            }
-            cache.set(cache_key, result, SupplierService.CACHE_TTL)
-            return result
-        except Supplier.DoesNotExist:
-            return {'success': False, 'message': 'Supplier not found'}
+                return result
+            except Supplier.DoesNotExist:
+                return {'success': False, 'message': 'Supplier not found'}
+
+        return SupplierService.CACHE.fetch(cache_key, load, cache_if=succeeded)
         
 
     @staticmethod
@@ -157,7 +154,12 @@ class SupplierService:
     def delete_supplier(supplier_id):
         try:
             supplier = Supplier.objects.get(id=supplier_id)
-            supplier.delete()
+            # Deleting the supplier cascades to its services.
+            category_ids = set(supplier.services.values_list('category_id', flat=True))
+            with transaction.atomic():
+                order_rollup.discard(Order.objects.filter(service_id__supplier=supplier))
+                supplier.delete()
+            category_summary.touch(*category_ids)
             SupplierService._clear_cache()
             return {'success': True, 'message': 'Supplier deleted successfully'}
         except Supplier.DoesNotExist:
@@ -201,33 +203,28 @@ class SupplierService:
     @staticmethod
     def get_supplier_stats():
         cache_key = 'suppliers:stats'
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        total = Supplier.objects.count()
-        active = Supplier.objects.filter(status='ACTIVE').count()
-        inactive = Supplier.objects.filter(status='INACTIVE').count()
-        maintenance = Supplier.objects.filter(status='MAINTENANCE').count()
-        
-        result = {
-            'success': True,
-            'stats': {
-                'total_suppliers': total,
-                'active_suppliers': active,
-                'inactive_suppliers': inactive,
-                'maintenance_suppliers': maintenance
+
+        def load():
+            total = Supplier.objects.count()
+            active = Supplier.objects.filter(status='ACTIVE').count()
+            inactive = Supplier.objects.filter(status='INACTIVE').count()
+            maintenance = Supplier.objects.filter(status='MAINTENANCE').count()
+
+            result = {
+                'success': True,
+                'stats': {
+                    'total_suppliers': total,
+                    'active_suppliers': active,
+                    'inactive_suppliers': inactive,
+                    'maintenance_suppliers': maintenance
+                }
             }
-        }
-        
-        cache.set(cache_key, result, SupplierService.CACHE_TTL)
-        return result
+
+            return result
+
+        return SupplierService.CACHE.fetch(cache_key, load)
 
     @staticmethod
     def _clear_cache():
-        try:
-            cache.delete_pattern('suppliers:*')
-            cache.delete_pattern('supplier:*')
-        except AttributeError:
-            cache.clear()
\ No newline at end of file
+        catalog_version.bump()
+        SupplierService.CACHE.invalidate()
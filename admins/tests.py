@@ -1,3 +1,43 @@
-from django.test import TestCase
+from django.test import Client, TestCase, override_settings
+from users.models import User
+from users.services.auth_service import AuthService
 
-# Create your tests here.
+
+# Tokens, principals and the detail targets all live in the default cache.
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PerfDetailTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(
+            first_name='Admin', last_name='User', email='admin@example.com',
+            password='!', phone_number='1', role='ADMIN'
+        )
+
+    def setUp(self):
+        token = AuthService._generate_token(self.admin)[0]
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def post(self, body):
+        return self.client.post('/api-admin/perf/detail', body, content_type='application/json')
+
+    def test_malformed_payloads_get_400(self):
+        for body in ('{"user_id": "abc"}', '{"user_id": [1]}', '{"api_key_prefix": 5}', '[1, 2]', 'not json'):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body).status_code, 400)
+
+    def test_enabled_must_be_a_bool(self):
+        for body in ('{"user_id": 7, "enabled": "false"}', '{"user_id": 7, "enabled": 0}'):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body).status_code, 400)
+
+    def test_missing_identity_is_rejected(self):
+        self.assertEqual(self.post('{}').status_code, 422)
+
+    def test_enables_detail_for_a_user(self):
+        response = self.post('{"user_id": "7"}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('user:7', response.json()['data']['targets'])
+
+        response = self.post('{"user_id": 7, "enabled": false}')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('user:7', response.json()['data']['targets'])
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import user_views, category_views, supplier_views, service_views, order_views, comment_views
+from .views import user_views, category_views, supplier_views, service_views, order_views, comment_views, perf_views
 from users.views import ticket_views
 
 app_name = 'admins'
@@ -14,6 +14,8 @@ urlpatterns = [
     path('users/<int:user_id>/role', user_views.update_user_role, name='update_user_role'),
     path('users/<int:user_id>/toggle-api', user_views.toggle_api_access, name='toggle_api_access'),
     path('stats', user_views.get_stats, name='get_stats'),
+    path('perf/detail', perf_views.perf_detail, name='perf_detail'),
+    path('perf/cache', perf_views.perf_cache, name='perf_cache'),
 
     path('categories', category_views.list_categories, name='list_categories'),
     path('categories/<int:category_id>', category_views.get_category, name='get_category'),
@@ -42,6 +44,8 @@ urlpatterns = [
     path('services/<int:service_id>/status', service_views.update_service_status, name='update_service_status'),
     path('services/<int:service_id>/toggle-featured', service_views.toggle_featured, name='toggle_featured'),
     path('services/stats', service_views.get_stats, name='get_service_stats'),
+    path('services/import', service_views.import_services, name='import_services'),
+    path('services/export', service_views.export_services, name='export_services'),
 
     path('orders/dashboard-stats', order_views.get_dashboard_stats, name='get_dashboard_stats'),
     path('orders/analytics', order_views.get_analytics, name='get_analytics'),
@@ -53,6 +57,7 @@ urlpatterns = [
     path('orders/bulk-update', order_views.bulk_update_orders, name='bulk_update_orders'),
     path('orders/bulk-delete', order_views.bulk_delete_orders, name='bulk_delete_orders'),
     path('orders/stats', order_views.get_stats, name='get_order_stats'),
+    path('orders/export', order_views.export_orders, name='export_orders'),
     path('orders/by-service/<int:service_id>', order_views.get_orders_by_service, name='get_orders_by_service'),
     path('orders/<int:order_id>/update', order_views.update_order, name='update_order'),
     path('orders/<int:order_id>/delete', order_views.delete_order, name='delete_order'),
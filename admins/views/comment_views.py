@@ -2,7 +2,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from users.services.service_features_service import ServiceFeaturesService
 from users.helpers.response import APIResponse
-from users.helpers.request import parse_json_body
+from users.helpers.request import parse_json_body, get_page_cursor
 from admins.helpers.require_admin import require_admin
 
 
@@ -69,9 +69,14 @@ def get_pending_comments(request):
     page = int(request.GET.get('page', 1))
     per_page = int(request.GET.get('per_page', 20))
     
+    cursor, error = get_page_cursor(request)
+    if error:
+        return error
+
     result = ServiceFeaturesService.get_pending_comments_admin(
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        cursor=cursor
     )
     
     return APIResponse.success(data=result)
@@ -84,9 +89,14 @@ def get_reported_comments(request):
     page = int(request.GET.get('page', 1))
     per_page = int(request.GET.get('per_page', 20))
     
+    cursor, error = get_page_cursor(request)
+    if error:
+        return error
+
     result = ServiceFeaturesService.get_reported_comments_admin(
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        cursor=cursor
     )
     
     return APIResponse.success(data=result)
\ No newline at end of file
@@ -1,8 +1,10 @@
 from django.views.decorators.csrf import csrf_exempt
+from django.http import StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from users.services.order_service import OrderService
+from admins.services.order_export_service import OrderExportService
 from users.helpers.response import APIResponse
-from users.helpers.request import parse_json_body
+from users.helpers.request import parse_json_body, get_page_cursor
 from admins.helpers.require_admin import require_admin
 
 
@@ -16,6 +18,9 @@ def list_orders(request):
     user_id = request.GET.get('user_id')
     search = request.GET.get('search')
     order_by = request.GET.get('order_by', '-submitted_at')
+    cursor, error = get_page_cursor(request)
+    if error:
+        return error
     
     result = OrderService.get_all_orders_admin(
         page=page,
@@ -23,7 +28,8 @@ def list_orders(request):
         status=status,
         user_id=user_id,
         search=search,
-        order_by=order_by
+        order_by=order_by,
+        cursor=cursor
     )
     
     return APIResponse.success(data=result)
@@ -275,25 +281,45 @@ def get_pending_count(request):
 @require_http_methods(["GET"])
 @require_admin
 def export_orders(request):
-    status = request.GET.get('status')
-    user_id = request.GET.get('user_id')
-    start_date = request.GET.get('start_date')
-    end_date = request.GET.get('end_date')
-    
-    result = OrderService.export_orders_admin(
-        status=status,
-        user_id=user_id,
-        start_date=start_date,
-        end_date=end_date
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in OrderExportService.FORMATS:
+        return APIResponse.validation_error(
+            errors={'format': f'format must be one of: {", ".join(OrderExportService.FORMATS)}'},
+            message='Invalid format'
+        )
+
+    errors = {}
+    bounds = {}
+    for name in ('after', 'until'):
+        value = request.GET.get(name)
+        if value:
+            try:
+                bounds[name] = int(value)
+            except ValueError:
+                errors[name] = f'{name} must be an order id'
+    try:
+        queryset = OrderExportService.filter_orders(
+            status=request.GET.get('status'),
+            user_id=request.GET.get('user_id'),
+            service_id=request.GET.get('service_id'),
+            search=request.GET.get('search'),
+            start_date=request.GET.get('start_date'),
+            end_date=request.GET.get('end_date')
+        )
+    except ValueError as e:
+        errors['date'] = str(e)
+    if errors:
+        return APIResponse.validation_error(errors=errors, message='Invalid export parameters')
+
+    # Resuming with the first response's X-Export-Until keeps later orders out of the file.
+    until = bounds.get('until') or OrderExportService.latest_id()
+    response = StreamingHttpResponse(
+        OrderExportService.export_orders(queryset, fmt=fmt, after=bounds.get('after'), until=until),
+        content_type='text/csv' if fmt == 'csv' else 'application/x-ndjson'
     )
-    
-    if result['success']:
-        return APIResponse.success(data={
-            'orders': result['orders'],
-            'total_count': result['total_count']
-        })
-    
-    return APIResponse.error(message='Failed to export orders')
+    response['Content-Disposition'] = f'attachment; filename="orders.{fmt}"'
+    response['X-Export-Until'] = str(until)
+    return response
 
 
 @csrf_exempt
@@ -0,0 +1,71 @@
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from users.helpers import cache_ns, metrics, perf
+from users.helpers.response import APIResponse
+from users.helpers.request import parse_json_body
+from admins.helpers.require_admin import require_admin
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+@require_admin
+def perf_detail(request):
+    if request.method == 'GET':
+        return APIResponse.success(data={'targets': sorted(perf.detail_targets())})
+    
+    data, error = parse_json_body(request)
+    if error:
+        return error
+    if not isinstance(data, dict):
+        return APIResponse.error(message='Request body must be a JSON object', status_code=400)
+    
+    if data.get('user_id'):
+        try:
+            identity = f"user:{int(data['user_id'])}"
+        except (TypeError, ValueError):
+            return APIResponse.error(
+                message='Invalid user_id',
+                errors={'user_id': 'user_id must be an integer'},
+                status_code=400
+            )
+    elif data.get('api_key_prefix'):
+        if not isinstance(data['api_key_prefix'], str):
+            return APIResponse.error(
+                message='Invalid api_key_prefix',
+                errors={'api_key_prefix': 'api_key_prefix must be a string'},
+                status_code=400
+            )
+        identity = f"key:{data['api_key_prefix']}"
+    else:
+        return APIResponse.validation_error(
+            errors={'user_id': 'user_id or api_key_prefix is required'},
+            message='Missing required fields: user_id or api_key_prefix'
+        )
+    
+    enabled = data.get('enabled', True)
+    if not isinstance(enabled, bool):
+        return APIResponse.error(
+            message='Invalid enabled',
+            errors={'enabled': 'enabled must be true or false'},
+            status_code=400
+        )
+    targets = perf.set_detail(identity, enabled)
+    return APIResponse.success(
+        data={'targets': targets},
+        message=f'Full perf detail {"enabled" if enabled else "disabled"} for {identity}'
+    )
+
+
+@require_http_methods(["GET"])
+@require_admin
+def perf_cache(request):
+    metrics.flush()
+    namespaces = {}
+    for name in sorted(cache_ns.NAMESPACES):
+        counts = metrics.read(name)
+        lookups = counts.get('hit', 0) + counts.get('stale', 0) + counts.get('refresh', 0) + counts.get('miss', 0)
+        namespaces[name[len('cache.'):]] = {
+            **counts,
+            'hit_ratio': round((counts.get('hit', 0) + counts.get('stale', 0)) / lookups, 4) if lookups else None
+        }
+    return APIResponse.success(data={'namespaces': namespaces})
@@ -1,8 +1,10 @@
 from django.views.decorators.csrf import csrf_exempt
+from django.http import StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from admins.services.service_service import ServiceService
+from admins.services.service_bulk_service import ServiceBulkService
 from users.helpers.response import APIResponse
-from users.helpers.request import parse_json_body
+from users.helpers.request import get_fields, parse_json_body
 from admins.helpers.require_admin import require_admin
 
 @csrf_exempt
@@ -21,6 +23,10 @@ def list_services(request):
     if is_featured:
         is_featured = is_featured.lower() == 'true'
     
+    fields, error = get_fields(request, ServiceService.ADMIN_LISTING)
+    if error:
+        return error
+    
     result = ServiceService.get_all_services(
         page=page,
         per_page=per_page,
@@ -29,7 +35,8 @@ def list_services(request):
         supplier_id=supplier_id,
         status=status,
         is_featured=is_featured,
-        order_by=order_by
+        order_by=order_by,
+        fields=fields
     )
     
     return APIResponse.success(data=result)
@@ -202,4 +209,62 @@ def toggle_featured(request, service_id):
 @require_admin
 def get_stats(request):
     result = ServiceService.get_service_stats()
-    return APIResponse.success(data=result['stats'])
\ No newline at end of file
+    return APIResponse.success(data=result['stats'])
+
+def _bulk_format(request):
+    fmt = request.GET.get('format')
+    if not fmt:
+        content_type = request.content_type or ''
+        fmt = 'ndjson' if 'ndjson' in content_type or 'jsonl' in content_type else 'csv'
+    return fmt
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@require_admin
+def import_services(request):
+    fmt = _bulk_format(request)
+    if fmt not in ServiceBulkService.FORMATS:
+        return APIResponse.validation_error(
+            errors={'format': f'format must be one of: {", ".join(ServiceBulkService.FORMATS)}'},
+            message='Invalid format'
+        )
+    
+    # The body is read line by line, never loaded whole.
+    result = ServiceBulkService.import_services(
+        ServiceBulkService.read_rows(request, fmt),
+        key=request.GET.get('key', 'slug'),
+        dry_run=request.GET.get('dry_run', '').lower() in ['true', '1', 'yes']
+    )
+    
+    if result.pop('success'):
+        return APIResponse.success(
+            data=result,
+            message=f"{result['created']} created, {result['updated']} updated, {len(result['errors'])} rejected"
+        )
+    
+    return APIResponse.error(message=result['message'])
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@require_admin
+def export_services(request):
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in ServiceBulkService.FORMATS:
+        return APIResponse.validation_error(
+            errors={'format': f'format must be one of: {", ".join(ServiceBulkService.FORMATS)}'},
+            message='Invalid format'
+        )
+    
+    response = StreamingHttpResponse(
+        ServiceBulkService.export_services(
+            fmt=fmt,
+            status=request.GET.get('status'),
+            supplier_id=request.GET.get('supplier_id'),
+            category_id=request.GET.get('category_id')
+        ),
+        content_type='text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    )
+    response['Content-Disposition'] = f'attachment; filename="services.{fmt}"'
+    return response
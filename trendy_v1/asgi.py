@@ -1,16 +1,18 @@
 import os
 from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
 from django.core.asgi import get_asgi_application
-from users.routing import websocket_urlpatterns
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "trendy_v1.settings")
 
 django_asgi_app = get_asgi_application()
 
+# Imported after the app registry is ready: both pull in models.
+from users.middleware import JWTAuthMiddleware  # noqa: E402
+from users.routing import websocket_urlpatterns  # noqa: E402
+
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
-    "websocket": AuthMiddlewareStack(
+    "websocket": JWTAuthMiddleware(
         URLRouter(
             websocket_urlpatterns
         )
@@ -57,12 +57,14 @@ ASGI_APPLICATION = 'trendy_v1.asgi.application'
 
 
 MIDDLEWARE = [
+    'users.middleware.PerfMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'users.middleware.AuthContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'users.middleware.JSONOnlyMiddleware',
@@ -110,7 +112,13 @@ DATABASES = {
         'PORT': os.getenv('DB_PORT', ''),
         'OPTIONS': {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'"
-        } if os.getenv('DB_ENGINE') == 'django.db.backends.mysql' else {},
+        } if os.getenv('DB_ENGINE') == 'django.db.backends.mysql' else {
+            # Background writers (session audit trail) share the file with request
+            # transactions; IMMEDIATE makes them queue instead of failing with
+            # "database is locked".
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
@@ -160,7 +168,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CACHES = {
     'default': {
-        'BACKEND': 'django_redis.cache.RedisCache',
+        'BACKEND': 'users.cache.InstrumentedRedisCache',
         "LOCATION": f"redis://{os.getenv('REDIS_HOST', '127.0.0.1')}:{os.getenv('REDIS_PORT', '6379')}/1",
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
@@ -170,8 +178,80 @@ CACHES = {
     }
 }
 
+# Per-route request budgets as (requests, window_seconds), keyed by URL name.
+# Counted separately for every API key / user; see users/helpers/rate_limit.py.
+RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'redis')
+RATE_LIMIT_PER_IP = (1200, 60)
+RATE_LIMITS = {
+    'default': (600, 60),
+    'users:list_services': (300, 60),
+    'users:featured_services': (300, 60),
+    'users:services_by_category': (300, 60),
+    'users:get_service': (300, 60),
+    'users:user_orders': (120, 60),
+    'users:payment_status': (60, 60),
+}
+
+# Password hashing runs on a process pool; 0 workers hashes inline.
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv('PASSWORD_HASH_QUEUE_LIMIT', max(1, PASSWORD_HASH_WORKERS) * 8))
+PASSWORD_HASH_RETRY_AFTER = 2
+
+# Public catalog reads are served from a per-process snapshot; see users/helpers/catalog_snapshot.py.
+CATALOG_SNAPSHOT_ENABLED = os.getenv('CATALOG_SNAPSHOT_ENABLED', 'True') == 'True'
+CATALOG_SNAPSHOT_MAX_AGE = 300
+
+# Cached reads go through cache_ns.fetch: soft TTLs are jittered by CACHE_TTL_JITTER,
+# entries are served stale for CACHE_STALE_TTL seconds while one worker refreshes them.
+CACHE_STALE_TTL = 120
+CACHE_TTL_JITTER = 0.1
+CACHE_LOCK_TIMEOUT = 30
+CACHE_LOCK_WAIT = 2.0
+
+# Re-warm the busiest catalog pages and admin stats after catalog writes; see users/helpers/cache_warmup.py.
+CACHE_WARMUP_ON_INVALIDATE = os.getenv('CACHE_WARMUP_ON_INVALIDATE', 'False') == 'True'
+CACHE_WARMUP_TOP = 50
+
+# 'auto' picks FTS5 / tsvector / FULLTEXT by database vendor; 'basic' scans with icontains.
+SERVICE_SEARCH_BACKEND = os.getenv('SERVICE_SEARCH_BACKEND', 'auto')
+# Ranked searches list at most this many matches; listings flag pagination.search_truncated beyond it.
+SERVICE_SEARCH_LIMIT = 1000
+
+# Admin dashboard order totals are live Redis counters pushed to AdminDashboardConsumer;
+# see users/helpers/dashboard_counters.py. They are rewritten from the rollups every
+# DASHBOARD_RECONCILE_INTERVAL seconds.
+DASHBOARD_COUNTERS_ENABLED = os.getenv('DASHBOARD_COUNTERS_ENABLED', 'True') == 'True'
+DASHBOARD_PUSH_INTERVAL = 1.0
+DASHBOARD_RECONCILE_INTERVAL = 900
+
+# Order/ticket/transaction numbers come from users/helpers/ids.py. Each process leases a node
+# number (0-1023) in Redis for ID_NODE_LEASE seconds unless ID_NODE pins one.
+ID_NODE = int(os.environ['ID_NODE']) if os.getenv('ID_NODE') else None
+ID_NODE_LEASE = 3600
+
+# Per-request Server-Timing/log sampling; see users/helpers/perf.py.
+PERF_INSTRUMENTATION = os.getenv('PERF_INSTRUMENTATION', 'True') == 'True'
+PERF_SAMPLE_RATE = float(os.getenv('PERF_SAMPLE_RATE', '0.01'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'users.perf': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Serve MEDIA_URL from Django outside DEBUG too. Originals are cached for MEDIA_CACHE_MAX_AGE
+# seconds; content-hashed photo variants (photos/variants/) for a year.
+SERVE_MEDIA = os.getenv('SERVE_MEDIA', 'False') == 'True'
+MEDIA_CACHE_MAX_AGE = 86400
+# Render thumbnail/card variants of service photos in the background after upload.
+IMAGE_VARIANTS_ENABLED = True
 
 UNFOLD = {
     "SITE_TITLE": "Trendy Admin",
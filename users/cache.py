@@ -0,0 +1,29 @@
+from django_redis.cache import RedisCache
+from users.helpers import perf
+
+
+class InstrumentedRedisCache(RedisCache):
+    """django-redis backend that reports gets, hits and sets to ``perf``."""
+
+    def get(self, key, default=None, version=None, client=None):
+        value = super().get(key, default=default, version=version, client=client)
+        perf.record_cache_get(1, int(value is not default))
+        return value
+
+    def get_many(self, keys, *args, **kwargs):
+        keys = list(keys)
+        values = super().get_many(keys, *args, **kwargs)
+        perf.record_cache_get(len(keys), len(values))
+        return values
+
+    def set(self, *args, **kwargs):
+        perf.record_cache_set()
+        return super().set(*args, **kwargs)
+
+    def add(self, *args, **kwargs):
+        perf.record_cache_set()
+        return super().add(*args, **kwargs)
+
+    def set_many(self, data, *args, **kwargs):
+        perf.record_cache_set(len(data))
+        return super().set_many(data, *args, **kwargs)
@@ -1,27 +1,35 @@
-from rest_framework.request import Request
+from functools import wraps
 from rest_framework.exceptions import PermissionDenied
-from rest_framework_api_key.models import APIKey
-from django.core.cache import cache
+from users.helpers import rate_limit
+from users.helpers.auth_context import get_request_auth
 
 def api_key_required(view_func):
+    @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        drf_request = Request(request)
-        api_key = drf_request.headers.get("X-Api-Key")
+        auth = get_request_auth(request)
 
-        if not api_key:
+        if not auth.raw_api_key:
             raise PermissionDenied("Missing API key.")
 
-        cache_key = f"api_key_valid:{api_key}"
-        is_valid = cache.get(cache_key)
+        limited = rate_limit.enforce_ip(request)
+        if limited:
+            return limited
 
-        if is_valid is None:
-            try:
-                APIKey.objects.get_from_key(api_key)
-            except Exception:
-                raise PermissionDenied("Invalid API key.")
+        record = auth.api_key
 
-            cache.set(cache_key, True, 60)
+        if not record['valid']:
+            raise PermissionDenied("Invalid API key.")
 
-        return view_func(request, *args, **kwargs)
+        if not record['api_enabled']:
+            raise PermissionDenied("API access disabled.")
+
+        request.api_key_record = record
+
+        limited = rate_limit.enforce(request, f"key:{record['prefix']}")
+        if limited:
+            return limited
+
+        response = view_func(request, *args, **kwargs)
+        return rate_limit.add_headers(request, response)
 
     return wrapper
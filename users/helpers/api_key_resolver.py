@@ -0,0 +1,138 @@
+"""
+Resolve an ``X-Api-Key`` header to a compact owner record.
+
+Lookup order is: per-process LRU, Redis, then the database plus the slow
+password hasher that ``APIKey.objects.get_from_key`` runs. Both cache tiers
+are keyed by a SHA-256 fingerprint of the raw key, so the hasher only runs
+once per key per ``API_KEY_CACHE_TTL``. Revoking a key or toggling the
+owner's API access publishes an invalidation that every worker applies to
+its local tier.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from rest_framework_api_key.models import APIKey
+
+from users.models import User
+from .lru import LocalLRUCache
+from . import pubsub
+
+API_KEY_CACHE_TTL = getattr(settings, 'API_KEY_CACHE_TTL', 300)
+API_KEY_NEGATIVE_CACHE_TTL = getattr(settings, 'API_KEY_NEGATIVE_CACHE_TTL', 30)
+API_KEY_LOCAL_CACHE_TTL = getattr(settings, 'API_KEY_LOCAL_CACHE_TTL', 30)
+
+INVALIDATE_CHANNEL = 'trendy:apikey:invalidate'
+
+INVALID = {'valid': False}
+
+_local = LocalLRUCache(maxsize=getattr(settings, 'API_KEY_LOCAL_CACHE_SIZE', 10000), ttl=API_KEY_LOCAL_CACHE_TTL)
+_subscribed = False
+
+
+def key_fingerprint(raw_key):
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+
+def _record_key(fingerprint):
+    return f'apikey:record:{fingerprint}'
+
+
+def _prefix_key(prefix):
+    return f'apikey:prefix:{prefix}'
+
+
+def _ensure_subscribed():
+    global _subscribed
+    if not _subscribed:
+        _subscribed = True
+        pubsub.subscribe(INVALIDATE_CHANNEL, _on_invalidate)
+
+
+def _on_invalidate(message):
+    prefix = message.get('prefix')
+    if prefix:
+        _local.delete_where(lambda record: record.get('prefix') == prefix)
+
+
+def _load(raw_key):
+    try:
+        api_key = APIKey.objects.get_from_key(raw_key)
+    except Exception:
+        return INVALID
+
+    if api_key.has_expired:
+        return INVALID
+
+    owner = User.objects.filter(
+        Q(api_key=api_key.prefix) | Q(api_key__startswith=f'{api_key.prefix}.')
+    ).only('id', 'role', 'status', 'api_enabled').first()
+
+    scopes = ['catalog']
+    if owner is not None:
+        scopes.append('account')
+
+    return {
+        'valid': True,
+        'prefix': api_key.prefix,
+        'owner_id': owner.id if owner else None,
+        'owner_role': owner.role if owner else None,
+        'scopes': scopes,
+        'api_enabled': owner.api_enabled and owner.status == User.UserStatus.ACTIVE if owner else True,
+        'expires_at': api_key.expiry_date.timestamp() if api_key.expiry_date else None,
+    }
+
+
+def resolve(raw_key):
+    """Return the record for ``raw_key``; ``record['valid']`` is False for unknown keys."""
+    _ensure_subscribed()
+    fingerprint = key_fingerprint(raw_key)
+
+    record = _local.get(fingerprint)
+    if record is None:
+        try:
+            record = cache.get(_record_key(fingerprint))
+        except Exception:
+            record = None
+
+        if record is None:
+            record = _load(raw_key)
+            ttl = API_KEY_CACHE_TTL if record['valid'] else API_KEY_NEGATIVE_CACHE_TTL
+            if record.get('expires_at'):
+                ttl = max(0, min(ttl, int(record['expires_at'] - time.time())))
+            try:
+                cache.set(_record_key(fingerprint), record, ttl)
+                if record['valid']:
+                    cache.set(_prefix_key(record['prefix']), fingerprint, ttl)
+            except Exception:
+                pass
+
+        _local.set(fingerprint, record)
+
+    if record.get('expires_at') and record['expires_at'] <= time.time():
+        return INVALID
+    return record
+
+
+def invalidate_prefix(prefix):
+    """Forget a key everywhere, e.g. after it was revoked or its owner changed."""
+    if not prefix:
+        return
+    try:
+        fingerprint = cache.get(_prefix_key(prefix))
+        keys = [_prefix_key(prefix)]
+        if fingerprint:
+            keys.append(_record_key(fingerprint))
+        cache.delete_many(keys)
+    except Exception:
+        pass
+    _on_invalidate({'prefix': prefix})
+    pubsub.publish(INVALIDATE_CHANNEL, {'prefix': prefix})
+
+
+def invalidate_owner(user_id):
+    api_key = User.objects.filter(id=user_id).values_list('api_key', flat=True).first()
+    if api_key:
+        invalidate_prefix(api_key.partition('.')[0])
@@ -0,0 +1,73 @@
+"""
+Request-scoped authentication state.
+
+``AuthContextMiddleware`` attaches a ``RequestAuth`` to every request. The JWT
+principal and the API key record are resolved lazily, on first access, and
+memoized, so stacked decorators and views that ask again never repeat the
+work. Endpoints that need neither pay nothing.
+"""
+from django.utils.functional import cached_property
+
+from users.services.auth_service import AuthService
+from . import api_key_resolver
+
+
+class RequestAuth:
+    resolutions = 0  # Process-wide counter, read by the bench_auth command.
+
+    def __init__(self, request):
+        self.request = request
+
+    @cached_property
+    def token(self):
+        header = self.request.headers.get('Authorization', '')
+        if header.startswith('Bearer '):
+            return header[7:] or None
+        return header or None
+
+    @cached_property
+    def _user_result(self):
+        if not self.token:
+            return None, 'Missing token', 401
+        RequestAuth.resolutions += 1
+        try:
+            return AuthService.authenticate(self.token)
+        except Exception:
+            return None, 'Invalid token', 401
+
+    @property
+    def user(self):
+        return self._user_result[0]
+
+    @property
+    def user_error(self):
+        return self._user_result[1], self._user_result[2]
+
+    @cached_property
+    def raw_api_key(self):
+        return self.request.headers.get('X-Api-Key') or None
+
+    @cached_property
+    def api_key(self):
+        if not self.raw_api_key:
+            return None
+        RequestAuth.resolutions += 1
+        return api_key_resolver.resolve(self.raw_api_key)
+
+    def resolved_identities(self):
+        """Identities already resolved for this request, without resolving anything new."""
+        identities = []
+        user = self.__dict__.get('_user_result', (None,))[0]
+        if user is not None:
+            identities.append(f'user:{user.id}')
+        record = self.__dict__.get('api_key')
+        if record and record.get('valid'):
+            identities.append(f'key:{record["prefix"]}')
+        return identities
+
+
+def get_request_auth(request):
+    auth = getattr(request, 'auth_context', None)
+    if auth is None:
+        auth = request.auth_context = RequestAuth(request)
+    return auth
@@ -0,0 +1,29 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'BACKGROUND_WORKERS', 4),
+    thread_name_prefix='trendy-bg'
+)
+
+
+def submit(func, *args, **kwargs):
+    """Run ``func`` on the shared background pool, off the request path."""
+    def run():
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            logger.exception('Background task %s failed', getattr(func, '__name__', func))
+        finally:
+            connections.close_all()
+
+    return _executor.submit(run)
+
+
+def submit_on_commit(func, *args, **kwargs):
+    """Like ``submit`` but waits until the surrounding transaction commits."""
+    transaction.on_commit(lambda: submit(func, *args, **kwargs))
@@ -0,0 +1,136 @@
+"""
+Versioned cache namespaces.
+
+Keys are stored as ``<namespace>:v<generation>:<key>``. ``invalidate()`` bumps
+the generation with a single INCR, after which older entries are unreachable
+and simply expire on their own TTL. Nothing scans the keyspace and nothing
+outside the namespace is touched, unlike ``delete_pattern`` / ``cache.clear()``.
+
+``fetch`` is the read path for computed values. Entries carry a soft expiry,
+jittered so keys written together do not expire together, and are kept a
+further ``CACHE_STALE_TTL`` seconds. Past the soft expiry one caller, holding
+a short Redis lock, recomputes while everyone else keeps getting the stale
+value; on a cold miss the other callers wait briefly for the lock holder
+instead of all running the same query. Hits, misses, stale serves and
+refreshes are tallied per namespace in ``metrics`` as ``cache.<namespace>``.
+"""
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+
+DEFAULT_TTL = 300
+CACHE_STALE_TTL = getattr(settings, 'CACHE_STALE_TTL', 120)
+CACHE_TTL_JITTER = getattr(settings, 'CACHE_TTL_JITTER', 0.1)
+CACHE_LOCK_TIMEOUT = getattr(settings, 'CACHE_LOCK_TIMEOUT', 30)
+CACHE_LOCK_WAIT = getattr(settings, 'CACHE_LOCK_WAIT', 2.0)
+LOCK_POLL_INTERVAL = 0.05
+
+ENTRY_TAG = 'swr'
+NAMESPACES = set()
+
+
+def _store(key, value, ttl):
+    soft = ttl * random.uniform(1 - CACHE_TTL_JITTER, 1 + CACHE_TTL_JITTER)
+    cache.set(key, (ENTRY_TAG, time.time() + soft, value), int(soft + CACHE_STALE_TTL))
+
+
+def _recompute(key, compute, ttl, cache_if):
+    try:
+        value = compute()
+        if cache_if is None or cache_if(value):
+            _store(key, value, ttl)
+        return value
+    finally:
+        cache.delete(f'lock:{key}')
+
+
+def _entry(raw):
+    return raw if isinstance(raw, tuple) and len(raw) == 3 and raw[0] == ENTRY_TAG else None
+
+
+def succeeded(result):
+    """``cache_if`` for service results: keep successes, never cache error answers."""
+    return result.get('success', True)
+
+
+def fetch(key, compute, ttl=DEFAULT_TTL, metric='cache', cache_if=None):
+    """Cached ``compute()`` under ``key`` with single-flight refresh and stale-while-revalidate.
+
+    ``cache_if(value)`` can veto storing a result (e.g. a "not found" answer).
+    """
+    NAMESPACES.add(metric)
+    entry = _entry(cache.get(key))
+    lock_key = f'lock:{key}'
+
+    if entry is not None:
+        _, soft_expires_at, value = entry
+        if time.time() < soft_expires_at:
+            metrics.tally(metric, 'hit')
+            return value
+        if not cache.add(lock_key, 1, CACHE_LOCK_TIMEOUT):
+            metrics.tally(metric, 'stale')
+            return value
+        metrics.tally(metric, 'refresh')
+        return _recompute(key, compute, ttl, cache_if)
+
+    metrics.tally(metric, 'miss')
+    if cache.add(lock_key, 1, CACHE_LOCK_TIMEOUT):
+        return _recompute(key, compute, ttl, cache_if)
+
+    # Someone else is computing this key; give them a moment before doing it too.
+    deadline = time.monotonic() + CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = _entry(cache.get(key))
+        if entry is not None:
+            return entry[2]
+    metrics.tally(metric, 'lock_timeout')
+    return compute()
+
+
+class CacheNamespace:
+    def __init__(self, name, ttl=DEFAULT_TTL, metric=None):
+        self.name = name
+        self.ttl = ttl
+        self.generation_key = f'ns:{name}:gen'
+        self.metric = f'cache.{metric or name}'
+        NAMESPACES.add(self.metric)
+
+    def generation(self):
+        generation = cache.get(self.generation_key)
+        if generation is None:
+            # Seed from the clock so a lost counter never revives old entries.
+            cache.add(self.generation_key, int(time.time() * 1000), timeout=None)
+            generation = cache.get(self.generation_key)
+        return generation
+
+    def key(self, key, generation=None):
+        return f'{self.name}:v{generation or self.generation()}:{key}'
+
+    def get(self, key, default=None):
+        return cache.get(self.key(key), default)
+
+    def get_many(self, keys):
+        generation = self.generation()
+        found = cache.get_many([self.key(key, generation) for key in keys])
+        prefix = len(self.key('', generation))
+        return {full_key[prefix:]: value for full_key, value in found.items()}
+
+    def fetch(self, key, compute, timeout=None, cache_if=None):
+        return fetch(self.key(key), compute, self.ttl if timeout is None else timeout, self.metric, cache_if)
+
+    def set(self, key, value, timeout=None):
+        cache.set(self.key(key), value, self.ttl if timeout is None else timeout)
+
+    def delete(self, key):
+        cache.delete(self.key(key))
+
+    def invalidate(self):
+        try:
+            cache.incr(self.generation_key)
+        except ValueError:
+            cache.add(self.generation_key, int(time.time() * 1000), timeout=None)
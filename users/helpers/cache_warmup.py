@@ -0,0 +1,210 @@
+"""
+Cache warm-up for the catalog and admin dashboard reads.
+
+The public catalog views ``record()`` (or are wrapped in ``counted()``) which
+page/per_page/category combinations are requested, as buffered counters in ``metrics`` (the
+``warmup.hits`` hash). ``warm()`` replays the most requested ones, plus the
+featured list, active categories and the admin stats, through the normal
+service methods on a bounded thread pool, so whatever layer serves them
+(catalog snapshot or Redis) is filled before visitors ask.
+
+``manage.py warm_cache`` runs it after a deploy. With
+``CACHE_WARMUP_ON_INVALIDATE`` on, ``schedule()`` also runs it in the
+background after a catalog write invalidates the caches; writes that arrive
+while a warm-up is running are folded into one more pass.
+"""
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+from django.test import RequestFactory
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+CACHE_WARMUP_ON_INVALIDATE = getattr(settings, 'CACHE_WARMUP_ON_INVALIDATE', False)
+CACHE_WARMUP_TOP = getattr(settings, 'CACHE_WARMUP_TOP', 50)
+CACHE_WARMUP_WORKERS = getattr(settings, 'CACHE_WARMUP_WORKERS', 4)
+CACHE_WARMUP_MAX_PAGE = getattr(settings, 'CACHE_WARMUP_MAX_PAGE', 5)
+
+HITS_METRIC = 'warmup.hits'
+# Warmed even before any traffic has been recorded, e.g. right after a deploy.
+DEFAULT_REQUESTS = [
+    ('list', {'page': 1, 'per_page': 20, 'category_id': None, 'is_featured': None, 'fields': None}),
+    ('featured', {'limit': 10}),
+]
+
+_state_lock = threading.Lock()
+_running = False
+_dirty = False
+
+
+def record(kind, **params):
+    """Count one request for ``kind`` with ``params``; deep pages are not tracked."""
+    if not 1 <= params.get('page', 1) <= CACHE_WARMUP_MAX_PAGE:
+        return
+    if not all(1 <= params[size] <= 100 for size in ('per_page', 'limit') if size in params):
+        return
+    metrics.tally(HITS_METRIC, json.dumps([kind, params], sort_keys=True, separators=(',', ':')))
+
+
+def counted(kind, params):
+    """Record every request ``params(request)`` describes, including 304s and memoized responses.
+
+    Goes outside ``catalog_conditional``, which answers those without calling
+    the view. ``params`` returns None for requests not worth warming.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response = view_func(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                try:
+                    found = params(request)
+                except ValueError:
+                    found = None
+                if found is not None:
+                    record(kind, **found)
+            return response
+        return wrapper
+    return decorator
+
+
+def top_requests(limit=CACHE_WARMUP_TOP):
+    """The ``limit`` most requested ``(kind, params)`` pairs, busiest first."""
+    metrics.flush()
+    counts = metrics.read(HITS_METRIC)
+    requests = []
+    for field, _ in sorted(counts.items(), key=lambda item: -item[1])[:limit]:
+        try:
+            kind, params = json.loads(field)
+        except ValueError:
+            continue
+        requests.append((kind, params))
+    return requests
+
+
+def _list_page(params):
+    from admins.services.service_service import ServiceService
+    # Same arguments as the list view, so the cache key matches.
+    return ServiceService.get_all_services_encoded(
+        page=params['page'],
+        per_page=params['per_page'],
+        search=None,
+        category_id=params.get('category_id'),
+        is_featured=params.get('is_featured'),
+        status='ACTIVE',
+        fields=tuple(params['fields']) if params.get('fields') else None
+    )
+
+
+def _category_page(params):
+    from admins.services.service_service import ServiceService
+    # Photo URLs are made absolute against the host that asked for the page.
+    request = RequestFactory().get('/', HTTP_HOST=params['host'], secure=params.get('secure', False))
+    return ServiceService.get_services_by_category(params['slug'], params['page'], params['per_page'], request)
+
+
+def _featured(params):
+    from admins.services.service_service import ServiceService
+    return ServiceService.get_featured_services(limit=params.get('limit', 10))
+
+
+READS = {
+    'list': _list_page,
+    'category': _category_page,
+    'featured': _featured,
+}
+
+
+def _fixed_targets():
+    from admins.services.category_service import CategoryService
+    from admins.services.service_service import ServiceService
+    from admins.services.supplier_service import SupplierService
+    from admins.services.user_service import UserService
+    from users.services.order_service import OrderService
+
+    return [
+        ('categories', CategoryService.get_active_categories),
+        ('service_stats', ServiceService.get_service_stats),
+        ('category_stats', CategoryService.get_category_stats),
+        ('supplier_stats', SupplierService.get_supplier_stats),
+        ('user_stats', UserService.get_user_stats),
+        ('dashboard_stats', OrderService.get_admin_dashboard_stats),
+    ]
+
+
+def targets(limit=CACHE_WARMUP_TOP):
+    """``(label, callable)`` pairs to warm: the fixed set plus the most requested pages."""
+    found = _fixed_targets()
+    requests = top_requests(limit)
+    requests += [request for request in DEFAULT_REQUESTS if request not in requests]
+    for kind, params in requests:
+        read = READS.get(kind)
+        if read is not None:
+            found.append((f'{kind} {params}', lambda read=read, params=params: read(params)))
+    return found
+
+
+def _run(read):
+    try:
+        read()
+        return True
+    except Exception:
+        logger.warning('Cache warm-up read failed', exc_info=True)
+        return False
+    finally:
+        connections.close_all()
+
+
+def warm(limit=CACHE_WARMUP_TOP, workers=CACHE_WARMUP_WORKERS):
+    """Run every warm-up read; returns ``{'warmed', 'failed', 'seconds'}`` (failed = labels)."""
+    started = time.monotonic()
+    found = targets(limit)
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='trendy-warmup') as pool:
+        results = list(pool.map(_run, [read for _, read in found]))
+
+    seconds = time.monotonic() - started
+    summary = {
+        'warmed': sum(results),
+        'failed': [label for (label, _), ok in zip(found, results) if not ok],
+        'seconds': round(seconds, 3),
+    }
+    metrics.observe('warmup.duration', seconds)
+    logger.info('Cache warm-up: %s keys in %.3fs, %s failed', summary['warmed'], seconds, len(summary['failed']))
+    return summary
+
+
+def schedule():
+    """Warm up in the background once the current transaction commits, if enabled."""
+    if not CACHE_WARMUP_ON_INVALIDATE:
+        return
+
+    from .background import submit_on_commit
+    submit_on_commit(_start)
+
+
+def _start():
+    global _running, _dirty
+    with _state_lock:
+        _dirty = True
+        if _running:
+            return
+        _running = True
+
+    while True:
+        with _state_lock:
+            if not _dirty:
+                _running = False
+                return
+            _dirty = False
+        try:
+            warm()
+        except Exception:
+            logger.warning('Background cache warm-up failed', exc_info=True)
@@ -0,0 +1,210 @@
+"""
+In-process snapshot of the active public catalog.
+
+Every worker keeps an immutable ``CatalogSnapshot`` of active services and
+categories, pre-serialized and indexed by id, slug, category and featured
+flag, so the public catalog reads answer from memory without a Redis or
+database round trip. Catalog writes bump ``catalog_version`` on commit, which
+publishes on ``CHANGED_CHANNEL``; every worker then rebuilds its snapshot in
+the background and swaps it in with a single assignment, serving the old one
+until the new one is ready. A snapshot older than ``CATALOG_SNAPSHOT_MAX_AGE``
+is rebuilt as well, which bounds the cost of a lost message and picks up
+counters (``total_orders``) that change without a catalog write.
+
+``current()`` returns None when the snapshot is disabled or cannot be built;
+callers then take their usual cache/database path.
+"""
+import logging
+import threading
+import time
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.paginator import Paginator
+
+from . import catalog_version, category_summary, pubsub
+from .lru import LocalLRUCache
+
+logger = logging.getLogger(__name__)
+
+CATALOG_SNAPSHOT_ENABLED = getattr(settings, 'CATALOG_SNAPSHOT_ENABLED', True)
+CATALOG_SNAPSHOT_MAX_AGE = getattr(settings, 'CATALOG_SNAPSHOT_MAX_AGE', 300)
+CATALOG_SNAPSHOT_MEMO_SIZE = getattr(settings, 'CATALOG_SNAPSHOT_MEMO_SIZE', 1024)
+
+CHANGED_CHANNEL = 'trendy:catalog:changed'
+
+_snapshot = None
+_build_lock = threading.Lock()
+_state_lock = threading.Lock()
+_refreshing = False
+_dirty = False
+_subscribed = False
+
+
+class CatalogSnapshot:
+    """Read-only view of the active catalog. Returned dicts are shared; do not mutate them."""
+
+    def __init__(self, services, categories, version):
+        from admins.services.service_service import ServiceService
+
+        self.version = version
+        self.built_at = time.time()
+        self.built_monotonic = time.monotonic()
+
+        listings, by_id, by_slug, by_category, featured, details = [], {}, {}, {}, [], {}
+        for service in services:
+            item = MappingProxyType({
+                'listing': ServiceService.PUBLIC_LISTING.instance(service),
+                'featured': ServiceService._serialize_featured(service),
+                'category_item': ServiceService._serialize_category_service(service),
+            })
+            listings.append(item)
+            by_id[service.id] = item
+            by_slug[service.slug] = item
+            by_category.setdefault(str(service.category_id), []).append(item)
+            if service.is_featured:
+                featured.append(item)
+            details[service.slug] = ServiceService._serialize_service(service, full=False)
+
+        self.services = tuple(listings)
+        self.by_id = MappingProxyType(by_id)
+        self.by_slug = MappingProxyType(by_slug)
+        self.by_category = MappingProxyType({key: tuple(items) for key, items in by_category.items()})
+        self.featured = tuple(featured)
+        self.details = MappingProxyType(details)
+        self.categories = tuple(categories)
+        self.category_by_slug = MappingProxyType({category['slug']: category for category in categories})
+        # Encoded pages and conditional-GET entries derived from this snapshot;
+        # they are dropped with it, so no explicit invalidation is needed.
+        self.memo = LocalLRUCache(maxsize=CATALOG_SNAPSHOT_MEMO_SIZE, ttl=CATALOG_SNAPSHOT_MAX_AGE * 2)
+
+    @property
+    def age(self):
+        return time.monotonic() - self.built_monotonic
+
+    def services_page(self, page, per_page, category_id=None, is_featured=None, fields=None):
+        if category_id:
+            items = self.by_category.get(str(category_id), ())
+        else:
+            items = self.services
+
+        if is_featured is not None:
+            items = tuple(item for item in items if item['listing']['is_featured'] == is_featured)
+
+        paginator = Paginator(items, per_page)
+        page_obj = paginator.get_page(page)
+
+        if fields:
+            services = [{key: item['listing'][key] for key in fields} for item in page_obj.object_list]
+        else:
+            services = [item['listing'] for item in page_obj.object_list]
+
+        return {
+            'services': services,
+            'pagination': {
+                'current_page': page_obj.number,
+                'total_pages': paginator.num_pages,
+                'total_services': paginator.count,
+                'per_page': per_page,
+                'has_next': page_obj.has_next(),
+                'has_previous': page_obj.has_previous()
+            }
+        }
+
+
+def build():
+    from users.models import Category, Service
+
+    version = catalog_version.get()
+    services = Service.objects.select_related('category', 'supplier').filter(
+        status='ACTIVE'
+    ).order_by('sort_order', 'name')
+    categories = Category.objects.filter(status='ACTIVE').order_by('sort_order').values(
+        'id', 'name', 'slug', 'description', 'icon', 'sort_order', *category_summary.SUMMARY_FIELDS
+    )
+    return CatalogSnapshot(list(services), [category_summary.public(row) for row in categories], version)
+
+
+def current():
+    """The live snapshot, building it on first use; None when unavailable."""
+    global _snapshot
+    if not CATALOG_SNAPSHOT_ENABLED:
+        return None
+
+    snapshot = _snapshot
+    if snapshot is None:
+        _ensure_subscribed()
+        with _build_lock:
+            snapshot = _snapshot
+            if snapshot is None:
+                try:
+                    snapshot = _snapshot = build()
+                except Exception:
+                    logger.warning('Could not build the catalog snapshot', exc_info=True)
+                    return None
+    elif snapshot.age > CATALOG_SNAPSHOT_MAX_AGE:
+        schedule_refresh()
+    return snapshot
+
+
+def refresh_now():
+    """Rebuild synchronously and swap the new snapshot in."""
+    global _snapshot
+    with _build_lock:
+        _snapshot = build()
+    return _snapshot
+
+
+def discard():
+    """Drop the snapshot; the next read builds a fresh one."""
+    global _snapshot
+    with _build_lock:
+        _snapshot = None
+
+
+def schedule_refresh():
+    """Rebuild on the background pool; requests keep the old snapshot meanwhile."""
+    global _refreshing, _dirty
+    if _snapshot is None:
+        return
+
+    with _state_lock:
+        _dirty = True
+        if _refreshing:
+            return
+        _refreshing = True
+
+    from .background import submit
+    submit(_refresh_loop)
+
+
+def _refresh_loop():
+    global _refreshing, _dirty
+    while True:
+        with _state_lock:
+            if not _dirty:
+                _refreshing = False
+                return
+            _dirty = False
+        try:
+            refresh_now()
+        except Exception:
+            logger.warning('Catalog snapshot refresh failed, keeping the previous one', exc_info=True)
+
+
+def publish_change(version):
+    pubsub.publish(CHANGED_CHANNEL, {'version': version})
+
+
+def _ensure_subscribed():
+    global _subscribed
+    if not _subscribed:
+        _subscribed = True
+        pubsub.subscribe(CHANGED_CHANNEL, _on_changed)
+
+
+def _on_changed(message):
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version is not None and snapshot.version == message.get('version'):
+        return
+    schedule_refresh()
@@ -0,0 +1,45 @@
+"""
+Version counter for the public catalog: services, categories and suppliers.
+
+Writers call ``bump()`` after a change; readers fold ``get()`` into their
+cache keys so everything cached against an older catalog is retired at once.
+Each bump is also published so every worker rebuilds its catalog snapshot.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'catalog:version'
+
+
+def get():
+    """Current version, or None when the cache is unreachable."""
+    try:
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            # Seed from the clock so a lost key never reuses an old version.
+            cache.add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+            version = cache.get(VERSION_KEY)
+        return version
+    except Exception:
+        return None
+
+
+def bump():
+    """Advance the version once the surrounding transaction commits."""
+    transaction.on_commit(_incr)
+
+
+def _incr():
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = None
+    except Exception:
+        version = None
+
+    from . import catalog_snapshot
+    catalog_snapshot.schedule_refresh()
+    catalog_snapshot.publish_change(version)
@@ -0,0 +1,82 @@
+"""
+Per-category catalog summaries stored on ``Category``.
+
+``active_services``, ``featured_services`` and ``min/max_price_per_100``
+describe the active services in each category, so category endpoints can
+show them without touching the services table. Service writes call
+``touch()`` with the categories they affect; after the transaction commits,
+just those categories are recomputed with one grouped aggregate (min/max
+cannot be maintained from deltas when the cheapest service goes away).
+``reconcile()`` recomputes every category and reports the ones that had
+drifted, e.g. after raw SQL edits.
+"""
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+
+SUMMARY_FIELDS = ('active_services', 'featured_services', 'min_price_per_100', 'max_price_per_100')
+EMPTY = (0, 0, None, None)
+
+
+def _expected(category_ids=None):
+    from users.models import Service
+
+    services = Service.objects.filter(status='ACTIVE')
+    if category_ids is not None:
+        services = services.filter(category_id__in=category_ids)
+    rows = services.values('category_id').annotate(
+        active=Count('id'),
+        featured=Count('id', filter=Q(is_featured=True)),
+        min_price=Min('price_per_100'),
+        max_price=Max('price_per_100'),
+    ).order_by()
+    return {
+        row['category_id']: (row['active'], row['featured'], row['min_price'], row['max_price'])
+        for row in rows
+    }
+
+
+def refresh(category_ids=None):
+    """Recompute the given categories (all when None); returns the ids that changed."""
+    from admins.services.category_service import CategoryService
+    from users.models import Category
+
+    if category_ids is not None:
+        category_ids = {category_id for category_id in category_ids if category_id is not None}
+        if not category_ids:
+            return []
+
+    expected = _expected(category_ids)
+    categories = Category.objects.only('id', *SUMMARY_FIELDS)
+    if category_ids is not None:
+        categories = categories.filter(id__in=category_ids)
+
+    changed = []
+    for category in categories:
+        values = expected.get(category.id, EMPTY)
+        if tuple(getattr(category, field) for field in SUMMARY_FIELDS) != values:
+            for field, value in zip(SUMMARY_FIELDS, values):
+                setattr(category, field, value)
+            changed.append(category)
+
+    if changed:
+        Category.objects.bulk_update(changed, SUMMARY_FIELDS)
+        CategoryService.CACHE.invalidate()
+    return [category.id for category in changed]
+
+
+def public(row):
+    """A ``values()`` row for the API, with the price range as floats like every other price."""
+    for field in ('min_price_per_100', 'max_price_per_100'):
+        if row.get(field) is not None:
+            row[field] = float(row[field])
+    return row
+
+
+def touch(*category_ids):
+    """Refresh these categories once the surrounding transaction commits."""
+    transaction.on_commit(lambda: refresh(category_ids))
+
+
+def reconcile():
+    """Recompute every category; returns the ids whose stored summary was wrong."""
+    return refresh()
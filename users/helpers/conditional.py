@@ -0,0 +1,89 @@
+"""
+Conditional GET and pre-compressed bodies for the catalog endpoints.
+
+Successful bodies are kept per (catalog version, full path) with a content
+hash ETag and, for large pages, a gzip copy. A request whose If-None-Match
+or If-Modified-Since matches is answered 304 from that entry alone, without
+touching the database or the serializer. Entries live for
+``CATALOG_RESPONSE_TTL`` seconds, the freshness the service caches already
+give, and any catalog write retires them by bumping the version. While the
+in-process catalog snapshot is live, entries are memoized on it instead and
+retire together with it.
+"""
+import gzip
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+from . import catalog_snapshot, catalog_version
+from .response import APIResponse
+
+CATALOG_RESPONSE_TTL = getattr(settings, 'CATALOG_RESPONSE_TTL', 300)
+CATALOG_GZIP_MIN_BYTES = getattr(settings, 'CATALOG_GZIP_MIN_BYTES', 1024)
+
+
+def _build_entry(body):
+    digest = hashlib.sha1(body).hexdigest()[:20]
+    return {
+        'etag': digest,
+        'modified': int(time.time()),
+        'body': body,
+        'gzip': gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= CATALOG_GZIP_MIN_BYTES else None,
+    }
+
+
+def _not_modified(request, entry):
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        tags = parse_etags(if_none_match)
+        return '*' in tags or any(tag.strip('"').removesuffix('-gz') == entry['etag'] for tag in tags)
+
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return since is not None and since >= entry['modified']
+
+
+def catalog_conditional(view_func):
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        path_hash = hashlib.sha1(request.get_full_path().encode()).hexdigest()
+        snapshot = catalog_snapshot.current()
+        if snapshot is not None:
+            store, cache_key = snapshot.memo, f'catalog:response:{path_hash}'
+        else:
+            version = catalog_version.get()
+            if version is None:
+                return view_func(request, *args, **kwargs)
+            store, cache_key = cache, f'catalog:response:{version}:{path_hash}'
+        entry = store.get(cache_key)
+
+        if entry is None:
+            response = view_func(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            entry = _build_entry(response.content)
+            store.set(cache_key, entry, CATALOG_RESPONSE_TTL)
+
+        use_gzip = entry['gzip'] is not None and 'gzip' in request.headers.get('Accept-Encoding', '')
+        etag = f'"{entry["etag"]}-gz"' if use_gzip else f'"{entry["etag"]}"'
+
+        if _not_modified(request, entry):
+            response = HttpResponseNotModified()
+        elif use_gzip:
+            response = APIResponse.raw(entry['gzip'])
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = APIResponse.raw(entry['body'])
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(entry['modified'])
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    return wrapper
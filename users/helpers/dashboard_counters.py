@@ -0,0 +1,258 @@
+"""
+Live order counters for the admin dashboard, kept in Redis.
+
+``trendy:dashboard:orders`` holds the all-time totals (order count, revenue
+and profit in cents, one count per status) and ``trendy:dashboard:orders:<day>``
+the same for each of the last ``DAYS_KEPT`` days, so today / this week / this
+month are sums over at most 30 small hashes. ``order_rollup.apply()`` and
+``discard()`` hand every order write's per-day deltas to ``record()``, which
+applies them in one MULTI/EXEC once the transaction commits; a rolled-back
+order never counts.
+
+Admins connected to ``AdminDashboardConsumer`` get the merged deltas and the
+new totals, at most once per ``DASHBOARD_PUSH_INTERVAL`` seconds across all
+workers. ``reconcile()`` rewrites the counters from ``OrderServiceRollup``; reads
+schedule it every ``DASHBOARD_RECONCILE_INTERVAL`` seconds and the
+``reconcile_dashboard_counters`` command runs it on demand or from cron. Until
+the first reconcile (or after Redis loses the keys) ``read()`` returns None and
+callers fall back to the rollup tables.
+"""
+import logging
+import threading
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import WatchError
+
+from users.models import Order, OrderServiceRollup
+from . import background
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_COUNTERS_ENABLED = getattr(settings, 'DASHBOARD_COUNTERS_ENABLED', True)
+DASHBOARD_PUSH_INTERVAL = getattr(settings, 'DASHBOARD_PUSH_INTERVAL', 1.0)
+DASHBOARD_RECONCILE_INTERVAL = getattr(settings, 'DASHBOARD_RECONCILE_INTERVAL', 900)
+
+TOTAL_KEY = 'trendy:dashboard:orders'
+PUSH_GATE_KEY = 'trendy:dashboard:push'
+RECONCILE_GATE_KEY = 'trendy:dashboard:reconcile'
+# Set by reconcile(); increments alone never make the totals trustworthy.
+READY_FIELD = 'ready'
+
+DAYS_KEPT = 30
+DAY_TTL = (DAYS_KEPT + 2) * 86400
+AMOUNT_FIELDS = ('revenue', 'profit')
+STATUS_FIELDS = tuple(status.lower() for status in Order.OrderStatus.values)
+FIELDS = ('orders', *AMOUNT_FIELDS, *STATUS_FIELDS)
+DASHBOARD_GROUP = 'admins_online'
+
+_pending = Counter()
+_push_lock = threading.Lock()
+_push_timer = None
+
+
+def _day_key(day):
+    return f'{TOTAL_KEY}:{day.isoformat()}'
+
+
+def _to_redis(fields):
+    """Integer deltas for Redis: amounts in cents, counts as they are; zeros dropped."""
+    values = {}
+    for field in FIELDS:
+        value = fields.get(field) or 0
+        value = int((Decimal(value) * 100).quantize(Decimal('1'))) if field in AMOUNT_FIELDS else int(value)
+        if value:
+            values[field] = value
+    return values
+
+
+def _from_redis(raw):
+    values = {field.decode() if isinstance(field, bytes) else field: int(value) for field, value in raw.items()}
+    return {
+        **{field: values.get(field, 0) for field in FIELDS},
+        READY_FIELD: values.get(READY_FIELD, 0),
+    }
+
+
+def _display(values):
+    return {field: values[field] / 100 if field in AMOUNT_FIELDS else values[field] for field in FIELDS}
+
+
+def record(day_deltas):
+    """Add ``{day: {field: delta}}`` to the counters once the current transaction commits."""
+    if not DASHBOARD_COUNTERS_ENABLED:
+        return
+    deltas = {day: _to_redis(fields) for day, fields in day_deltas.items()}
+    deltas = {day: fields for day, fields in deltas.items() if fields}
+    if deltas:
+        transaction.on_commit(lambda: _apply(deltas))
+
+
+def _apply(deltas):
+    total = Counter()
+    try:
+        pipe = get_redis_connection('default').pipeline(transaction=True)
+        for day, fields in deltas.items():
+            for field, value in fields.items():
+                pipe.hincrby(_day_key(day), field, value)
+                total[field] += value
+            pipe.expire(_day_key(day), DAY_TTL)
+        for field, value in total.items():
+            pipe.hincrby(TOTAL_KEY, field, value)
+        pipe.execute()
+    except Exception:
+        logger.warning('Could not update the dashboard counters', exc_info=True)
+        return
+    _queue_push(total)
+
+
+def _queue_push(delta):
+    global _push_timer
+    with _push_lock:
+        _pending.update(delta)
+        if _push_timer is not None:
+            return
+        _push_timer = threading.Timer(0, _push)
+        _push_timer.daemon = True
+        _push_timer.start()
+
+
+def _push():
+    """Send the merged deltas unless another worker pushed within the interval; then retry later."""
+    global _push_timer
+    interval_ms = int(DASHBOARD_PUSH_INTERVAL * 1000)
+    try:
+        client = get_redis_connection('default')
+        if not client.set(PUSH_GATE_KEY, 1, nx=True, px=interval_ms):
+            wait = client.pttl(PUSH_GATE_KEY)
+            with _push_lock:
+                _push_timer = threading.Timer(max(wait, 1) / 1000 if wait and wait > 0 else DASHBOARD_PUSH_INTERVAL, _push)
+                _push_timer.daemon = True
+                _push_timer.start()
+            return
+    except Exception:
+        pass
+
+    with _push_lock:
+        delta = {field: _pending.get(field, 0) for field in FIELDS}
+        _pending.clear()
+        _push_timer = None
+
+    try:
+        async_to_sync(get_channel_layer().group_send)(DASHBOARD_GROUP, {
+            'type': 'order_stats',
+            'delta': _display(delta),
+            'stats': read(schedule=False),
+        })
+    except Exception:
+        logger.warning('Could not push dashboard counters', exc_info=True)
+
+
+def read(schedule=True):
+    """Dashboard stats in the ``get_admin_dashboard_stats`` shape; None until reconciled."""
+    if not DASHBOARD_COUNTERS_ENABLED:
+        return None
+    today = timezone.localdate()
+    days = [today - timedelta(days=offset) for offset in range(DAYS_KEPT)]
+    try:
+        pipe = get_redis_connection('default').pipeline(transaction=False)
+        pipe.hgetall(TOTAL_KEY)
+        for day in days:
+            pipe.hgetall(_day_key(day))
+        total, *per_day = [_from_redis(raw) for raw in pipe.execute()]
+    except Exception:
+        logger.warning('Could not read the dashboard counters', exc_info=True)
+        return None
+
+    if schedule:
+        schedule_reconcile()
+    if not total[READY_FIELD]:
+        return None
+
+    def window(size):
+        values = Counter()
+        for fields in per_day[:size]:
+            values.update({field: fields[field] for field in ('orders', *AMOUNT_FIELDS)})
+        return {
+            'orders': values['orders'],
+            'revenue': values['revenue'] / 100,
+            'profit': values['profit'] / 100
+        }
+
+    return {
+        'total': {
+            'orders': total['orders'],
+            'revenue': total['revenue'] / 100,
+            'profit': total['profit'] / 100,
+            'avg_order_value': total['revenue'] / total['orders'] / 100 if total['orders'] else 0.0
+        },
+        'by_status': {
+            status: total[status]
+            for status in ('pending', 'processing', 'completed', 'cancelled', 'partial', 'failed')
+        },
+        'today': window(1),
+        'this_week': window(7),
+        'this_month': window(30)
+    }
+
+
+def reconcile():
+    """Rewrite the counters from ``OrderServiceRollup``; returns ``{field: (was, now)}`` for drifted totals.
+
+    The totals key is WATCHed, so an increment landing while the database is
+    read makes the rewrite retry instead of losing that increment.
+    """
+    first_day = timezone.localdate() - timedelta(days=DAYS_KEPT - 1)
+    day_keys = [_day_key(first_day + timedelta(days=offset)) for offset in range(DAYS_KEPT)]
+
+    with get_redis_connection('default').pipeline(transaction=True) as pipe:
+        while True:
+            try:
+                pipe.watch(TOTAL_KEY)
+                before = _from_redis(pipe.hgetall(TOTAL_KEY))
+                sums = {f'sum_{field}': Sum(field) for field in FIELDS}
+                total = _to_redis(_unprefix(OrderServiceRollup.objects.aggregate(**sums)))
+                days = {
+                    row['day']: _to_redis(_unprefix(row))
+                    for row in OrderServiceRollup.objects.filter(day__gte=first_day).values('day').annotate(**sums).order_by()
+                }
+
+                pipe.multi()
+                pipe.delete(TOTAL_KEY, *day_keys)
+                pipe.hset(TOTAL_KEY, mapping={**total, READY_FIELD: 1})
+                for day, fields in days.items():
+                    if fields:
+                        pipe.hset(_day_key(day), mapping=fields)
+                        pipe.expire(_day_key(day), DAY_TTL)
+                pipe.execute()
+                break
+            except WatchError:
+                continue
+
+    after = _display({field: total.get(field, 0) for field in FIELDS})
+    if not before[READY_FIELD]:
+        return {field: (None, value) for field, value in after.items()}
+    before = _display(before)
+    return {field: (before[field], value) for field, value in after.items() if before[field] != value}
+
+
+def _unprefix(row):
+    return {field: row[f'sum_{field}'] for field in FIELDS}
+
+
+def schedule_reconcile():
+    """Reconcile on the background pool if no worker has done so in ``DASHBOARD_RECONCILE_INTERVAL`` seconds."""
+    try:
+        due = get_redis_connection('default').set(RECONCILE_GATE_KEY, 1, nx=True, ex=DASHBOARD_RECONCILE_INTERVAL)
+    except Exception:
+        return
+    if due:
+        background.submit(reconcile)
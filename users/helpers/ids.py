@@ -0,0 +1,125 @@
+"""
+Time-ordered, collision-free identifiers for orders, tickets and transactions.
+
+``next_id('ORD')`` returns e.g. ``ORD-20261017005012-0K3M2QX``: the existing
+prefix and UTC timestamp, then seven Crockford base32 characters packing the
+millisecond (10 bits), this process's node number (10 bits) and a
+per-process sequence (12 bits), Snowflake style. IDs from one process are
+strictly increasing and, as plain strings, sort in creation order; across
+processes they sort by millisecond. Consecutive IDs land next to each other in
+the unique index rather than on random leaf pages.
+
+The node number comes from ``ID_NODE`` when set, otherwise it is leased in
+Redis (``trendy:ids:node:<n>``, renewed while the process keeps generating),
+so no two live processes share one. If Redis is unreachable a random node is
+used and the unique index stays the last line of defence, as before.
+"""
+import logging
+import os
+import secrets
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+MAX_NODE = (1 << NODE_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+SUFFIX_LENGTH = 7
+
+NODE_KEY = 'trendy:ids:node:{}'
+NODE_COUNTER_KEY = 'trendy:ids:node'
+ID_NODE = getattr(settings, 'ID_NODE', None)
+ID_NODE_LEASE = getattr(settings, 'ID_NODE_LEASE', 3600)
+# Without Redis, try to lease a node again after this many seconds.
+FALLBACK_RETRY = 60
+
+_lock = threading.Lock()
+_state = {'pid': None, 'node': None, 'token': None, 'renew_at': 0.0, 'last_ms': 0, 'sequence': 0}
+
+
+def _encode(value):
+    chars = []
+    for _ in range(SUFFIX_LENGTH):
+        value, index = divmod(value, 32)
+        chars.append(ALPHABET[index])
+    return ''.join(reversed(chars))
+
+
+def _lease():
+    """Claim a node number no live process holds: ``(node, token, renew_at)``."""
+    if ID_NODE is not None:
+        return int(ID_NODE) & MAX_NODE, None, float('inf')
+
+    token = secrets.token_hex(8)
+    try:
+        client = get_redis_connection('default')
+        start = client.incr(NODE_COUNTER_KEY)
+        for offset in range(MAX_NODE + 1):
+            node = (start + offset) & MAX_NODE
+            if client.set(NODE_KEY.format(node), token, nx=True, ex=ID_NODE_LEASE):
+                return node, token, time.monotonic() + ID_NODE_LEASE / 2
+        logger.warning('All %d ID nodes are leased; using a random one', MAX_NODE + 1)
+    except Exception:
+        logger.warning('Could not lease an ID node; using a random one', exc_info=True)
+    return secrets.randbelow(MAX_NODE + 1), None, time.monotonic() + FALLBACK_RETRY
+
+
+def _renew():
+    """Extend our lease; False when it lapsed and another process may hold the node."""
+    try:
+        client = get_redis_connection('default')
+        key = NODE_KEY.format(_state['node'])
+        if client.get(key) == _state['token'].encode():
+            client.expire(key, ID_NODE_LEASE)
+            return True
+        return bool(client.set(key, _state['token'], nx=True, ex=ID_NODE_LEASE))
+    except Exception:
+        return False
+
+
+def _ensure_node():
+    pid = os.getpid()
+    if _state['pid'] != pid:
+        # A forked worker must not keep its parent's node.
+        _state.update(pid=pid, node=None, token=None, renew_at=0.0)
+
+    if _state['node'] is not None and time.monotonic() < _state['renew_at']:
+        return
+    if _state['token'] is not None and _renew():
+        _state['renew_at'] = time.monotonic() + ID_NODE_LEASE / 2
+        return
+
+    previous = _state['node']
+    _state['node'], _state['token'], _state['renew_at'] = _lease()
+    if previous is not None and _state['node'] != previous:
+        # Keep this process's IDs increasing even if the new node sorts lower.
+        _state['last_ms'] += 1
+        _state['sequence'] = -1
+
+
+def next_id(prefix):
+    """``<prefix>-<YYYYmmddHHMMSS>-<suffix>``, unique and increasing within this process."""
+    with _lock:
+        _ensure_node()
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _state['last_ms']:
+            _state['last_ms'], _state['sequence'] = now_ms, 0
+        else:
+            # Same millisecond, or the clock stepped back: keep counting on the last one.
+            _state['sequence'] += 1
+            if _state['sequence'] > MAX_SEQUENCE:
+                _state['last_ms'] += 1
+                _state['sequence'] = 0
+        ms, node, sequence = _state['last_ms'], _state['node'], _state['sequence']
+
+    seconds, millis = divmod(ms, 1000)
+    stamp = datetime.fromtimestamp(seconds, dt_timezone.utc).strftime('%Y%m%d%H%M%S')
+    value = (millis << (NODE_BITS + SEQUENCE_BITS)) | (node << SEQUENCE_BITS) | sequence
+    return f'{prefix}-{stamp}-{_encode(value)}'
@@ -0,0 +1,96 @@
+"""
+Resized variants of ``Service.photo``.
+
+Uploads are kept as they are; after the upload commits, a background task
+renders each entry of ``VARIANTS`` (a square thumbnail and a 4:3 card, as
+JPEG and WebP) and records their storage names in ``Service.photo_variants``.
+Variant files are named after a hash of the source bytes, so a URL never
+changes meaning and can be cached by browsers and CDNs for a year (see
+``users.views.media_views``). Until the variants exist, serializers fall back
+to the original photo.
+"""
+import hashlib
+import logging
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from . import background
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR = 'photos/variants'
+
+# name: (size, format, save options)
+VARIANTS = {
+    'thumb': ((160, 160), 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'thumb_webp': ((160, 160), 'WEBP', {'quality': 80, 'method': 4}),
+    'card': ((480, 360), 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'card_webp': ((480, 360), 'WEBP', {'quality': 80, 'method': 4}),
+}
+EXTENSIONS = {'JPEG': 'jpg', 'WEBP': 'webp'}
+
+IMAGE_VARIANTS_ENABLED = getattr(settings, 'IMAGE_VARIANTS_ENABLED', True)
+
+
+def variant_urls(variants):
+    """``{name: url}`` for the stored variants, skipping the bookkeeping keys."""
+    return {name: default_storage.url(path) for name, path in (variants or {}).items() if name in VARIANTS}
+
+
+def _render(image, size, fmt, options):
+    fitted = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+    if fmt == 'JPEG' and fitted.mode != 'RGB':
+        fitted = fitted.convert('RGB')
+    buffer = BytesIO()
+    fitted.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def render(source_name):
+    """Write every variant of stored file ``source_name``; returns ``{name: storage path}``."""
+    with default_storage.open(source_name, 'rb') as source:
+        data = source.read()
+    digest = hashlib.sha256(data).hexdigest()[:16]
+
+    with Image.open(BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+
+        variants = {'source': source_name}
+        for name, (size, fmt, options) in VARIANTS.items():
+            path = posixpath.join(VARIANT_DIR, f'{digest}-{size[0]}x{size[1]}.{EXTENSIONS[fmt]}')
+            # Same bytes, same name: an existing file is already the right one.
+            if not default_storage.exists(path):
+                default_storage.save(path, ContentFile(_render(image, size, fmt, options)))
+            variants[name] = path
+    return variants
+
+
+def generate(service_id, clear_cache=True):
+    """Render variants for one service and store them, unless its photo changed meanwhile."""
+    from admins.services.service_service import ServiceService
+    from users.models import Service
+
+    service = Service.objects.filter(id=service_id).only('id', 'photo', 'photo_variants').first()
+    if service is None or not service.photo:
+        return None
+    if service.photo_variants.get('source') == service.photo.name:
+        return service.photo_variants
+
+    variants = render(service.photo.name)
+    updated = Service.objects.filter(id=service_id, photo=service.photo.name).update(photo_variants=variants)
+    if updated and clear_cache:
+        ServiceService._clear_cache()
+    return variants
+
+
+def enqueue(service):
+    """Generate variants for ``service`` in the background once the upload commits."""
+    if IMAGE_VARIANTS_ENABLED and service.photo:
+        background.submit_on_commit(generate, service.id)
@@ -0,0 +1,55 @@
+"""
+Compact JSON encoding for API responses.
+
+``dumps`` returns UTF-8 bytes and understands the types services hand back:
+Decimal, date/datetime, UUID, lazy translation strings, model instances and
+``.values()`` querysets. orjson is used when installed; otherwise the stdlib
+encoder runs with compact separators.
+
+Values keep ``DjangoJSONEncoder``'s wire format, which ``JsonResponse`` used
+before: Decimal as a string, datetimes in ECMA-262 form (milliseconds, ``Z``
+for UTC).
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, QuerySet
+from django.forms.models import model_to_dict
+from django.utils.functional import Promise
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+# Part of the key of every cache entry holding encoded bytes; bump it whenever
+# the output of dumps() changes so bytes in the old format are never served.
+WIRE_VERSION = 2
+
+_django = DjangoJSONEncoder()
+
+
+def _default(obj):
+    if isinstance(obj, (decimal.Decimal, datetime.datetime, datetime.date, datetime.time,
+                        datetime.timedelta, uuid.UUID, Promise)):
+        return _django.default(obj)
+    if isinstance(obj, QuerySet):
+        return list(obj)
+    if isinstance(obj, Model):
+        return model_to_dict(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f'Object of type {obj.__class__.__name__} is not JSON serializable')
+
+
+if orjson is not None:
+    def dumps(data):
+        # Datetimes go through _default so they match DjangoJSONEncoder.
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+else:
+    def dumps(data):
+        return json.dumps(data, default=_default, separators=(',', ':'), ensure_ascii=False).encode()
@@ -0,0 +1,151 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Offset pages run ``COUNT(*)`` and make the database walk past every skipped
+row, so page 10,000 costs ten thousand pages of work. A keyset page instead
+seeks straight to the rows after (or before) the last row the client saw,
+using the queryset's ordering plus the primary key as a tie-breaker, and
+costs the same at any depth when that ordering is indexed.
+
+Cursors are signed, so clients treat them as opaque and cannot forge a seek
+position. No total is computed unless the client asks for an approximate
+count. Offset pagination stays the default; endpoints switch to keyset pages
+when ``after``/``before`` is present or ``pagination=cursor`` is passed.
+"""
+import json
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q
+
+KEYSET_COUNT_CAP = getattr(settings, 'KEYSET_COUNT_CAP', 10000)
+
+SALT = 'users.keyset'
+
+
+class PageCursor:
+    """Decoded cursor request: at most one of ``after``/``before`` (lists of sort values)."""
+
+    def __init__(self, after=None, before=None, with_count=False):
+        self.after = after
+        self.before = before
+        self.with_count = with_count
+
+
+def encode(values):
+    return signing.dumps(values, salt=SALT, compress=True)
+
+
+def decode(token):
+    """Sort values from a cursor token; raises ``signing.BadSignature`` when tampered with."""
+    values = signing.loads(token, salt=SALT)
+    if not isinstance(values, list):
+        raise signing.BadSignature('Malformed cursor')
+    return values
+
+
+def _ordering(queryset):
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+    fields = []
+    for name in ordering:
+        descending = name.startswith('-')
+        name = name.lstrip('-')
+        field = queryset.model._meta.pk if name == 'pk' else queryset.model._meta.get_field(name)
+        if field.null:
+            raise ValueError(f'Keyset pagination needs non-null sort fields, {name} is nullable')
+        fields.append((field, descending))
+
+    if not fields or not fields[-1][0].primary_key:
+        # The primary key breaks ties so every row has a unique position.
+        fields.append((queryset.model._meta.pk, fields[-1][1] if fields else True))
+    return fields
+
+
+def supports(queryset):
+    """Whether the queryset's ordering is usable as a keyset (plain, non-null fields)."""
+    try:
+        _ordering(queryset)
+    except (ValueError, FieldDoesNotExist):
+        return False
+    return True
+
+
+def _position(obj, fields):
+    return [field.value_to_string(obj) for field, _ in fields]
+
+
+def _seek(fields, values, forward):
+    """Rows strictly past ``values`` in the (possibly reversed) ordering."""
+    condition = Q()
+    for i, (field, descending) in enumerate(fields):
+        lookup = 'lt' if descending == forward else 'gt'
+        step = Q(**{f'{fields[j][0].attname}': values[j] for j in range(i)})
+        step &= Q(**{f'{field.attname}__{lookup}': values[i]})
+        condition |= step
+
+    # A plain range on the leading key lets the planner seek the index instead
+    # of filtering the OR row by row.
+    field, descending = fields[0]
+    bound = Q(**{f'{field.attname}__{"lte" if descending == forward else "gte"}': values[0]})
+    return bound & condition
+
+
+def approximate_count(queryset):
+    """Row estimate: the planner's on PostgreSQL, else a count capped at ``KEYSET_COUNT_CAP``."""
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    return queryset[:KEYSET_COUNT_CAP].count()
+
+
+def paginate(queryset, cursor, per_page):
+    """Return ``(rows, pagination)`` for one keyset page of an ordered queryset."""
+    fields = _ordering(queryset)
+    per_page = max(1, int(per_page))
+    anchor = cursor.before if cursor.before is not None else cursor.after
+    forward = cursor.before is None
+
+    if anchor is not None and len(anchor) != len(fields):
+        # Cursor from a different ordering: start over from the first page.
+        anchor, forward = None, True
+
+    page_qs = queryset
+    if anchor is not None:
+        try:
+            values = [field.to_python(value) for (field, _), value in zip(fields, anchor)]
+        except ValidationError:
+            values, anchor, forward = None, None, True
+        if anchor is not None:
+            page_qs = page_qs.filter(_seek(fields, values, forward))
+
+    ordering = [f'{"-" if descending == forward else ""}{field.attname}' for field, descending in fields]
+    rows = list(page_qs.order_by(*ordering)[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if not forward:
+        rows.reverse()
+
+    if forward:
+        has_next, has_previous = has_more, anchor is not None
+    else:
+        has_next, has_previous = True, has_more
+
+    pagination = {
+        'per_page': per_page,
+        'has_next': has_next,
+        'has_previous': has_previous,
+        'next_cursor': encode(_position(rows[-1], fields)) if has_next and rows else None,
+        'previous_cursor': encode(_position(rows[0], fields)) if has_previous and rows else None,
+    }
+    if cursor.with_count:
+        pagination['approximate_count'] = approximate_count(queryset)
+    return rows, pagination
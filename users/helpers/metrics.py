@@ -0,0 +1,82 @@
+"""
+Counters and timing histograms kept in Redis.
+
+Every process adds into the same ``trendy:metrics:<name>`` hash, so a scraper
+or the admin dashboard reads one key for the fleet-wide view. Writes never
+raise; losing a sample is preferable to failing the request that produced it.
+
+``tally`` is for hot paths: it counts in process memory and flushes every
+``FLUSH_INTERVAL`` seconds in one pipeline, so a cache read does not pay an
+extra Redis round trip for its own hit counter.
+"""
+import threading
+import time
+
+from django_redis import get_redis_connection
+
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+FLUSH_INTERVAL = 5
+
+_pending = {}
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def _key(name):
+    return f'trendy:metrics:{name}'
+
+
+def incr(name, amount=1):
+    try:
+        get_redis_connection('default').hincrby(_key(name), 'count', amount)
+    except Exception:
+        pass
+
+
+def observe(name, seconds):
+    """Record one timing sample in milliseconds-bucketed histogram form."""
+    ms = seconds * 1000
+    bucket = next((f'le_{limit}' for limit in BUCKETS_MS if ms <= limit), 'le_inf')
+    try:
+        pipe = get_redis_connection('default').pipeline(transaction=False)
+        pipe.hincrby(_key(name), 'count', 1)
+        pipe.hincrbyfloat(_key(name), 'sum_ms', round(ms, 3))
+        pipe.hincrby(_key(name), bucket, 1)
+        pipe.execute()
+    except Exception:
+        pass
+
+
+def read(name):
+    try:
+        raw = get_redis_connection('default').hgetall(_key(name))
+    except Exception:
+        return {}
+    return {field.decode(): float(value) for field, value in raw.items()}
+
+
+def tally(name, field, amount=1):
+    """Buffered ``HINCRBY`` of ``field`` in metric ``name``."""
+    global _last_flush
+    with _pending_lock:
+        _pending[(name, field)] = _pending.get((name, field), 0) + amount
+        due = time.monotonic() - _last_flush >= FLUSH_INTERVAL
+        if due:
+            _last_flush = time.monotonic()
+    if due:
+        flush()
+
+
+def flush():
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+    if not pending:
+        return
+    try:
+        pipe = get_redis_connection('default').pipeline(transaction=False)
+        for (name, field), amount in pending.items():
+            pipe.hincrby(_key(name), field, amount)
+        pipe.execute()
+    except Exception:
+        pass
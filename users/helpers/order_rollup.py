@@ -0,0 +1,209 @@
+"""
+Daily order rollups for the admin analytics.
+
+``OrderServiceRollup`` and ``OrderUserRollup`` hold, per day and per service
+or customer, the order count, revenue, profit, completed revenue/profit and a
+count for every status. Order writes pass the rows they add, remove or change
+to ``apply()`` inside their own transaction, which turns them into per-key
+deltas and adds them with ``F()`` expressions, so concurrent writers never
+overwrite each other. The analytics endpoints then aggregate over days instead
+of over every order ever placed.
+
+The same deltas, summed per day, go to ``dashboard_counters.record()``.
+
+``rebuild()`` recomputes both tables from ``Order`` and ``verify()`` compares
+them with the raw table day by day (see the ``rebuild_order_rollups`` command).
+"""
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from users.models import Order, OrderServiceRollup, OrderUserRollup
+from . import dashboard_counters
+
+STATUS_FIELDS = {status: status.lower() for status in Order.OrderStatus.values}
+AMOUNT_FIELDS = ('revenue', 'profit', 'completed_revenue', 'completed_profit')
+FIELDS = ('orders', *AMOUNT_FIELDS, *STATUS_FIELDS.values())
+
+# (rollup model, key on both Order and the rollup)
+ROLLUPS = ((OrderServiceRollup, 'service_id'), (OrderUserRollup, 'user_id'))
+
+# What apply() needs to know about an order.
+ROW_FIELDS = ('submitted_at', 'service_id', 'user_id', 'status', 'price_paid', 'profit')
+
+REBUILD_BATCH_SIZE = 1000
+
+AGGREGATES = {
+    'orders': Count('id'),
+    'revenue': Sum('price_paid'),
+    'profit': Sum('profit'),
+    'completed_revenue': Sum('price_paid', filter=Q(status='COMPLETED')),
+    'completed_profit': Sum('profit', filter=Q(status='COMPLETED')),
+    **{field: Count('id', filter=Q(status=status)) for status, field in STATUS_FIELDS.items()},
+}
+
+
+def row(order):
+    """The ``ROW_FIELDS`` of an ``Order`` instance, as ``.values()`` would return them."""
+    return {
+        'submitted_at': order.submitted_at,
+        'service_id': order.service_id_id,
+        'user_id': order.user_id_id,
+        'status': order.status,
+        'price_paid': order.price_paid,
+        'profit': order.profit,
+    }
+
+
+def rows(queryset):
+    return list(queryset.values(*ROW_FIELDS))
+
+
+def _contribution(row):
+    fields = {'orders': 1, 'revenue': row['price_paid'], 'profit': row['profit'], STATUS_FIELDS[row['status']]: 1}
+    if row['status'] == 'COMPLETED':
+        fields['completed_revenue'] = row['price_paid']
+        fields['completed_profit'] = row['profit']
+    return fields
+
+
+def apply(added=(), removed=()):
+    """Add the ``added`` order rows to the rollups and take the ``removed`` ones out.
+
+    A status change is ``apply(added=[after], removed=[before])``; the order
+    count and revenue cancel out and only the status columns move.
+    """
+    deltas = {key: defaultdict(Counter) for _, key in ROLLUPS}
+    for sign, items in ((1, added), (-1, removed)):
+        for item in items:
+            day = timezone.localdate(item['submitted_at'])
+            for field, value in _contribution(item).items():
+                for _, key in ROLLUPS:
+                    deltas[key][(day, item[key])][field] += sign * value
+
+    for model, key in ROLLUPS:
+        _write(model, key, deltas[key])
+    dashboard_counters.record(_by_day(deltas['service_id']))
+
+
+def discard(queryset):
+    """Take every order in ``queryset`` out of the rollups, one grouped aggregate per table.
+
+    For deletes that may cover many orders (bulk deletes, cascades from a
+    service, supplier or user).
+    """
+    for model, key in ROLLUPS:
+        deltas = {
+            (item['day'], item[key]): {field: -(item[f'sum_{field}'] or 0) for field in FIELDS}
+            for item in _grouped(queryset, key)
+        }
+        _write(model, key, deltas)
+    # Both tables cover the same orders, so either one's deltas give the per-day totals.
+    dashboard_counters.record(_by_day(deltas))
+
+
+def _by_day(deltas):
+    days = defaultdict(Counter)
+    for (day, _), fields in deltas.items():
+        days[day].update(fields)
+    return days
+
+
+def _write(model, key, deltas):
+    deltas = {
+        group: {field: value for field, value in fields.items() if value}
+        for group, fields in deltas.items()
+    }
+    deltas = {group: fields for group, fields in deltas.items() if fields}
+    if not deltas:
+        return
+
+    model.objects.bulk_create(
+        [model(day=day, **{f'{key}_id': key_id}) for day, key_id in deltas],
+        ignore_conflicts=True
+    )
+    for (day, key_id), fields in deltas.items():
+        model.objects.filter(day=day, **{key: key_id}).update(
+            **{field: F(field) + value for field, value in fields.items()}
+        )
+
+
+def _grouped(queryset, key):
+    return queryset.annotate(day=TruncDate('submitted_at')).values('day', key).annotate(
+        **{f'sum_{field}': aggregate for field, aggregate in AGGREGATES.items()}
+    ).order_by()
+
+
+@transaction.atomic
+def rebuild():
+    """Recompute both rollup tables from ``Order``; returns the number of rows written per table."""
+    written = {}
+    for model, key in ROLLUPS:
+        model.objects.all().delete()
+        objects = [
+            model(day=item['day'], **{f'{key}_id': item[key]}, **{
+                field: item[f'sum_{field}'] or 0 for field in FIELDS
+            })
+            for item in _grouped(Order.objects.all(), key).iterator(chunk_size=REBUILD_BATCH_SIZE)
+        ]
+        model.objects.bulk_create(objects, batch_size=REBUILD_BATCH_SIZE)
+        written[model.__name__] = len(objects)
+    return written
+
+
+def verify():
+    """Days on which a rollup table disagrees with ``Order``: ``[(table, day, {field: (expected, actual)})]``."""
+    expected = {
+        item['day']: {field: item[f'sum_{field}'] or 0 for field in FIELDS}
+        for item in Order.objects.annotate(day=TruncDate('submitted_at')).values('day').annotate(
+            **{f'sum_{field}': aggregate for field, aggregate in AGGREGATES.items()}
+        ).order_by()
+    }
+    empty = dict.fromkeys(FIELDS, 0)
+
+    mismatches = []
+    for model, _ in ROLLUPS:
+        actual = {
+            item['day']: {field: item[f'sum_{field}'] or 0 for field in FIELDS}
+            for item in model.objects.values('day').annotate(
+                **{f'sum_{field}': Sum(field) for field in FIELDS}
+            ).order_by()
+        }
+        for day in sorted(expected.keys() | actual.keys()):
+            want, got = expected.get(day, empty), actual.get(day, empty)
+            diff = {field: (want[field], got[field]) for field in FIELDS if want[field] != got[field]}
+            if diff:
+                mismatches.append((model.__name__, day, diff))
+    return mismatches
+
+
+def to_day(value):
+    """A date from a ``date``, ``datetime`` or ISO string (date or datetime); None when blank."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+    if isinstance(value, date):
+        return value
+    parsed = parse_datetime(value)
+    if parsed is not None:
+        return to_day(parsed)
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f'Invalid date: {value}')
+    return parsed
+
+
+def since(days):
+    """First day of a window of ``days`` days ending today."""
+    return timezone.localdate() - timedelta(days=days - 1)
+
+
+def day_start(day):
+    """Midnight at the start of ``day`` in the current timezone."""
+    return timezone.make_aware(datetime.combine(day, time.min))
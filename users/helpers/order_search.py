@@ -0,0 +1,188 @@
+"""
+Indexed search over orders for the admin order list and export.
+
+``classify()`` routes a search string to one index instead of OR-ing four
+``icontains`` scans across orders, users and services:
+
+* ``link``: a URL is normalized (scheme, ``www.``/``m.``, trailing slash and
+  tracking parameters dropped) and looked up by ``Order.link_hash``, so every
+  order for the same Instagram post is found whatever the pasted form,
+* ``email``: a full address, or ``name@``/``name@dom`` as a prefix, resolves
+  user ids through the ``LOWER(email)`` index, ignoring case; ``@domain``
+  matches every address at that domain (a scan of users, not orders),
+* ``order_number``: ``ORD-2026...``, matched exactly or as a prefix,
+* ``reference``: any other single token with digits (``SUP-9981``,
+  ``BENCH-0001``), a prefix of the order number or the supplier's order id,
+  or a service whose name matches (``1000``, ``10k``),
+* ``service``: anything else goes through the service full-text index and
+  filters orders by the matching service ids.
+
+``kind:value`` (e.g. ``email:bob``, ``service:likes``) forces a route.
+
+Prefix matches are index range scans: ``LIKE 'x%'`` against the
+``varchar_pattern_ops`` indexes from migrations 0014/0015 on PostgreSQL, plus an
+explicit range on SQLite, whose LIKE cannot use a binary-collated index.
+"""
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from . import service_search
+
+# Query parameters that identify the sharer or campaign, not the target.
+TRACKING_PARAMS = {'igshid', 'igsh', 'si', 'fbclid', 'gclid', 'feature', 'ref', 'ref_src', 's', 't'}
+HOST_PREFIXES = ('www.', 'm.', 'mobile.')
+
+# Users or services a search may expand to; the service search caps at the same number.
+MAX_MATCHES = 1000
+
+KINDS = ('link', 'email', 'order_number', 'reference', 'service')
+_URL_RE = re.compile(r'^(https?://)?([\w-]+\.)+[a-z]{2,}(:\d+)?(/\S*)?$', re.IGNORECASE)
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+# Order numbers come from ids.next_id('ORD'); other dashed codes may be supplier ids.
+_ORDER_NUMBER_RE = re.compile(r'^ORD-[0-9A-Z-]*$', re.IGNORECASE)
+_REFERENCE_RE = re.compile(r'^[\w-]*\d[\w-]*$')
+_FORCED_RE = re.compile(rf'^({"|".join(KINDS)}):\s*(.+)$', re.IGNORECASE)
+
+
+def normalize_link(link):
+    link = (link or '').strip()
+    if not link:
+        return ''
+    if '://' not in link:
+        link = f'https://{link}'
+    parts = urlsplit(link)
+
+    host = (parts.hostname or '').lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    path = parts.path.rstrip('/')
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    )
+    return f'{host}{path}?{urlencode(query)}' if query else f'{host}{path}'
+
+
+def link_hash(link):
+    """Value of ``Order.link_hash`` for ``link``; empty for an empty link."""
+    normalized = normalize_link(link)
+    return hashlib.sha256(normalized.encode()).hexdigest()[:32] if normalized else ''
+
+
+def classify(search):
+    """``(kind, value)`` for a search string, or ``(None, '')`` when there is nothing to search."""
+    search = (search or '').strip()
+    if not search:
+        return None, ''
+
+    forced = _FORCED_RE.match(search)
+    if forced:
+        return forced.group(1).lower(), forced.group(2).strip()
+    # Links first: TikTok paths carry an "@" (tiktok.com/@user/video/...).
+    if search.lower().startswith(('http://', 'https://')) or (_URL_RE.match(search) and '/' in search):
+        return 'link', search
+    if _EMAIL_RE.match(search) or ('@' in search and '/' not in search and ' ' not in search):
+        return 'email', search
+    if _ORDER_NUMBER_RE.match(search):
+        return 'order_number', search
+    if _REFERENCE_RE.match(search):
+        return 'reference', search
+    return 'service', search
+
+
+def _prefix(field, value):
+    q = Q(**{f'{field}__startswith': value})
+    if connection.vendor == 'sqlite' and value:
+        upper = value[:-1] + chr(ord(value[-1]) + 1)
+        q &= Q(**{f'{field}__gte': value, f'{field}__lt': upper})
+    return q
+
+
+def _matching(key, queryset):
+    """Orders whose ``key`` is one of the (at most ``MAX_MATCHES``) ids in ``queryset``.
+
+    The ids are resolved first so that a single match filters with ``=`` and
+    walks the ``(key, -submitted_at, -id)`` index already in page order.
+    """
+    ids = list(queryset.values_list('id', flat=True)[:MAX_MATCHES])
+    if len(ids) == 1:
+        return Q(**{key: ids[0]})
+    return Q(**{f'{key}__in': ids})
+
+
+def _email(value):
+    from users.models import User
+
+    # Emails are stored as typed; LOWER(email) is indexed (users_user_email_lower_idx).
+    users = User.objects.annotate(email_lower=Lower('email'))
+    if value.startswith('@'):
+        # A whole domain can be more users than MAX_MATCHES; keep it a subquery.
+        return Q(user_id__in=users.filter(email_lower__contains=value.lower()).values('id'))
+    if _EMAIL_RE.match(value):
+        users = users.filter(email_lower=value.lower())
+    else:
+        users = users.filter(_prefix('email_lower', value.lower()))
+    return _matching('user_id', users)
+
+
+def _service(value):
+    from users.models import Service
+
+    services, _, _ = service_search.filter_services(Service.objects.all(), value)
+    return _matching('service_id', services)
+
+
+def condition(search):
+    """``(Q, kind)`` matching ``search``; ``(None, None)`` for an empty search."""
+    kind, value = classify(search)
+    if kind is None:
+        return None, None
+    if kind == 'link':
+        return Q(link_hash=link_hash(value)), kind
+    if kind == 'email':
+        return _email(value), kind
+    if kind == 'order_number':
+        return _prefix('order_number', value.upper()), kind
+    if kind == 'reference':
+        q = _prefix('order_number', value.upper()) | _prefix('supplier_order_id', value)
+        if value.upper() != value:
+            q |= _prefix('supplier_order_id', value.upper())
+        # Service names carry numbers too ("1000 Followers", "10K Views").
+        return q | _service(value), kind
+    return _service(value), kind
+
+
+def filter_orders(queryset, search):
+    """Apply ``search`` to an Order queryset; an empty search leaves it unchanged."""
+    q, _ = condition(search)
+    return queryset.filter(q) if q is not None else queryset
+
+
+def backfill_link_hashes(batch_size=2000):
+    """Fill ``link_hash`` where it is missing or stale; returns the number of orders updated."""
+    from users.models import Order as model
+
+    updated = 0
+    last_id = 0
+    while True:
+        rows = list(
+            model.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'link', 'link_hash')[:batch_size]
+        )
+        if not rows:
+            return updated
+        last_id = rows[-1][0]
+        changed = [
+            model(id=order_id, link_hash=link_hash(link))
+            for order_id, link, current in rows
+            if link_hash(link) != current
+        ]
+        if changed:
+            model.objects.bulk_update(changed, ['link_hash'])
+            updated += len(changed)
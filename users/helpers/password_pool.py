@@ -0,0 +1,136 @@
+"""
+Password hashing on a bounded process pool.
+
+PBKDF2 holds the CPU for tens of milliseconds, which under ASGI stalls every
+other request sharing the worker. Hashes run in ``PASSWORD_HASH_WORKERS``
+separate processes instead; at most ``PASSWORD_HASH_QUEUE_LIMIT`` jobs may be
+queued or running, beyond which callers get ``PoolBusy`` and the view answers
+503 with Retry-After. Queue wait and hash time go to ``metrics`` under
+``auth.hash.queue_wait`` and ``auth.hash.time``. Setting the worker count to 0
+hashes inline, which is handy for tests.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from . import metrics
+
+WORKERS = getattr(settings, 'PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1))
+QUEUE_LIMIT = getattr(settings, 'PASSWORD_HASH_QUEUE_LIMIT', max(1, WORKERS) * 8)
+RETRY_AFTER = getattr(settings, 'PASSWORD_HASH_RETRY_AFTER', 2)
+
+
+class PoolBusy(Exception):
+    def __init__(self, retry_after=RETRY_AFTER):
+        super().__init__('Password hashing queue is full')
+        self.retry_after = retry_after
+
+
+_executor = None
+_lock = threading.Lock()
+_pending = 0
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+        return _executor
+
+
+def _timed(func, *args):
+    started = time.time()
+    result = func(*args)
+    return result, started, time.time() - started
+
+
+def _hash(password):
+    from django.contrib.auth.hashers import make_password
+    return make_password(password)
+
+
+def _check(password, encoded):
+    """Return ``(matches, needs_rehash)``, mirroring Django's ``check_password``."""
+    from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher
+
+    if not check_password(password, encoded):
+        return False, False
+    preferred = get_hasher()
+    try:
+        current = identify_hasher(encoded)
+    except ValueError:
+        return True, True
+    return True, current.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def _finished(future, submitted):
+    global _executor, _pending
+    with _lock:
+        _pending -= 1
+        if isinstance(future.exception(), BrokenProcessPool):
+            _executor = None
+    if future.exception() is None:
+        _, started, elapsed = future.result()
+        metrics.observe('auth.hash.queue_wait', max(0.0, started - submitted))
+        metrics.observe('auth.hash.time', elapsed)
+
+
+def _submit(func, *args):
+    global _pending
+    with _lock:
+        if _pending >= QUEUE_LIMIT:
+            metrics.incr('auth.hash.rejected')
+            raise PoolBusy()
+        _pending += 1
+
+    submitted = time.time()
+    if WORKERS == 0:
+        future = Future()
+        try:
+            future.set_result(_timed(func, *args))
+        except Exception as e:
+            future.set_exception(e)
+    else:
+        try:
+            future = _get_executor().submit(_timed, func, *args)
+        except Exception:
+            with _lock:
+                _pending -= 1
+            raise
+    future.add_done_callback(lambda f: _finished(f, submitted))
+    return future
+
+
+def hash_password(password):
+    return _submit(_hash, password).result()[0]
+
+
+def check_password(password, encoded):
+    return _submit(_check, password, encoded).result()[0]
+
+
+async def ahash_password(password):
+    return (await asyncio.wrap_future(_submit(_hash, password)))[0]
+
+
+async def acheck_password(password, encoded):
+    return (await asyncio.wrap_future(_submit(_check, password, encoded)))[0]
+
+
+def stats():
+    return {'pending': _pending, 'limit': QUEUE_LIMIT, 'workers': WORKERS}
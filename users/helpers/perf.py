@@ -0,0 +1,213 @@
+"""
+Per-request performance counters.
+
+``PerfMiddleware`` opens a ``RequestStats`` in a context variable; hooks
+installed once by ``install()`` add to whatever stats object is current:
+
+* database: an execute wrapper on every connection (query count and time),
+* cache: ``InstrumentedRedisCache`` (gets, hits, sets),
+* Redis: ``Redis.execute_command`` and ``Pipeline.execute``, which covers the
+  Django cache, ``get_redis_connection`` users and ``TicketQueueManager``,
+* outbound HTTP: ``requests.Session.send`` (NOWPayments and suppliers),
+* serialization: ``timer('serialize')`` around JSON encoding.
+
+Context variables follow ``sync_to_async`` hops, so the same counters work
+under WSGI and ASGI. Outside a request every hook is a cheap no-op.
+"""
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+PERF_SAMPLE_RATE = getattr(settings, 'PERF_SAMPLE_RATE', 0.01)
+DETAIL_TARGETS_KEY = 'perf:detail'
+DETAIL_TARGETS_LOCAL_TTL = 5
+MAX_QUERIES_KEPT = 50
+
+_current = contextvars.ContextVar('perf_request_stats', default=None)
+_installed = False
+_detail_targets = (0.0, frozenset())
+
+
+class RequestStats:
+    __slots__ = (
+        'started', 'queries', 'db_time', 'query_log', 'cache_gets', 'cache_hits', 'cache_sets',
+        'redis_calls', 'redis_time', 'http_calls', 'http_time', 'timers'
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.query_log = []
+        self.cache_gets = 0
+        self.cache_hits = 0
+        self.cache_sets = 0
+        self.redis_calls = 0
+        self.redis_time = 0.0
+        self.http_calls = 0
+        self.http_time = 0.0
+        self.timers = {}
+
+    def as_dict(self):
+        return {
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 2),
+            'cache_gets': self.cache_gets,
+            'cache_hits': self.cache_hits,
+            'cache_hit_ratio': round(self.cache_hits / self.cache_gets, 3) if self.cache_gets else None,
+            'cache_sets': self.cache_sets,
+            'redis_calls': self.redis_calls,
+            'redis_ms': round(self.redis_time * 1000, 2),
+            'http_calls': self.http_calls,
+            'http_ms': round(self.http_time * 1000, 2),
+            **{f'{name}_ms': round(value * 1000, 2) for name, value in self.timers.items()},
+        }
+
+    def server_timing(self):
+        entries = [
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f'cache;desc="{self.cache_hits}/{self.cache_gets} hits, {self.cache_sets} sets"',
+            f'redis;dur={self.redis_time * 1000:.2f};desc="{self.redis_calls} calls"',
+        ]
+        if self.http_calls:
+            entries.append(f'http;dur={self.http_time * 1000:.2f};desc="{self.http_calls} calls"')
+        entries.extend(f'{name};dur={value * 1000:.2f}' for name, value in self.timers.items())
+        entries.append(f'total;dur={(time.perf_counter() - self.started) * 1000:.2f}')
+        return ', '.join(entries)
+
+
+def start():
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+def sampled():
+    return random.random() < PERF_SAMPLE_RATE
+
+
+@contextmanager
+def timer(name):
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.timers[name] = stats.timers.get(name, 0.0) + time.perf_counter() - started
+
+
+def record_cache_get(requested, hits):
+    stats = _current.get()
+    if stats is not None:
+        stats.cache_gets += requested
+        stats.cache_hits += hits
+
+
+def record_cache_set(count=1):
+    stats = _current.get()
+    if stats is not None:
+        stats.cache_sets += count
+
+
+# --- Full-detail targets -------------------------------------------------------
+
+def detail_targets():
+    """Identities (``user:<id>`` / ``key:<prefix>``) with full detail on, cached briefly per process."""
+    global _detail_targets
+    loaded_at, targets = _detail_targets
+    if time.monotonic() - loaded_at > DETAIL_TARGETS_LOCAL_TTL:
+        try:
+            targets = frozenset(cache.get(DETAIL_TARGETS_KEY) or ())
+        except Exception:
+            targets = frozenset()
+        _detail_targets = (time.monotonic(), targets)
+    return targets
+
+
+def set_detail(identity, enabled):
+    targets = set(cache.get(DETAIL_TARGETS_KEY) or ())
+    if enabled:
+        targets.add(identity)
+    else:
+        targets.discard(identity)
+    cache.set(DETAIL_TARGETS_KEY, sorted(targets), timeout=None)
+    global _detail_targets
+    _detail_targets = (0.0, frozenset())
+    return sorted(targets)
+
+
+# --- Hooks --------------------------------------------------------------------
+
+def _db_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        stats.queries += 1
+        stats.db_time += elapsed
+        if len(stats.query_log) < MAX_QUERIES_KEPT:
+            stats.query_log.append((round(elapsed * 1000, 2), sql[:300]))
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    if _db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_wrapper)
+
+
+def _timed_call(func, kind):
+    def wrapper(*args, **kwargs):
+        stats = _current.get()
+        if stats is None:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if kind == 'redis':
+                stats.redis_calls += 1
+                stats.redis_time += time.perf_counter() - started
+            else:
+                stats.http_calls += 1
+                stats.http_time += time.perf_counter() - started
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def install():
+    """Attach the DB, Redis and HTTP hooks. Safe to call more than once."""
+    global _installed
+    if _installed or not getattr(settings, 'PERF_INSTRUMENTATION', True):
+        return
+    _installed = True
+
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+    import redis.client
+    import requests.sessions
+
+    connection_created.connect(_on_connection_created)
+    for conn in connections.all(initialized_only=True):
+        _on_connection_created(None, conn)
+
+    redis.client.Redis.execute_command = _timed_call(redis.client.Redis.execute_command, 'redis')
+    redis.client.Pipeline.execute = _timed_call(redis.client.Pipeline.execute, 'redis')
+    requests.sessions.Session.send = _timed_call(requests.sessions.Session.send, 'http')
@@ -0,0 +1,131 @@
+"""
+Two-tier cache of authenticated principals, keyed by token fingerprint.
+
+Tier 1 is a per-worker LRU with a short TTL, tier 2 is the shared Redis cache.
+Every Redis entry carries the user's current "generation" token; rotating the
+generation (``invalidate_user``) makes all cached principals of that user
+unusable at once. Other workers may keep serving their local copy for at most
+``PRINCIPAL_LOCAL_CACHE_TTL`` seconds.
+"""
+import hashlib
+import secrets
+import time
+
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+
+from users.models import User
+from .lru import LocalLRUCache
+
+PRINCIPAL_FIELDS = ('id', 'first_name', 'last_name', 'email', 'role', 'status')
+
+PRINCIPAL_CACHE_TTL = getattr(settings, 'PRINCIPAL_CACHE_TTL', 300)
+PRINCIPAL_LOCAL_CACHE_TTL = getattr(settings, 'PRINCIPAL_LOCAL_CACHE_TTL', 5)
+PRINCIPAL_LOCAL_CACHE_SIZE = getattr(settings, 'PRINCIPAL_LOCAL_CACHE_SIZE', 10000)
+
+_local = LocalLRUCache(maxsize=PRINCIPAL_LOCAL_CACHE_SIZE, ttl=PRINCIPAL_LOCAL_CACHE_TTL)
+
+
+def token_fingerprint(token):
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+def _entry_key(fingerprint):
+    return f'principal:token:{fingerprint}'
+
+
+def _generation_key(user_id):
+    return f'principal:gen:{user_id}'
+
+
+def _build_user(entry):
+    # from_db() expects values in model field order; the rest stay deferred,
+    # exactly like the instance returned by User.objects.only(...).
+    fields = [f.attname for f in User._meta.concrete_fields if f.attname in PRINCIPAL_FIELDS]
+    return User.from_db('default', fields, [entry[field] for field in fields])
+
+
+def _unverified_user_id(token):
+    # Only used to locate the generation key; the entry itself is keyed by the
+    # fingerprint of a token that was fully verified before it was stored.
+    try:
+        return jwt.decode(token, options={'verify_signature': False}).get('user_id')
+    except jwt.InvalidTokenError:
+        return None
+
+
+def lookup(token):
+    """
+    Return ``(user, generation)``. ``user`` is None on a miss, in which case
+    ``generation`` must be passed back to ``store`` after the token has been
+    verified against the database.
+    """
+    fingerprint = token_fingerprint(token)
+
+    entry = _local.get(fingerprint)
+    if entry is not None:
+        return _build_user(entry), None
+
+    user_id = _unverified_user_id(token)
+    if user_id is None:
+        return None, None
+
+    try:
+        gen_key = _generation_key(user_id)
+        values = cache.get_many([_entry_key(fingerprint), gen_key])
+        generation = values.get(gen_key)
+        if generation is None:
+            cache.add(gen_key, secrets.token_hex(8), None)
+            generation = cache.get(gen_key)
+    except Exception:
+        return None, None
+
+    entry = values.get(_entry_key(fingerprint))
+    if entry is None or entry.get('gen') != generation:
+        return None, generation
+
+    _local.set(fingerprint, entry, entry['expires_at'] - time.time())
+    return _build_user(entry), generation
+
+
+def store(token, user, payload, generation):
+    if generation is None:
+        return
+
+    ttl = PRINCIPAL_CACHE_TTL
+    if payload.get('exp'):
+        ttl = min(ttl, int(payload['exp'] - time.time()))
+    if ttl <= 0:
+        return
+
+    entry = {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+    entry['gen'] = generation
+    entry['expires_at'] = time.time() + ttl
+
+    fingerprint = token_fingerprint(token)
+    try:
+        cache.set(_entry_key(fingerprint), entry, ttl)
+    except Exception:
+        return
+    _local.set(fingerprint, entry, ttl)
+
+
+def invalidate_user(user_id):
+    """Drop every cached principal of ``user_id`` (role or status change, deletion)."""
+    user_id = int(getattr(user_id, 'id', user_id))
+    _local.delete_where(lambda entry: entry['id'] == user_id)
+    try:
+        cache.set(_generation_key(user_id), secrets.token_hex(8), None)
+    except Exception:
+        pass
+
+
+def invalidate_token(token):
+    """Drop the cached principal of a single token (logout of one device)."""
+    fingerprint = token_fingerprint(token)
+    _local.delete(fingerprint)
+    try:
+        cache.delete(_entry_key(fingerprint))
+    except Exception:
+        pass
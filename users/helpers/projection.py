@@ -0,0 +1,94 @@
+"""
+Response shapes declared as the columns they read.
+
+A ``Projection`` maps every output field to the database column(s) behind
+it, so a list endpoint can ``.values()`` just the columns of the fields a
+client asked for (``fields=name,price_per_100``) instead of hydrating full
+model instances and related rows. Nested groups such as ``category`` are
+selected as a whole. ``instance()`` renders the same shape from a model
+instance, for callers that already hold one (the catalog snapshot).
+"""
+from django.core.files.storage import default_storage
+
+
+def media_url(value):
+    """URL of a stored file, from a ``FieldFile`` or the raw column value."""
+    name = getattr(value, 'name', value)
+    return default_storage.url(name) if name else None
+
+
+def full_name(first_name, last_name):
+    return f'{first_name} {last_name}'
+
+
+class Column:
+    def __init__(self, *paths, convert=None):
+        self.paths = paths
+        self.convert = convert
+
+    def render(self, values):
+        return self.convert(*values) if self.convert else values[0]
+
+
+def _normalize(fields):
+    return {
+        key: _normalize(spec) if isinstance(spec, dict) else spec if isinstance(spec, Column) else Column(spec)
+        for key, spec in fields.items()
+    }
+
+
+def _walk(fields):
+    for spec in fields.values():
+        if isinstance(spec, dict):
+            yield from _walk(spec)
+        else:
+            yield spec
+
+
+def _attribute(obj, path):
+    for part in path.split('__'):
+        obj = getattr(obj, part)
+    return obj
+
+
+class Projection:
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = _normalize(fields)
+
+    def without(self, *names, name):
+        return Projection(name, {key: spec for key, spec in self.fields.items() if key not in names})
+
+    def select(self, names=None):
+        """Validated field names in declaration order; every field when ``names`` is empty."""
+        if not names:
+            return tuple(self.fields)
+        names = {name.strip() for name in names if name.strip()}
+        unknown = names - set(self.fields)
+        if unknown:
+            raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}')
+        return tuple(key for key in self.fields if key in names)
+
+    def _specs(self, selected):
+        return {key: self.fields[key] for key in (selected or self.fields)}
+
+    def columns(self, selected=None):
+        columns = []
+        for column in _walk(self._specs(selected)):
+            columns.extend(path for path in column.paths if path not in columns)
+        return columns
+
+    def row(self, values, selected=None):
+        """Render one ``.values()`` row."""
+        return self._render(self._specs(selected), lambda path: values[path])
+
+    def instance(self, obj, selected=None):
+        """Render a model instance (related objects should be ``select_related``)."""
+        return self._render(self._specs(selected), lambda path: _attribute(obj, path))
+
+    def _render(self, specs, get):
+        return {
+            key: self._render(spec, get) if isinstance(spec, dict)
+            else spec.render([get(path) for path in spec.paths])
+            for key, spec in specs.items()
+        }
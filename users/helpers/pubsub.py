@@ -0,0 +1,78 @@
+"""
+Process-local fan-out of Redis pub/sub messages.
+
+Each worker process runs one daemon thread that listens on every channel a
+handler was registered for. Handlers are used to drop in-process caches, so a
+lost message only costs the local TTL of whatever it was meant to evict.
+"""
+import json
+import logging
+import threading
+import time
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+_lock = threading.Lock()
+_listener = None
+
+
+def publish(channel, message):
+    try:
+        get_redis_connection('default').publish(channel, json.dumps(message))
+    except Exception:
+        logger.warning('Could not publish to %s', channel, exc_info=True)
+
+
+def subscribe(channel, handler):
+    with _lock:
+        _handlers.setdefault(channel, []).append(handler)
+    _ensure_listener()
+
+
+def _ensure_listener():
+    global _listener
+    with _lock:
+        if _listener is not None and _listener.is_alive():
+            return
+        _listener = threading.Thread(target=_listen, name='trendy-pubsub', daemon=True)
+        _listener.start()
+
+
+def _dispatch(channel, data):
+    try:
+        message = json.loads(data)
+    except (TypeError, ValueError):
+        return
+
+    for handler in list(_handlers.get(channel, ())):
+        try:
+            handler(message)
+        except Exception:
+            logger.exception('Pub/sub handler for %s failed', channel)
+
+
+def _listen():
+    backoff = 1
+    while True:
+        try:
+            pubsub = get_redis_connection('default').pubsub(ignore_subscribe_messages=True)
+            subscribed = set()
+            while True:
+                pending = set(_handlers) - subscribed
+                if pending:
+                    pubsub.subscribe(*pending)
+                    subscribed |= pending
+
+                item = pubsub.get_message(timeout=1.0)
+                if item and item['type'] == 'message':
+                    channel = item['channel']
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    _dispatch(channel, item['data'])
+                backoff = 1
+        except Exception:
+            logger.warning('Pub/sub listener lost its connection, retrying', exc_info=True)
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
@@ -0,0 +1,136 @@
+"""
+Sliding-window rate limiting for the auth decorators.
+
+Budgets are configured per route in ``settings.RATE_LIMITS`` as
+``{'<namespace>:<url_name>': (limit, window_seconds)}`` with a ``'default'``
+entry, and are counted per identity (API key, user id or IP). The Redis
+backend keeps a sorted-set log per bucket and updates it atomically in a Lua
+script; ``RATE_LIMIT_BACKEND = 'local'`` swaps in an in-process store for
+tests and single-process development.
+"""
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.http import HttpResponse
+from django_redis import get_redis_connection
+from .request import get_client_ip
+
+DEFAULT_LIMIT = (600, 60)
+
+SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+local allowed = 0
+if count < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    count = count + 1
+    allowed = 1
+end
+redis.call('PEXPIRE', key, window)
+
+local reset = window
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+if oldest[2] then
+    reset = tonumber(oldest[2]) + window - now
+end
+return {allowed, count, reset}
+"""
+
+
+class RedisSlidingWindow:
+    def __init__(self):
+        self._script = None
+
+    def hit(self, key, limit, window):
+        if self._script is None:
+            self._script = get_redis_connection('default').register_script(SLIDING_WINDOW_LUA)
+        now_ms = int(time.time() * 1000)
+        allowed, count, reset_ms = self._script(
+            keys=[f'trendy:rl:{key}'],
+            args=[now_ms, window * 1000, limit, f'{now_ms}-{uuid.uuid4().hex[:8]}']
+        )
+        return bool(allowed), int(count), int(reset_ms) / 1000
+
+
+class LocalSlidingWindow:
+    def __init__(self):
+        self._hits = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, window):
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits[key]
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+
+            allowed = len(hits) < limit
+            if allowed:
+                hits.append(now)
+
+            reset = hits[0] + window - now if hits else window
+            return allowed, len(hits), reset
+
+    def clear(self):
+        with self._lock:
+            self._hits.clear()
+
+
+_backend = LocalSlidingWindow() if getattr(settings, 'RATE_LIMIT_BACKEND', 'redis') == 'local' else RedisSlidingWindow()
+
+
+def get_limit(request):
+    limits = getattr(settings, 'RATE_LIMITS', {})
+    match = getattr(request, 'resolver_match', None)
+    route = match.view_name if match else request.path
+    return route, limits.get(route, limits.get('default', DEFAULT_LIMIT))
+
+
+def enforce(request, identity, route=None, budget=None):
+    """Count one hit for ``identity`` on the current route; return a 429 response when over budget."""
+    if not getattr(settings, 'RATE_LIMIT_ENABLED', True):
+        return None
+
+    if route is None:
+        route, budget = get_limit(request)
+    limit, window = budget
+    try:
+        allowed, count, reset = _backend.hit(f'{route}:{identity}', limit, window)
+    except Exception:
+        # Fail open: an unreachable limiter must not take the API down with it.
+        return None
+
+    state = {'limit': limit, 'remaining': max(0, limit - count), 'reset': max(1, int(reset + 0.999))}
+    current = getattr(request, '_rate_limit', None)
+    if current is None or state['remaining'] <= current['remaining']:
+        request._rate_limit = state
+
+    if allowed:
+        return None
+
+    response = HttpResponse(status=429)
+    response['Retry-After'] = str(state['reset'])
+    return add_headers(request, response)
+
+
+def enforce_ip(request):
+    """Route-independent per-IP budget, checked before any credential is looked up."""
+    budget = getattr(settings, 'RATE_LIMIT_PER_IP', (1200, 60))
+    return enforce(request, f'ip:{get_client_ip(request)}', route='any', budget=budget)
+
+
+def add_headers(request, response):
+    state = getattr(request, '_rate_limit', None)
+    if state:
+        response['X-RateLimit-Limit'] = str(state['limit'])
+        response['X-RateLimit-Remaining'] = str(state['remaining'])
+        response['X-RateLimit-Reset'] = str(state['reset'])
+    return response
@@ -1,4 +1,6 @@
 import json
+from django.core import signing
+from . import keyset
 from .response import APIResponse
 
 
@@ -22,4 +24,34 @@ def parse_json_body(request):
     except json.JSONDecodeError:
         return None, APIResponse.error(message='Invalid JSON', status_code=400)
     except Exception as e:
-        return None, APIResponse.server_error(message=str(e))
\ No newline at end of file
+        return None, APIResponse.server_error(message=str(e))
+
+def get_page_cursor(request):
+    """Keyset pagination request from ``after``/``before``/``pagination=cursor``, or None for offset pages."""
+    after, before = request.GET.get('after'), request.GET.get('before')
+    if not (after or before or request.GET.get('pagination') == 'cursor'):
+        return None, None
+
+    if after and before:
+        return None, APIResponse.error(message='Use either after or before, not both', status_code=400)
+
+    try:
+        cursor = keyset.PageCursor(
+            after=keyset.decode(after) if after else None,
+            before=keyset.decode(before) if before else None,
+            with_count=request.GET.get('count') == 'approx'
+        )
+    except signing.BadSignature:
+        return None, APIResponse.error(message='Invalid cursor', status_code=400)
+    return cursor, None
+
+
+def get_fields(request, projection):
+    """Sparse fieldset from ``fields=a,b``: (field names or None for all, error response)."""
+    fields = request.GET.get('fields')
+    if not fields:
+        return None, None
+    try:
+        return projection.select(fields.split(',')), None
+    except ValueError as e:
+        return None, APIResponse.validation_error(errors={'fields': str(e)}, message='Invalid fields')
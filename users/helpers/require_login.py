@@ -1,60 +1,27 @@
-import jwt
 from functools import wraps
-from django.conf import settings
 from rest_framework.response import Response  # ✅ Use DRF Response
-from rest_framework import status  # ✅ Use DRF status codes
-from users.models import User, Session
-
-JWT_SECRET = getattr(settings, 'JWT_SECRET_KEY', settings.SECRET_KEY)
-JWT_ALGO = "HS256"
+from users.helpers import rate_limit
+from users.helpers.auth_context import get_request_auth
 
 def user_required(view_func):
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        token = request.headers.get("Authorization")
-
-        if not token:
-            return Response(
-                {"message": "Missing token"}, 
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-
-        if token.startswith("Bearer "):
-            token = token.split(" ")[1]
-            
-        try:
-            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGO])
-        except jwt.ExpiredSignatureError:
-            return Response(
-                {"message": "Token expired"}, 
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-        except jwt.InvalidTokenError:
-            return Response(
-                {"message": "Invalid token"}, 
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-            
-        user_id = payload.get("user_id")
+        auth = get_request_auth(request)
+        user = auth.user
 
-        try:
-            user = User.objects.only("id", "role", "status").get(id=user_id)
-        except User.DoesNotExist:
-            return Response(
-                {"message": "User not found"}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        if not Session.objects.filter(user_id=user_id, payload=token[:20]).exists():
-            return Response(
-                {"message": "Session expired"}, 
-                status=status.HTTP_401_UNAUTHORIZED
-            )
+        if user is None:
+            message, status_code = auth.user_error
+            return Response({"message": message}, status=status_code)
 
         # ✅ IMPORTANT: Set request.user for DRF
         request.user = user
         request._dont_enforce_csrf_checks = True  # Skip CSRF for API
+
+        limited = rate_limit.enforce(request, f"user:{user.id}")
+        if limited:
+            return limited
         
-        return view_func(request, *args, **kwargs)
+        response = view_func(request, *args, **kwargs)
+        return rate_limit.add_headers(request, response)
 
-    return wrapper
\ No newline at end of file
+    return wrapper
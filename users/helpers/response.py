@@ -1,4 +1,31 @@
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from .json_render import dumps
+from . import perf
+
+
+class FastJsonResponse(JsonResponse):
+    """
+    ``JsonResponse`` encoded by ``json_render``. Top-level ``bytes`` values
+    are treated as already-encoded JSON and spliced in verbatim, so payloads
+    cached in encoded form skip serialization entirely.
+    """
+
+    def __init__(self, data, status=200, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        with perf.timer('serialize'):
+            content = self.encode(data)
+        HttpResponse.__init__(self, content=content, status=status, **kwargs)
+
+    @staticmethod
+    def encode(data):
+        if isinstance(data, (bytes, bytearray)):
+            return bytes(data)
+        if isinstance(data, dict) and any(isinstance(value, (bytes, bytearray)) for value in data.values()):
+            return b'{' + b','.join(
+                dumps(key) + b':' + (bytes(value) if isinstance(value, (bytes, bytearray)) else dumps(value))
+                for key, value in data.items()
+            ) + b'}'
+        return dumps(data)
 
 
 class APIResponse:
@@ -12,7 +39,7 @@ class APIResponse:
         }
         if meta:
             response["meta"] = meta
-        return JsonResponse(response, status=status_code)
+        return FastJsonResponse(response, status=status_code)
     
     @staticmethod
     def error(message="Error occurred", errors=None, status_code=400, data=None):
@@ -24,7 +51,12 @@ class APIResponse:
             response["errors"] = errors
         if data:
             response["data"] = data
-        return JsonResponse(response, status=status_code)
+        return FastJsonResponse(response, status=status_code)
+    
+    @staticmethod
+    def raw(body, status_code=200):
+        """Send a complete, already-encoded JSON body."""
+        return FastJsonResponse(body, status=status_code)
     
     @staticmethod
     def created(data=None, message="Created successfully", status_code=201):
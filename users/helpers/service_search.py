@@ -0,0 +1,187 @@
+"""
+Full-text search over services (name, slug, description).
+
+The backend follows the database vendor:
+
+* SQLite: an FTS5 table, ``users_service_fts``, kept in sync with
+  ``users_service`` by triggers and ranked with bm25,
+* PostgreSQL: a GIN index on a weighted ``tsvector`` expression, ranked with
+  ``ts_rank``,
+* MySQL: a FULLTEXT index queried in boolean mode.
+
+Every term is matched as a prefix, so results are stable while a search box
+is being typed into. The index objects come from migration 0009 and are
+maintained by the database itself, so bulk writes and ``QuerySet.update``
+stay in sync too. Ranked searches keep the best ``SERVICE_SEARCH_LIMIT``
+matches among the services the caller's filters allow, and say when more
+matched. When the index is missing (or ``SERVICE_SEARCH_BACKEND`` is
+``'basic'``), searches fall back to the old ``icontains`` scan.
+"""
+import logging
+import re
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+logger = logging.getLogger(__name__)
+
+SERVICE_SEARCH_BACKEND = getattr(settings, 'SERVICE_SEARCH_BACKEND', 'auto')
+SERVICE_SEARCH_LIMIT = getattr(settings, 'SERVICE_SEARCH_LIMIT', 1000)
+
+MAX_TERMS = 8
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+FTS_TABLE = 'users_service_fts'
+PG_VECTOR = (
+    "(setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(slug, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C'))"
+)
+
+
+def terms(search):
+    return [term.lower() for term in _TERM_RE.findall(search or '')][:MAX_TERMS]
+
+
+def normalize(search):
+    """Canonical form of a search string, used for cache keys."""
+    return ' '.join(terms(search))
+
+
+class BasicBackend:
+    name = 'basic'
+
+    def filter(self, queryset, search):
+        for word in terms(search) or [search]:
+            queryset = queryset.filter(
+                Q(name__icontains=word) |
+                Q(description__icontains=word) |
+                Q(slug__icontains=word)
+            )
+        return queryset, False, False
+
+    def rebuild(self):
+        pass
+
+
+class RankedBackend(BasicBackend, ABC):
+    """Looks up ranked ids with ``sql`` and keeps their order on the queryset.
+
+    The queryset's own filters (status, category, ...) go into the index query
+    as an ``id IN (...)`` subquery, so the ``SERVICE_SEARCH_LIMIT`` cap applies
+    to eligible services only. Apply every filter before searching.
+    """
+    sql = None
+    id_column = 'id'
+
+    @abstractmethod
+    def query(self, words):
+        """The vendor's match expression for ``words``, passed as the first parameter of ``sql``."""
+
+    def params(self, query, scope_params):
+        return [query, *scope_params, SERVICE_SEARCH_LIMIT + 1]
+
+    def search_ids(self, search, queryset=None):
+        words = terms(search)
+        if not words:
+            return []
+        scope, scope_params = '', ()
+        if queryset is not None and queryset.query.where:
+            subquery, scope_params = queryset.order_by().values('id').query.sql_with_params()
+            scope = f' AND {self.id_column} IN ({subquery})'
+        with connection.cursor() as cursor:
+            cursor.execute(self.sql.format(scope=scope), self.params(self.query(words), scope_params))
+            return [row[0] for row in cursor.fetchall()]
+
+    def filter(self, queryset, search):
+        try:
+            ids = self.search_ids(search, queryset)
+        except DatabaseError:
+            logger.warning('%s service search failed, falling back to a scan', self.name, exc_info=True)
+            return super().filter(queryset, search)
+
+        if not ids:
+            return queryset.none(), False, False
+
+        truncated = len(ids) > SERVICE_SEARCH_LIMIT
+        ids = ids[:SERVICE_SEARCH_LIMIT]
+        ranking = Case(
+            *[When(id=service_id, then=Value(position)) for position, service_id in enumerate(ids)],
+            output_field=IntegerField()
+        )
+        return queryset.filter(id__in=ids).annotate(search_rank=ranking), True, truncated
+
+
+class SQLiteFTSBackend(RankedBackend):
+    name = 'sqlite-fts5'
+    id_column = 'rowid'
+    # Column weights: name, slug, description.
+    sql = (
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s{{scope}} '
+        f'ORDER BY bm25({FTS_TABLE}, 10.0, 5.0, 1.0) LIMIT %s'
+    )
+
+    def query(self, words):
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
+
+
+class PostgresBackend(RankedBackend):
+    name = 'postgresql'
+    sql = (
+        f"SELECT id FROM users_service WHERE {PG_VECTOR} @@ to_tsquery('simple', %s){{scope}} "
+        f"ORDER BY ts_rank({PG_VECTOR}, to_tsquery('simple', %s)) DESC LIMIT %s"
+    )
+
+    def query(self, words):
+        return ' & '.join(f'{word}:*' for word in words)
+
+    def params(self, query, scope_params):
+        return [query, *scope_params, query, SERVICE_SEARCH_LIMIT + 1]
+
+
+class MySQLBackend(RankedBackend):
+    name = 'mysql'
+    sql = (
+        'SELECT id FROM users_service WHERE MATCH(name, slug, description) AGAINST (%s IN BOOLEAN MODE){scope} '
+        'ORDER BY MATCH(name, slug, description) AGAINST (%s IN BOOLEAN MODE) DESC LIMIT %s'
+    )
+
+    def query(self, words):
+        return ' '.join(f'+{word}*' for word in words)
+
+    def params(self, query, scope_params):
+        return [query, *scope_params, query, SERVICE_SEARCH_LIMIT + 1]
+
+
+BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'postgresql': PostgresBackend,
+    'mysql': MySQLBackend,
+}
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        if SERVICE_SEARCH_BACKEND == 'basic':
+            _backend = BasicBackend()
+        else:
+            _backend = BACKENDS.get(connection.vendor, BasicBackend)()
+    return _backend
+
+
+def filter_services(queryset, search):
+    """Apply ``search`` to a Service queryset; returns (queryset, ranked, truncated).
+
+    ``truncated`` is True when more than ``SERVICE_SEARCH_LIMIT`` services
+    matched and only the best ranked ones were kept.
+    """
+    return get_backend().filter(queryset, search)
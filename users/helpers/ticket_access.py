@@ -0,0 +1,43 @@
+"""
+Cached access decisions for support-ticket WebSockets.
+
+A ticket's ACL is just its owner and assignee, so it is cached per ticket
+rather than per user; admins pass on role alone. The entry is dropped by the
+SupportTicket save/delete signal, so reassignment takes effect immediately.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from users.models import SupportTicket, User
+
+TICKET_ACL_CACHE_TTL = getattr(settings, 'TICKET_ACL_CACHE_TTL', 300)
+MISSING_TICKET_CACHE_TTL = 30
+
+
+def _key(ticket_id):
+    return f'ticket:acl:{ticket_id}'
+
+
+def get_acl(ticket_id):
+    """Return ``(owner_id, assignee_id)`` or None if the ticket does not exist."""
+    acl = cache.get(_key(ticket_id))
+    if acl is None:
+        row = SupportTicket.objects.filter(id=ticket_id).values_list('user_id_id', 'assigned_to_id').first()
+        acl = list(row) if row else []
+        cache.set(_key(ticket_id), acl, TICKET_ACL_CACHE_TTL if row else MISSING_TICKET_CACHE_TTL)
+    return tuple(acl) or None
+
+
+def can_access(user, ticket_id):
+    if not str(ticket_id).isdigit():
+        return False
+
+    acl = get_acl(int(ticket_id))
+    if acl is None:
+        return False
+
+    return user.id in acl or user.role == User.RoleChoices.ADMIN
+
+
+def invalidate(ticket_id):
+    cache.delete(_key(ticket_id))
@@ -0,0 +1,31 @@
+"""
+Redis-backed revocation store for JWT ids.
+
+A revoked ``jti`` is kept only for the remaining lifetime of its token; once
+the token would have expired anyway, the signature check rejects it and the
+key is no longer needed.
+"""
+import time
+from django.core.cache import cache
+
+
+def _key(jti):
+    return f'auth:revoked:{jti}'
+
+
+def revoke(jti, exp):
+    if not jti:
+        return
+    ttl = int(exp - time.time()) + 1
+    if ttl > 0:
+        cache.set(_key(jti), 1, ttl)
+
+
+def revoke_payload(payload):
+    revoke(payload.get('jti'), payload.get('exp', 0))
+
+
+def is_revoked(jti):
+    if not jti:
+        return True
+    return cache.get(_key(jti)) is not None
@@ -0,0 +1,72 @@
+"""Shared fixtures for the bench_* commands; everything is rolled back."""
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import transaction
+from users.helpers import order_rollup, order_search
+from users.models import Category, Order, Service, Supplier, User
+
+
+@contextmanager
+def rollback():
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def create_catalog(services=100, categories=5):
+    supplier = Supplier.objects.create(
+        first_name='Bench', last_name='Supplier', api_url='https://bench.invalid/api',
+        api_key='bench', api_type='V2', currency='USD', rate_multipler='1',
+        status='ACTIVE', min_order_amount=1, max_order_amount=1000, support_url='https://bench.invalid'
+    )
+    category_objs = [
+        Category.objects.create(
+            name=f'Bench {i}', slug=f'bench-{i}', description='', icon='', sort_order=str(i),
+            status='ACTIVE', meta_title='', meta_description=''
+        )
+        for i in range(categories)
+    ]
+    Service.objects.bulk_create([
+        Service(
+            category=category_objs[i % categories], supplier=supplier,
+            name=f'Bench service {i}', slug=f'bench-service-{i}',
+            description='Benchmark service ' * 5, supplier_service_id=i,
+            price_per_100=Decimal('1.25') + i, supplier_price_per_100=Decimal('0.75') + i,
+            sort_order=i, is_featured=i % 10 == 0, meta_title=f'Bench {i}'
+        )
+        for i in range(services)
+    ])
+    return supplier, category_objs
+
+
+def create_orders(count, service, user=None, batch_size=5000):
+    """Bulk-create ``count`` orders for one user (created if not given)."""
+    if user is None:
+        user = User.objects.create(
+            first_name='Bench', last_name='User', email='bench-user@bench.invalid',
+            password='!', phone_number='0'
+        )
+    for start in range(0, count, batch_size):
+        orders = [
+            Order(
+                user_id=user, service_id=service, order_number=f'BENCH-{i:08d}',
+                link=f'https://bench.invalid/p/{i}', quantity=100,
+                price_paid=Decimal('1.25'), profit=Decimal('0.50')
+            )
+            for i in range(start, min(start + batch_size, count))
+        ]
+        for order in orders:
+            order.link_hash = order_search.link_hash(order.link)
+        orders = Order.objects.bulk_create(orders)
+        order_rollup.apply(added=[order_rollup.row(order) for order in orders])
+    return user
+
+
+def timeit(func, iterations):
+    """Return mean seconds per call."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations
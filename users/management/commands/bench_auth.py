@@ -0,0 +1,74 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from users.models import User
+from users.services.auth_service import AuthService
+from users.helpers import principal_cache
+from users.helpers.auth_context import RequestAuth
+
+
+class Command(BaseCommand):
+    help = 'Measure DB queries and latency of token resolution for cold and warm tokens'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=1000)
+        parser.add_argument(
+            '--checks', type=int, default=3,
+            help='Auth checks per simulated request (stacked decorators plus the view)'
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        checks = options['checks']
+
+        with transaction.atomic():
+            user = User.objects.create(
+                first_name='Bench',
+                last_name='User',
+                email='bench-auth@example.invalid',
+                password='!',
+                phone_number='0'
+            )
+            token, _ = AuthService._generate_token(user)
+            principal_cache.invalidate_user(user.id)
+
+            with CaptureQueriesContext(connection) as cold:
+                AuthService.get_user_from_token(token)
+
+            with CaptureQueriesContext(connection) as warm:
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    AuthService.get_user_from_token(token)
+                elapsed = time.perf_counter() - started
+
+            request = RequestFactory().get('/api/me', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+            started = time.perf_counter()
+            for _ in range(iterations):
+                for _ in range(checks):
+                    AuthService.authenticate(token)
+            per_check = (time.perf_counter() - started) / iterations
+
+            resolutions = RequestAuth.resolutions
+            started = time.perf_counter()
+            for _ in range(iterations):
+                auth = RequestAuth(request)
+                for _ in range(checks):
+                    auth.user
+            memoized = (time.perf_counter() - started) / iterations
+            resolutions = RequestAuth.resolutions - resolutions
+
+            principal_cache.invalidate_user(user.id)
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'cold token: {len(cold.captured_queries)} queries')
+        self.stdout.write(
+            f'warm token: {len(warm.captured_queries)} queries over {iterations} lookups, '
+            f'{elapsed / iterations * 1e6:.1f} us/lookup'
+        )
+        self.stdout.write(
+            f'request with {checks} auth checks: {per_check * 1e6:.1f} us resolving per check, '
+            f'{memoized * 1e6:.1f} us memoized ({resolutions / iterations:.0f} resolution/request)'
+        )
@@ -0,0 +1,35 @@
+import time
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from users.helpers.cache_ns import CacheNamespace
+
+
+class Command(BaseCommand):
+    help = 'Compare delete_pattern with generation-counter invalidation as the keyspace grows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,50000', help='Comma-separated keyspace sizes')
+
+    def handle(self, *args, **options):
+        namespace = CacheNamespace('bench')
+        self.stdout.write(f'{"keys":>8} {"delete_pattern":>16} {"generation":>12}')
+
+        for size in [int(value) for value in options['sizes'].split(',')]:
+            # Mostly unrelated keys, as in production, with a slice in our namespace.
+            cache.set_many({f'benchfill:{i}': i for i in range(size)}, 60)
+            cache.set_many({f'bench:{i}': i for i in range(size // 10)}, 60)
+            started = time.perf_counter()
+            cache.delete_pattern('bench:*')
+            pattern = time.perf_counter() - started
+
+            for i in range(size // 10):
+                namespace.set(i, i, 60)
+            started = time.perf_counter()
+            namespace.invalidate()
+            generation = time.perf_counter() - started
+
+            cache.delete_pattern('benchfill:*')
+            cache.delete_pattern('bench:*')
+            self.stdout.write(f'{size:>8} {pattern * 1000:>13.2f} ms {generation * 1000:>9.3f} ms')
+
+        cache.delete(namespace.generation_key)
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from admins.services.category_service import CategoryService
+from admins.services.service_service import ServiceService
+from users.helpers import catalog_snapshot
+from ._bench import rollback, create_catalog, timeit
+
+
+class Command(BaseCommand):
+    help = 'Compare catalog reads served from Redis with the in-process catalog snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--services', type=int, default=500)
+        parser.add_argument('--iterations', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        request = RequestFactory().get('/')
+        reads = [
+            ('list page 1', lambda: ServiceService.get_all_services_encoded(
+                page=1, per_page=20, search=None, category_id=None, is_featured=None, status='ACTIVE')),
+            ('featured', lambda: ServiceService.get_featured_services(limit=10)),
+            ('by category', lambda: ServiceService.get_services_by_category('bench-1', 1, 20, request)),
+            ('by slug', lambda: ServiceService.get_service_by_slug('bench-service-7')),
+            ('categories', lambda: CategoryService.get_active_categories()),
+        ]
+
+        enabled = catalog_snapshot.CATALOG_SNAPSHOT_ENABLED
+        with rollback():
+            create_catalog(services=options['services'])
+            ServiceService.CACHE.invalidate()
+            CategoryService.CACHE.invalidate()
+            try:
+                catalog_snapshot.CATALOG_SNAPSHOT_ENABLED = False
+                for _, read in reads:
+                    read()
+                redis = [timeit(read, iterations) for _, read in reads]
+
+                catalog_snapshot.CATALOG_SNAPSHOT_ENABLED = True
+                build = timeit(catalog_snapshot.refresh_now, 5)
+                for _, read in reads:
+                    read()
+                snapshot = [timeit(read, iterations) for _, read in reads]
+            finally:
+                catalog_snapshot.CATALOG_SNAPSHOT_ENABLED = enabled
+                catalog_snapshot.discard()
+                ServiceService.CACHE.invalidate()
+                CategoryService.CACHE.invalidate()
+            results = list(zip([label for label, _ in reads], redis, snapshot))
+
+        self.stdout.write(f'{options["services"]} services, snapshot build {build * 1000:.1f} ms')
+        self.stdout.write(f'{"read":<14} {"redis":>12} {"snapshot":>12}')
+        for label, redis_seconds, snapshot_seconds in results:
+            self.stdout.write(f'{label:<14} {redis_seconds * 1e6:>9.1f} us {snapshot_seconds * 1e6:>9.1f} us')
@@ -0,0 +1,83 @@
+import secrets
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from users.helpers import ids
+from users.models import Order, Service
+from ._bench import rollback, create_catalog, create_orders
+
+
+def legacy_order_number():
+    # What OrderService._generate_order_number produced before users/helpers/ids.py.
+    return f"ORD-{timezone.now().strftime('%Y%m%d%H%M%S')}-{secrets.token_hex(4).upper()}"
+
+
+def index_size(table, column):
+    """Bytes used by the indexes on ``table.column``; None where the backend cannot tell."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+        names = [name for name, info in constraints.items() if info['index'] and info['columns'] == [column]]
+        if not names:
+            return None
+        if connection.vendor == 'postgresql':
+            total = 0
+            for name in names:
+                cursor.execute('SELECT pg_relation_size(%s::regclass)', [name])
+                total += cursor.fetchone()[0]
+            return total
+        if connection.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    f'SELECT SUM(pgsize) FROM dbstat WHERE name IN ({", ".join(["%s"] * len(names))})', names
+                )
+            except Exception:
+                return None
+            return cursor.fetchone()[0]
+    return None
+
+
+class Command(BaseCommand):
+    help = 'Compare insert throughput and order_number index size for random and time-ordered order numbers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=200000,
+                            help='Orders to insert per scheme (the target measurement is 10000000)')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--existing', type=int, default=0,
+                            help='Orders already in the table before the timed inserts')
+
+    def handle(self, *args, **options):
+        count, batch_size = options['orders'], options['batch_size']
+        schemes = [('random suffix', legacy_order_number), ('time-ordered', lambda: ids.next_id('ORD'))]
+
+        results = []
+        for label, generate in schemes:
+            with rollback():
+                create_catalog(services=1, categories=1)
+                service = Service.objects.get(slug='bench-service-0')
+                user = create_orders(options['existing'], service)
+
+                started = time.perf_counter()
+                for start in range(0, count, batch_size):
+                    Order.objects.bulk_create([
+                        Order(
+                            user_id=user, service_id=service, order_number=generate(),
+                            link='https://bench.invalid/p', quantity=100,
+                            price_paid=Decimal('1.25'), profit=Decimal('0.50')
+                        )
+                        for _ in range(min(batch_size, count - start))
+                    ], ignore_conflicts=True)
+                seconds = time.perf_counter() - started
+                # Numbers the unique index turned away.
+                collisions = options['existing'] + count - Order.objects.filter(user_id=user).count()
+                results.append((label, count / seconds, collisions, index_size(Order._meta.db_table, 'order_number')))
+
+        self.stdout.write(f'{count} orders on {connection.vendor}, batches of {batch_size}')
+        for label, rate, collisions, size in results:
+            size = f'{size / 1024 / 1024:8.1f} MiB' if size is not None else '     n/a'
+            self.stdout.write(
+                f'{label:<16} {rate:10.0f} rows/s   {collisions:6d} collisions   order_number index {size}'
+            )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse
+from admins.services.service_service import ServiceService
+from users.helpers.json_render import dumps
+from users.helpers.response import APIResponse
+from ._bench import rollback, create_catalog, timeit
+
+
+class Command(BaseCommand):
+    help = 'Compare JSON rendering of a 100-item get_all_services page'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        with rollback():
+            create_catalog(services=100)
+            ServiceService.CACHE.invalidate()
+            page = ServiceService.get_all_services(per_page=100)
+            encoded = dumps(page)
+            ServiceService.CACHE.invalidate()
+
+        envelope = {'success': True, 'message': 'Success', 'data': page}
+        results = [
+            ('JsonResponse, stdlib', timeit(lambda: JsonResponse(envelope), iterations)),
+            ('APIResponse', timeit(lambda: APIResponse.success(data=page), iterations)),
+            ('APIResponse, pre-encoded', timeit(lambda: APIResponse.success(data=encoded), iterations)),
+        ]
+
+        self.stdout.write(f'{len(page["services"])} services, {len(encoded)} bytes encoded')
+        for label, seconds in results:
+            self.stdout.write(f'{label:<28} {seconds * 1e6:8.1f} us/response')
@@ -0,0 +1,68 @@
+import time
+
+from django.db.models import Q
+from django.core.management.base import BaseCommand
+from users.helpers import order_search
+from users.models import Order, Service
+from ._bench import rollback, create_catalog, create_orders
+
+
+class Command(BaseCommand):
+    help = 'Compare the old icontains admin order search with the indexed search, per query kind'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=200000)
+        parser.add_argument('--per-page', type=int, default=20)
+        parser.add_argument('--iterations', type=int, default=50)
+
+    def handle(self, *args, **options):
+        count, per_page, iterations = options['orders'], options['per_page'], options['iterations']
+        middle = count // 2
+
+        with rollback():
+            create_catalog(services=1, categories=1)
+            create_orders(count, Service.objects.get(slug='bench-service-0'))
+
+            searches = [
+                f'BENCH-{middle:08d}',
+                f'BENCH-{middle // 100:06d}',
+                f'http://www.bench.invalid/p/{middle}/?utm_source=x',
+                'bench-user@bench.invalid',
+                'bench-user@',
+                f'{middle:08d}',
+                'Bench Service',
+            ]
+            ordered = Order.objects.order_by('-submitted_at')
+
+            def old(search):
+                return ordered.filter(
+                    Q(order_number__icontains=search) |
+                    Q(link__icontains=search) |
+                    Q(user_id__email__icontains=search) |
+                    Q(service_id__name__icontains=search)
+                )
+
+            results = []
+            for search in searches:
+                kind, _ = order_search.classify(search)
+                new = lambda: order_search.filter_orders(ordered, search)
+                results.append((search, kind, self._time(lambda: old(search), per_page, iterations),
+                                self._time(new, per_page, iterations)))
+
+        self.stdout.write(f'{count} orders, first {per_page} rows, {iterations} runs; mean / p99 in ms')
+        self.stdout.write(f'{"search":<48} {"kind":<13} {"icontains":>17} {"indexed":>17}')
+        for search, kind, (old_mean, old_p99), (new_mean, new_p99) in results:
+            self.stdout.write(
+                f'{search[:48]:<48} {kind:<13} {old_mean:8.2f} /{old_p99:7.2f} {new_mean:8.2f} /{new_p99:7.2f}'
+            )
+
+    @staticmethod
+    def _time(build, per_page, iterations):
+        """``(mean, p99)`` in ms of building the queryset (classifying included) and fetching a page."""
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            list(build().values_list('id', flat=True)[:per_page])
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        return sum(samples) / len(samples), samples[min(len(samples) - 1, int(len(samples) * 0.99))]
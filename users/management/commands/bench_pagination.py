@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from users.helpers import keyset
+from users.models import Order, Service
+from users.services.order_service import OrderService
+from ._bench import rollback, create_catalog, create_orders, timeit
+
+
+class Command(BaseCommand):
+    help = 'Compare offset and keyset pagination of one user\'s orders at page 1 and a deep page'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=200000)
+        parser.add_argument('--per-page', type=int, default=20)
+        parser.add_argument('--page', type=int, default=10000)
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        per_page, deep, iterations = options['per_page'], options['page'], options['iterations']
+
+        with rollback():
+            create_catalog(services=1, categories=1)
+            user = create_orders(options['orders'], Service.objects.get(slug='bench-service-0'))
+
+            # The cursor a client holds after walking to the deep page.
+            queryset = Order.objects.filter(user_id=user).order_by('-submitted_at')
+            anchor = queryset.order_by('-submitted_at', '-id')[(deep - 1) * per_page - 1]
+            fields = keyset._ordering(queryset)
+            deep_cursor = keyset.PageCursor(after=keyset._position(anchor, fields))
+
+            def offset(page):
+                return lambda: OrderService.get_all_orders_admin(page=page, per_page=per_page, user_id=user.id)
+
+            def cursor(page_cursor):
+                return lambda: OrderService.get_all_orders_admin(per_page=per_page, user_id=user.id, cursor=page_cursor)
+
+            results = [
+                ('offset, page 1', timeit(offset(1), iterations)),
+                (f'offset, page {deep}', timeit(offset(deep), iterations)),
+                ('keyset, page 1', timeit(cursor(keyset.PageCursor()), iterations)),
+                (f'keyset, page {deep}', timeit(cursor(deep_cursor), iterations)),
+                ('keyset, page 1 + approx count', timeit(cursor(keyset.PageCursor(with_count=True)), iterations)),
+            ]
+
+            deep_offset = OrderService.get_all_orders_admin(page=deep, per_page=per_page, user_id=user.id)['orders']
+            deep_keyset = OrderService.get_all_orders_admin(per_page=per_page, user_id=user.id, cursor=deep_cursor)['orders']
+            same = [o['id'] for o in deep_offset] == [o['id'] for o in deep_keyset]
+
+        self.stdout.write(f'{options["orders"]} orders, {per_page} per page, deep pages match: {same}')
+        for label, seconds in results:
+            self.stdout.write(f'{label:<32} {seconds * 1000:8.2f} ms')
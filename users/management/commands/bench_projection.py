@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from admins.services.service_service import ServiceService
+from users.helpers.json_render import dumps
+from users.models import Service
+from ._bench import rollback, create_catalog, timeit
+
+
+class Command(BaseCommand):
+    help = 'Compare a 100-item service page built from model instances with .values() projections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--fields', default='id,name,slug,price_per_100')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        admin, public = ServiceService.ADMIN_LISTING, ServiceService.PUBLIC_LISTING
+        sparse = public.select(options['fields'].split(','))
+
+        def instances():
+            # The pre-projection path: full rows plus category and supplier.
+            queryset = Service.objects.select_related('category', 'supplier').filter(status='ACTIVE')
+            return [admin.instance(service) for service in queryset.order_by('sort_order')[:100]]
+
+        def values(projection, selected=None):
+            def page():
+                queryset = Service.objects.filter(status='ACTIVE').values(*projection.columns(selected))
+                return [projection.row(row, selected) for row in queryset.order_by('sort_order')[:100]]
+            return page
+
+        variants = [
+            ('instances, admin shape', instances),
+            ('values, admin', values(admin)),
+            ('values, public', values(public)),
+            (f'values, fields={",".join(sparse)}', values(public, sparse)),
+        ]
+
+        with rollback():
+            create_catalog(services=100)
+            results = [
+                (label, len(dumps({'services': build()})), timeit(build, iterations))
+                for label, build in variants
+            ]
+
+        for label, size, seconds in results:
+            self.stdout.write(f'{label:<48} {size:>7} bytes {seconds * 1000:8.2f} ms')
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from admins.services.service_service import ServiceService
+from users.helpers import image_variants
+from users.models import Service
+
+
+class Command(BaseCommand):
+    help = 'Render resized photo variants for services that do not have them yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Re-render variants that already exist')
+
+    def handle(self, *args, **options):
+        services = Service.objects.exclude(photo='').exclude(photo__isnull=True).only('id', 'photo', 'photo_variants')
+        rendered = failed = 0
+        for service in services.iterator():
+            if not options['force'] and service.photo_variants.get('source') == service.photo.name:
+                continue
+            if options['force']:
+                Service.objects.filter(id=service.id).update(photo_variants={})
+            try:
+                image_variants.generate(service.id, clear_cache=False)
+                rendered += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f'Service {service.id} ({service.photo.name}): {e}')
+        if rendered:
+            ServiceService._clear_cache()
+        self.stdout.write(f'Rendered variants for {rendered} services, {failed} failed')
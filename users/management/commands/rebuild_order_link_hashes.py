@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from users.helpers import order_search
+
+
+class Command(BaseCommand):
+    help = 'Recompute Order.link_hash, e.g. after the link normalization rules change'
+
+    def handle(self, *args, **options):
+        updated = order_search.backfill_link_hashes()
+        self.stdout.write(f'Updated the link hash of {updated} orders')
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from users.helpers import dashboard_counters, order_rollup
+from users.services.order_service import OrderService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily order rollups from the orders table and verify them against it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Only compare the rollups with the orders table; fail on any difference')
+
+    def handle(self, *args, **options):
+        if not options['check']:
+            written = order_rollup.rebuild()
+            OrderService.ADMIN_CACHE.invalidate()
+            dashboard_counters.reconcile()
+            for table, count in written.items():
+                self.stdout.write(f'{table}: {count} rows')
+
+        mismatches = order_rollup.verify()
+        for table, day, diff in mismatches:
+            fields = ', '.join(f'{field} expected {want} got {got}' for field, (want, got) in diff.items())
+            self.stderr.write(f'{table} {day}: {fields}')
+        if mismatches:
+            raise CommandError(f'{len(mismatches)} rollup days differ from the orders table')
+        self.stdout.write('Rollups match the orders table')
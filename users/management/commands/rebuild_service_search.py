@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from users.helpers import service_search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the service full-text index from the services table'
+
+    def handle(self, *args, **options):
+        backend = service_search.get_backend()
+        backend.rebuild()
+        self.stdout.write(f'Rebuilt {backend.name} service search index')
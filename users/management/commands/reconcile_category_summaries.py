@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from admins.services.category_service import CategoryService
+from users.helpers import category_summary
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-category service counts and price ranges, repairing any drift'
+
+    def handle(self, *args, **options):
+        repaired = category_summary.reconcile()
+        if repaired:
+            CategoryService._clear_cache()
+            self.stdout.write(f'Repaired {len(repaired)} categories: {", ".join(map(str, repaired))}')
+        else:
+            self.stdout.write('All category summaries are up to date')
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+from users.helpers import dashboard_counters
+
+
+class Command(BaseCommand):
+    help = 'Rewrite the live admin dashboard counters in Redis from the order rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--every', type=int, default=0,
+                            help='Keep running and reconcile every N seconds instead of once')
+
+    def handle(self, *args, **options):
+        while True:
+            drift = dashboard_counters.reconcile()
+            if drift:
+                fields = ', '.join(f'{field} {was} -> {now}' for field, (was, now) in drift.items())
+                self.stdout.write(f'Corrected: {fields}')
+            else:
+                self.stdout.write('Counters match the rollups')
+            if not options['every']:
+                break
+            time.sleep(options['every'])
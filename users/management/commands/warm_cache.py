@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from users.helpers import cache_warmup
+
+
+class Command(BaseCommand):
+    help = 'Precompute the most requested catalog pages, featured lists, categories and admin stats'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=cache_warmup.CACHE_WARMUP_TOP,
+                            help='How many of the most requested catalog pages to warm')
+        parser.add_argument('--workers', type=int, default=cache_warmup.CACHE_WARMUP_WORKERS)
+
+    def handle(self, *args, **options):
+        summary = cache_warmup.warm(limit=options['top'], workers=options['workers'])
+
+        for label in summary['failed']:
+            self.stderr.write(f'Failed: {label}')
+        self.stdout.write(f'Warmed {summary["warmed"]} keys in {summary["seconds"] * 1000:.1f} ms')
@@ -1,9 +1,28 @@
 import json
+import logging
+from urllib.parse import parse_qs
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import MiddlewareNotUsed
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
+from users.helpers import perf
+from users.helpers.auth_context import RequestAuth, get_request_auth
+from users.helpers.response import FastJsonResponse
+from users.services.auth_service import AuthService
 
 
 class JSONOnlyMiddleware(MiddlewareMixin):
+    PRESERVED_HEADERS = (
+        'Retry-After',
+        'X-RateLimit-Limit',
+        'X-RateLimit-Remaining',
+        'X-RateLimit-Reset',
+    )
+
     def process_request(self, request):
         if 'application/json' not in request.META.get('HTTP_ACCEPT', ''):
             request.META['HTTP_ACCEPT'] = 'application/json'
@@ -14,19 +33,11 @@ class JSONOnlyMiddleware(MiddlewareMixin):
             return response
 
         status_code = response.status_code
-        if 200 <= status_code < 300:
+        if 200 <= status_code < 300 or status_code == 304:
             return response
         
         status_message = self._get_fancy_status_message(status_code)
         try:
-            if hasattr(response, 'content') and response.content:
-                try:
-                    content = json.loads(response.content)
-                except (json.JSONDecodeError, ValueError):
-                    content = response.content.decode('utf-8', errors='ignore')
-            else:
-                content = None
-            
             json_data = {
                 "status": status_message,
                 "status_code": status_code,
@@ -38,15 +49,14 @@ class JSONOnlyMiddleware(MiddlewareMixin):
                 }
             }
             
-            return JsonResponse(
-                json_data,
-                status=status_code,
-                safe=False,
-                json_dumps_params={'indent': 2}
-            )
+            wrapped = FastJsonResponse(json_data, status=status_code)
+            for header in self.PRESERVED_HEADERS:
+                if header in response:
+                    wrapped[header] = response[header]
+            return wrapped
             
         except Exception as e:
-            return JsonResponse({
+            return FastJsonResponse({
                 "status": "🔥 Something went terribly wrong",
                 "status_code": 500,
                 "success": False,
@@ -59,7 +69,7 @@ class JSONOnlyMiddleware(MiddlewareMixin):
             }, status=500)
     
     def process_exception(self, request, exception):
-        return JsonResponse({
+        return FastJsonResponse({
             "status": "💥 Epic failure detected",
             "status_code": 500,
             "success": False,
@@ -133,4 +143,106 @@ class SimpleJSONMiddleware(MiddlewareMixin):
                 "data": content
             }, status=response.status_code)
         
-        return response
\ No newline at end of file
+        return response
+
+
+class AuthContextMiddleware(MiddlewareMixin):
+    def process_request(self, request):
+        request.auth_context = RequestAuth(request)
+        return None
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Authenticate WebSocket handshakes with the API's JWT access token.
+
+    The token comes from ``?token=`` or from the subprotocol pair
+    ``Sec-WebSocket-Protocol: bearer, <token>``; in the latter case consumers
+    must accept with ``scope['auth_subprotocol']`` so browsers complete the
+    handshake. Resolution goes through the principal cache, so a warm token
+    costs no database query.
+    """
+
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope)
+        token, subprotocol = self._get_token(scope)
+
+        user = None
+        if token:
+            user = await database_sync_to_async(AuthService.get_user_from_token)(token)
+
+        scope['user'] = user or AnonymousUser()
+        scope['auth_subprotocol'] = subprotocol if user else None
+        return await super().__call__(scope, receive, send)
+
+    @staticmethod
+    def _get_token(scope):
+        query = parse_qs(scope.get('query_string', b'').decode())
+        if query.get('token'):
+            return query['token'][0], None
+
+        protocols = scope.get('subprotocols') or []
+        for index, protocol in enumerate(protocols[:-1]):
+            if protocol.lower() == 'bearer':
+                return protocols[index + 1], protocol
+        return None, None
+
+
+class PerfMiddleware:
+    """
+    Collect per-request timings (see ``users.helpers.perf``) and, for sampled
+    requests or identities an admin switched to full detail, emit them as a
+    ``Server-Timing`` header and one JSON log line. Runs natively in both
+    WSGI and ASGI mode.
+    """
+    sync_capable = True
+    async_capable = True
+    logger = logging.getLogger('users.perf')
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERF_INSTRUMENTATION', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats, token = perf.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            perf.stop(token)
+        return self._report(request, response, stats)
+
+    async def __acall__(self, request):
+        stats, token = perf.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            perf.stop(token)
+        return self._report(request, response, stats)
+
+    def _report(self, request, response, stats):
+        identities = get_request_auth(request).resolved_identities()
+        detail = not perf.detail_targets().isdisjoint(identities)
+        if not detail and not perf.sampled():
+            return response
+
+        response['Server-Timing'] = stats.server_timing()
+
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            **stats.as_dict(),
+        }
+        if detail:
+            record['identities'] = identities
+            record['slowest_queries'] = sorted(stats.query_log, reverse=True)[:10]
+        self.logger.info(json.dumps(record))
+        return response
@@ -0,0 +1,68 @@
+from django.db import migrations
+
+FTS_TABLE = 'users_service_fts'
+PG_VECTOR = (
+    "(setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(slug, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C'))"
+)
+
+SQLITE_FORWARD = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, slug, description,
+        content='users_service', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_service_fts_ai AFTER INSERT ON users_service BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, slug, description)
+        VALUES (new.id, new.name, new.slug, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_service_fts_ad AFTER DELETE ON users_service BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, slug, description)
+        VALUES ('delete', old.id, old.name, old.slug, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_service_fts_au AFTER UPDATE OF name, slug, description ON users_service BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, slug, description)
+        VALUES ('delete', old.id, old.name, old.slug, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, slug, description)
+        VALUES (new.id, new.name, new.slug, new.description);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS users_service_fts_ai',
+    'DROP TRIGGER IF EXISTS users_service_fts_ad',
+    'DROP TRIGGER IF EXISTS users_service_fts_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+FORWARD = {
+    'sqlite': SQLITE_FORWARD,
+    'postgresql': [f'CREATE INDEX IF NOT EXISTS users_service_search_gin ON users_service USING GIN ({PG_VECTOR})'],
+    'mysql': ['ALTER TABLE users_service ADD FULLTEXT INDEX users_service_search_ft (name, slug, description)'],
+}
+
+REVERSE = {
+    'sqlite': SQLITE_REVERSE,
+    'postgresql': ['DROP INDEX IF EXISTS users_service_search_gin'],
+    'mysql': ['ALTER TABLE users_service DROP INDEX users_service_search_ft'],
+}
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_rename_service_id_cartitem_service'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(FORWARD), _run(REVERSE)),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_service_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='commentreport',
+            index=models.Index(fields=['resolved', '-created_at', '-id'], name='users_comme_resolve_8c52ae_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user_id', '-submitted_at', '-id'], name='users_order_user_id_3258e5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['-submitted_at', '-id'], name='users_order_submitt_252bea_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['user_id', '-created_at', '-id'], name='users_payme_user_id_f52b61_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicecomment',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='users_servi_status_a9b4ed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['user_id', '-created_at', '-id'], name='users_suppo_user_id_bff772_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['-priority', 'created_at', 'id'], name='users_suppo_priorit_311fbd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user_id', '-created_at', '-id'], name='users_trans_user_id_a8f81c_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:47
+
+from django.db import migrations, models
+
+FTS_TABLE = 'users_service_fts'
+
+# SQLite rebuilds users_service for the AddField below, which drops the FTS
+# triggers from 0009; put them back (same SQL as 0009) and resync the index.
+SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS users_service_fts_ai AFTER INSERT ON users_service BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, slug, description)
+        VALUES (new.id, new.name, new.slug, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_service_fts_ad AFTER DELETE ON users_service BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, slug, description)
+        VALUES ('delete', old.id, old.name, old.slug, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_service_fts_au AFTER UPDATE OF name, slug, description ON users_service BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, slug, description)
+        VALUES ('delete', old.id, old.name, old.slug, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, slug, description)
+        VALUES (new.id, new.name, new.slug, new.description);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')",
+]
+
+
+def restore_fts_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for sql in SQLITE_TRIGGERS:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        # Reversing the AddField rebuilds the table again; restore the triggers after it.
+        migrations.RunPython(migrations.RunPython.noop, restore_fts_triggers),
+        migrations.AddField(
+            model_name='service',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Resized copies of photo, see users/helpers/image_variants.py'),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:48
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q
+
+
+def fill_summaries(apps, schema_editor):
+    Category = apps.get_model('users', 'Category')
+    Service = apps.get_model('users', 'Service')
+
+    rows = Service.objects.filter(status='ACTIVE').values('category_id').annotate(
+        active=Count('id'),
+        featured=Count('id', filter=Q(is_featured=True)),
+        min_price=Min('price_per_100'),
+        max_price=Max('price_per_100'),
+    ).order_by()
+    for row in rows:
+        Category.objects.filter(id=row['category_id']).update(
+            active_services=row['active'],
+            featured_services=row['featured'],
+            min_price_per_100=row['min_price'],
+            max_price_per_100=row['max_price'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_service_photo_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='active_services',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='featured_services',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='max_price_per_100',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='min_price_per_100',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
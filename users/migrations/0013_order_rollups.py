@@ -0,0 +1,88 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+
+STATUSES = ('PENDING', 'PROCESSING', 'IN_PROGRESS', 'COMPLETED', 'PARTIAL', 'CANCELLED', 'REFUNDED', 'FAILED')
+
+
+def backfill(apps, schema_editor):
+    Order = apps.get_model('users', 'Order')
+    aggregates = {
+        'sum_orders': Count('id'),
+        'sum_revenue': Sum('price_paid'),
+        'sum_profit': Sum('profit'),
+        'sum_completed_revenue': Sum('price_paid', filter=Q(status='COMPLETED')),
+        'sum_completed_profit': Sum('profit', filter=Q(status='COMPLETED')),
+        **{f'sum_{status.lower()}': Count('id', filter=Q(status=status)) for status in STATUSES},
+    }
+    for model_name, key in (('OrderServiceRollup', 'service_id'), ('OrderUserRollup', 'user_id')):
+        Rollup = apps.get_model('users', model_name)
+        rows = Order.objects.annotate(day=TruncDate('submitted_at')).values('day', key).annotate(**aggregates).order_by()
+        Rollup.objects.bulk_create([
+            Rollup(day=row['day'], **{f'{key}_id': row[key]}, **{
+                name[len('sum_'):]: value or 0 for name, value in row.items() if name.startswith('sum_')
+            })
+            for row in rows
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0012_category_summaries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderServiceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('orders', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('profit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('completed_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('completed_profit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('pending', models.IntegerField(default=0)),
+                ('processing', models.IntegerField(default=0)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('partial', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+                ('refunded', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('service_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.service')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'service_id'), name='unique_order_service_rollup')],
+            },
+        ),
+        migrations.CreateModel(
+            name='OrderUserRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('orders', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('profit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('completed_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('completed_profit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('pending', models.IntegerField(default=0)),
+                ('processing', models.IntegerField(default=0)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('partial', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+                ('refunded', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('user_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.user')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'user_id'), name='unique_order_user_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
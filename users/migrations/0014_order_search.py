@@ -0,0 +1,103 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:03
+
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from django.db import migrations, models
+
+# A frozen copy of users.helpers.order_search.link_hash as of this migration, so
+# replaying it always writes the same hashes; rebuild_order_link_hashes
+# recomputes them with the current rules.
+TRACKING_PARAMS = {'igshid', 'igsh', 'si', 'fbclid', 'gclid', 'feature', 'ref', 'ref_src', 's', 't'}
+HOST_PREFIXES = ('www.', 'm.', 'mobile.')
+BATCH_SIZE = 2000
+
+
+def link_hash(link):
+    link = (link or '').strip()
+    if not link:
+        return ''
+    if '://' not in link:
+        link = f'https://{link}'
+    parts = urlsplit(link)
+
+    host = (parts.hostname or '').lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    path = parts.path.rstrip('/')
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    )
+    normalized = f'{host}{path}?{urlencode(query)}' if query else f'{host}{path}'
+    return hashlib.sha256(normalized.encode()).hexdigest()[:32] if normalized else ''
+
+
+# LIKE 'x%' on PostgreSQL only uses a btree index built with *_pattern_ops
+# unless the database collation is C; these back the order search prefix lookups.
+FORWARD = {
+    'postgresql': [
+        'CREATE INDEX IF NOT EXISTS users_order_number_prefix ON users_order (order_number varchar_pattern_ops)',
+        'CREATE INDEX IF NOT EXISTS users_order_supplier_prefix ON users_order (supplier_order_id varchar_pattern_ops)',
+        'CREATE INDEX IF NOT EXISTS users_user_email_prefix ON users_user (email varchar_pattern_ops)',
+    ],
+}
+
+REVERSE = {
+    'postgresql': [
+        'DROP INDEX IF EXISTS users_order_number_prefix',
+        'DROP INDEX IF EXISTS users_order_supplier_prefix',
+        'DROP INDEX IF EXISTS users_user_email_prefix',
+    ],
+}
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql)
+    return run
+
+
+def backfill(apps, schema_editor):
+    Order = apps.get_model('users', 'Order')
+    last_id = 0
+    while True:
+        rows = list(Order.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'link')[:BATCH_SIZE])
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        Order.objects.bulk_update(
+            [Order(id=order_id, link_hash=link_hash(link)) for order_id, link in rows], ['link_hash']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0013_order_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='link_hash',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['service_id', '-submitted_at', '-id'], name='users_order_service_62e2d3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['link_hash', '-submitted_at'], name='users_order_link_ha_7e88fc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['supplier_order_id'], name='users_order_supplie_cd0588_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(_run(FORWARD), _run(REVERSE)),
+    ]
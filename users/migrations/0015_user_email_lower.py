@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:17
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# The order search matches emails on LOWER(email); on PostgreSQL its prefix
+# LIKE needs the pattern_ops variant of that expression index.
+FORWARD = {
+    'postgresql': [
+        'DROP INDEX IF EXISTS users_user_email_prefix',
+        'CREATE INDEX IF NOT EXISTS users_user_email_lower_prefix ON users_user (LOWER(email) varchar_pattern_ops)',
+    ],
+}
+
+REVERSE = {
+    'postgresql': [
+        'DROP INDEX IF EXISTS users_user_email_lower_prefix',
+        'CREATE INDEX IF NOT EXISTS users_user_email_prefix ON users_user (email varchar_pattern_ops)',
+    ],
+}
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0014_order_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='users_user_email_lower_idx'),
+        ),
+        migrations.RunPython(_run(FORWARD), _run(REVERSE)),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 class User(models.Model):
     class RoleChoices(models.TextChoices):
@@ -41,6 +42,15 @@ class User(models.Model):
 
     last_login_api = models.CharField(max_length=20, blank=True)
 
+    class Meta:
+        # Case-insensitive email lookups from the admin order search.
+        indexes = [models.Index(Lower('email'), name='users_user_email_lower_idx')]
+
+    @property
+    def is_authenticated(self):
+        # Lets Channels consumers tell a resolved principal from AnonymousUser.
+        return True
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -74,6 +84,11 @@ class Category(models.Model):
     status = models.CharField(max_length=10, choices=CategoryStatus.choices)
     meta_title = models.CharField(max_length=20)
     meta_description = models.TextField()
+    # Summary of the category's active services, kept by users/helpers/category_summary.py.
+    active_services = models.PositiveIntegerField(default=0)
+    featured_services = models.PositiveIntegerField(default=0)
+    min_price_per_100 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_price_per_100 = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
 
 class Supplier(models.Model):
@@ -108,6 +123,7 @@ class Service(models.Model):
     supplier = models.ForeignKey(Supplier, on_delete=models.CASCADE, related_name='services')
     name = models.CharField(max_length=40, unique=True)
     photo = models.ImageField(upload_to='photos/', blank=True, null=True)
+    photo_variants = models.JSONField(default=dict, blank=True, help_text="Resized copies of photo, see users/helpers/image_variants.py")
     slug = models.CharField(max_length=40, unique=True, db_index=True)
     description = models.TextField(null=True, blank=True)  
     supplier_service_id = models.IntegerField()
@@ -198,6 +214,8 @@ class Order(models.Model):
     order_number = models.CharField(max_length=50, unique=True, db_index=True)  
     supplier_order_id = models.CharField(max_length=50, null=True, blank=True)  
     link = models.URLField(max_length=500)
+    # users.helpers.order_search.link_hash(link): finds every order for the same target link.
+    link_hash = models.CharField(max_length=32, blank=True, default='')
     quantity = models.IntegerField()
     price_paid = models.DecimalField(max_digits=10, decimal_places=2)  
     profit = models.DecimalField(max_digits=10, decimal_places=2)
@@ -216,9 +234,52 @@ class Order(models.Model):
         indexes = [
             models.Index(fields=['order_number']),
             models.Index(fields=['user_id', 'status']),
+            models.Index(fields=['user_id', '-submitted_at', '-id']),
+            models.Index(fields=['-submitted_at', '-id']),
+            models.Index(fields=['service_id', '-submitted_at', '-id']),
+            models.Index(fields=['link_hash', '-submitted_at']),
+            models.Index(fields=['supplier_order_id']),
         ]
 
 
+class OrderRollup(models.Model):
+    # Daily totals kept by users/helpers/order_rollup.py; one status column per Order.OrderStatus.
+    day = models.DateField()
+    orders = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    profit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    completed_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    completed_profit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    pending = models.IntegerField(default=0)
+    processing = models.IntegerField(default=0)
+    in_progress = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    partial = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+    refunded = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class OrderServiceRollup(OrderRollup):
+    service_id = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'service_id'], name='unique_order_service_rollup')
+        ]
+
+
+class OrderUserRollup(OrderRollup):
+    user_id = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'user_id'], name='unique_order_user_rollup')
+        ]
+
 
 class PaymentGateway(models.Model):
     class PaymentGatewaysType(models.TextChoices):
@@ -288,6 +349,7 @@ class Payment(models.Model):
             models.Index(fields=['transaction_id']),
             models.Index(fields=['payment_id']),
             models.Index(fields=['user_id', 'status']),
+            models.Index(fields=['user_id', '-created_at', '-id']),
         ]
 
 class Transaction(models.Model):
@@ -311,6 +373,7 @@ class Transaction(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user_id', 'type']),
+            models.Index(fields=['user_id', '-created_at', '-id']),
         ]
 
 class OrderHistory(models.Model):
@@ -482,6 +545,7 @@ class ServiceComment(models.Model):
             models.Index(fields=['service_id', 'status', '-created_at']),
             models.Index(fields=['user_id', '-created_at']),
             models.Index(fields=['status']),
+            models.Index(fields=['status', '-created_at', '-id']),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -588,6 +652,7 @@ class CommentReport(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['comment_id', 'resolved']),
+            models.Index(fields=['resolved', '-created_at', '-id']),
         ]
 
 
@@ -685,6 +750,8 @@ class SupportTicket(models.Model):
             models.Index(fields=['assigned_to', 'status']),
             models.Index(fields=['status', 'priority', 'created_at']),
             models.Index(fields=['queue_position', 'created_at']),
+            models.Index(fields=['user_id', '-created_at', '-id']),
+            models.Index(fields=['-priority', 'created_at', 'id']),
         ]
     
     def __str__(self):
@@ -1,21 +1,45 @@
 import jwt
+import secrets
 from datetime import datetime, timedelta
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.contrib.auth.hashers import make_password, check_password
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.db import transaction
 from ..models import User, Session
+from ..helpers import principal_cache, token_revocation, background, password_pool
 
 
 class AuthService:
     JWT_SECRET = getattr(settings, 'JWT_SECRET_KEY', settings.SECRET_KEY)
     JWT_ALGORITHM = 'HS256'
-    JWT_EXPIRY_DAYS = 3
+    ACCESS_TOKEN_MINUTES = getattr(settings, 'JWT_ACCESS_TOKEN_MINUTES', 15)
+    REFRESH_TOKEN_DAYS = getattr(settings, 'JWT_REFRESH_TOKEN_DAYS', 30)
     
     @classmethod
-    @transaction.atomic
     def register(cls, first_name, last_name, email, password, phone_number, country='RU', timezone='UTC+5', ip_address=None, user_agent='Chrome'):
+        error = cls._validate_registration(email, password)
+        if error:
+            return error
+        
+        password_hash = password_pool.hash_password(password)
+        return cls._create_registered_user(
+            first_name, last_name, email, password_hash, phone_number, country, timezone, ip_address, user_agent
+        )
+    
+    @classmethod
+    async def aregister(cls, first_name, last_name, email, password, phone_number, country='RU', timezone='UTC+5', ip_address=None, user_agent='Chrome'):
+        error = await sync_to_async(cls._validate_registration)(email, password)
+        if error:
+            return error
+        
+        password_hash = await password_pool.ahash_password(password)
+        return await sync_to_async(cls._create_registered_user)(
+            first_name, last_name, email, password_hash, phone_number, country, timezone, ip_address, user_agent
+        )
+    
+    @staticmethod
+    def _validate_registration(email, password):
         try:
             validate_email(email)
             
@@ -25,11 +49,22 @@ class AuthService:
             if len(password) < 8:
                 return {'success': False, 'user': None, 'token': None, 'message': 'Password must be at least 8 characters'}
             
+            return None
+            
+        except ValidationError as e:
+            return {'success': False, 'user': None, 'token': None, 'message': f'Invalid email: {str(e)}'}
+        except Exception as e:
+            return {'success': False, 'user': None, 'token': None, 'message': f'Registration failed: {str(e)}'}
+    
+    @classmethod
+    @transaction.atomic
+    def _create_registered_user(cls, first_name, last_name, email, password_hash, phone_number, country, timezone, ip_address, user_agent):
+        try:
             user = User.objects.create(
                 first_name=first_name,
                 last_name=last_name,
                 email=email,
-                password=make_password(password),  
+                password=password_hash,  
                 phone_number=phone_number,
                 country=country,
                 timezone=timezone,
@@ -37,105 +72,136 @@ class AuthService:
                 status=User.UserStatus.ACTIVE
             )
             
-            token = cls._generate_token(user)
+            token, refresh_token, refresh_jti = cls._generate_token_pair(user)
             
             if ip_address:
-                Session.objects.create(
-                    user_id=user,
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    payload=token[:20] 
-                )
+                background.submit_on_commit(cls._record_session, user.id, ip_address, user_agent, refresh_jti)
                 
                 User.objects.filter(id=user.id).update(
                     last_login_at=datetime.now().date(),
                     last_login_api=ip_address
                 )
             
-            return {'success': True, 'user': user, 'token': token, 'message': 'User registered successfully'}
+            return {'success': True, 'user': user, 'token': token, 'refresh_token': refresh_token, 'message': 'User registered successfully'}
             
-        except ValidationError as e:
-            return {'success': False, 'user': None, 'token': None, 'message': f'Invalid email: {str(e)}'}
         except Exception as e:
             return {'success': False, 'user': None, 'token': None, 'message': f'Registration failed: {str(e)}'}
     
     @classmethod
-    @transaction.atomic
     def login(cls, email, password, ip_address, user_agent='Chrome'):
+        user, error = cls._get_login_user(email)
+        if error:
+            return error
+        
+        matches, needs_rehash = password_pool.check_password(password, user.password)
+        return cls._complete_login(user, matches, needs_rehash, password, ip_address, user_agent)
+    
+    @classmethod
+    async def alogin(cls, email, password, ip_address, user_agent='Chrome'):
+        user, error = await sync_to_async(cls._get_login_user)(email)
+        if error:
+            return error
+        
+        matches, needs_rehash = await password_pool.acheck_password(password, user.password)
+        return await sync_to_async(cls._complete_login)(user, matches, needs_rehash, password, ip_address, user_agent)
+    
+    @staticmethod
+    def _get_login_user(email):
         try:
-            user = User.objects.select_related().only(
+            user = User.objects.only(
                 'id', 'email', 'password', 'status', 'role', 'first_name', 'last_name'
             ).get(email=email)
 
             if user.status == User.UserStatus.BANNED:
-                return {'success': False, 'token': None, 'user': None, 'message': 'Account banned'}
+                return None, {'success': False, 'token': None, 'user': None, 'message': 'Account banned'}
             
             if user.status == User.UserStatus.SUSPENDED:
-                return {'success': False, 'token': None, 'user': None, 'message': 'Account suspended'}
+                return None, {'success': False, 'token': None, 'user': None, 'message': 'Account suspended'}
             
-            if not check_password(password, user.password):
-                return {'success': False, 'token': None, 'user': None, 'message': 'Invalid credentials'}
+            return user, None
             
-            Session.objects.filter(user_id=user).delete()
+        except User.DoesNotExist:
+            return None, {'success': False, 'token': None, 'user': None, 'message': 'Invalid credentials'}
+        except Exception as e:
+            return None, {'success': False, 'token': None, 'user': None, 'message': f'Login failed: {str(e)}'}
+    
+    @classmethod
+    @transaction.atomic
+    def _complete_login(cls, user, matches, needs_rehash, password, ip_address, user_agent):
+        try:
+            if not matches:
+                return {'success': False, 'token': None, 'user': None, 'message': 'Invalid credentials'}
             
-            token = cls._generate_token(user)
+            token, refresh_token, refresh_jti = cls._generate_token_pair(user)
             
-            Session.objects.create(
-                user_id=user,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                payload=token[:20]
-            )
+            background.submit_on_commit(cls._record_session, user.id, ip_address, user_agent, refresh_jti)
+            if needs_rehash:
+                background.submit_on_commit(cls._upgrade_password_hash, user.id, password, user.password)
             
             User.objects.filter(id=user.id).update(
                 last_login_at=datetime.now().date(),
                 last_login_api=ip_address
             )
             
-            return {'success': True, 'token': token, 'user': user, 'message': 'Login successful'}
+            return {'success': True, 'token': token, 'refresh_token': refresh_token, 'user': user, 'message': 'Login successful'}
             
-        except User.DoesNotExist:
-            return {'success': False, 'token': None, 'user': None, 'message': 'Invalid credentials'}
         except Exception as e:
             return {'success': False, 'token': None, 'user': None, 'message': f'Login failed: {str(e)}'}
     
+    @staticmethod
+    def _upgrade_password_hash(user_id, password, old_hash):
+        # Only replace the hash we verified; a concurrent password change wins.
+        User.objects.filter(id=user_id, password=old_hash).update(
+            password=password_pool.hash_password(password)
+        )
+    
     @classmethod
-    def logout(cls, token):
+    def logout(cls, token, refresh_token=None):
         try:
             user = cls._verify_token(token)
             if not user:
                 return {'success': False, 'message': 'Invalid token'}
             
-            Session.objects.filter(user_id=user).delete()
+            token_revocation.revoke_payload(cls._decode(token))
+            principal_cache.invalidate_token(token)
+            
+            if refresh_token:
+                try:
+                    token_revocation.revoke_payload(cls._decode(refresh_token, token_type='refresh'))
+                except jwt.InvalidTokenError:
+                    pass
+            
             return {'success': True, 'message': 'Logged out successfully'}
             
         except Exception as e:
             return {'success': False, 'message': f'Logout failed: {str(e)}'}
     
     @classmethod
-    @transaction.atomic
     def refresh_token(cls, old_token, ip_address, user_agent='Chrome'):
         try:
-            user = cls._verify_token(old_token)
-            if not user:
+            try:
+                payload = cls._decode(old_token, token_type='refresh')
+            except jwt.InvalidTokenError:
+                return {'success': False, 'token': None, 'message': 'Invalid token'}
+            
+            if token_revocation.is_revoked(payload.get('jti')):
                 return {'success': False, 'token': None, 'message': 'Invalid token'}
             
+            user = User.objects.only(*principal_cache.PRINCIPAL_FIELDS).get(id=payload['user_id'])
+            
             if user.status != User.UserStatus.ACTIVE:
                 return {'success': False, 'token': None, 'message': 'Account not active'}
             
-            Session.objects.filter(user_id=user).delete()
+            token_revocation.revoke_payload(payload)
             
-            new_token = cls._generate_token(user)
+            new_token, new_refresh_token, refresh_jti = cls._generate_token_pair(user)
             
-            Session.objects.create(
-                user_id=user,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                payload=new_token[:20]
-            )
+            background.submit(cls._record_session, user.id, ip_address, user_agent, refresh_jti)
             
-            return {'success': True, 'token': new_token, 'message': 'Token refreshed'}
+            return {'success': True, 'token': new_token, 'refresh_token': new_refresh_token, 'message': 'Token refreshed'}
             
+        except User.DoesNotExist:
+            return {'success': False, 'token': None, 'message': 'Invalid token'}
         except Exception as e:
             return {'success': False, 'token': None, 'message': f'Refresh failed: {str(e)}'}
     
@@ -144,30 +210,77 @@ class AuthService:
         return cls._verify_token(token)
     
     @classmethod
-    def _generate_token(cls, user):
+    def _generate_token(cls, user, token_type='access'):
+        now = datetime.utcnow()
+        if token_type == 'refresh':
+            expires = now + timedelta(days=cls.REFRESH_TOKEN_DAYS)
+        else:
+            expires = now + timedelta(minutes=cls.ACCESS_TOKEN_MINUTES)
+        
+        jti = secrets.token_urlsafe(15)
         payload = {
             'user_id': user.id,
             'email': user.email,
             'role': user.role,
-            'exp': datetime.utcnow() + timedelta(days=cls.JWT_EXPIRY_DAYS),
-            'iat': datetime.utcnow()
+            'type': token_type,
+            'jti': jti,
+            'exp': expires,
+            'iat': now
         }
-        return jwt.encode(payload, cls.JWT_SECRET, algorithm=cls.JWT_ALGORITHM)
+        return jwt.encode(payload, cls.JWT_SECRET, algorithm=cls.JWT_ALGORITHM), jti
+    
+    @classmethod
+    def _generate_token_pair(cls, user):
+        token, _ = cls._generate_token(user)
+        refresh_token, refresh_jti = cls._generate_token(user, token_type='refresh')
+        return token, refresh_token, refresh_jti
+    
+    @classmethod
+    def _decode(cls, token, token_type='access'):
+        payload = jwt.decode(token, cls.JWT_SECRET, algorithms=[cls.JWT_ALGORITHM])
+        if payload.get('type') != token_type:
+            raise jwt.InvalidTokenError(f'Expected a {token_type} token')
+        return payload
+    
+    @staticmethod
+    def _record_session(user_id, ip_address, user_agent, jti):
+        # Audit trail only: one row per login/refresh, never read on the request path.
+        Session.objects.create(
+            user_id_id=user_id,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            payload=jti
+        )
+    
+    @classmethod
+    def authenticate(cls, token):
+        """Return ``(user, error_message, status_code)``; ``user`` is None when rejected."""
+        user, generation = principal_cache.lookup(token)
+        if user is not None:
+            return user, None, None
+        
+        try:
+            payload = cls._decode(token)
+        except jwt.ExpiredSignatureError:
+            return None, 'Token expired', 401
+        except jwt.InvalidTokenError:
+            return None, 'Invalid token', 401
+        
+        if token_revocation.is_revoked(payload.get('jti')):
+            return None, 'Session expired', 401
+        
+        try:
+            user = User.objects.only(*principal_cache.PRINCIPAL_FIELDS).get(id=payload['user_id'])
+        except User.DoesNotExist:
+            return None, 'User not found', 404
+        
+        principal_cache.store(token, user, payload, generation)
+        return user, None, None
     
     @classmethod
     def _verify_token(cls, token):
         try:
-            payload = jwt.decode(token, cls.JWT_SECRET, algorithms=[cls.JWT_ALGORITHM])
-            
-            user = User.objects.only('id', 'email', 'role', 'status', 'first_name', 'last_name').get(id=payload['user_id'])
-            
-            if not Session.objects.filter(user_id=user, payload=token[:20]).exists():
-                return None
-            
-            return user
-            
-        except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, User.DoesNotExist):
-            return None
+            return cls.authenticate(token)[0]
         except Exception:
             return None
     
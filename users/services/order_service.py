@@ -1,16 +1,27 @@
-import secrets
 from decimal import Decimal
 from datetime import timedelta
 from django.db import transaction, models
 from django.utils import timezone
 from django.core.paginator import Paginator
-from django.db.models import Count, Sum, Avg, Q, F, Prefetch
-from django.core.cache import cache
-from users.models import Order, Service, User, Cart, CartItem
+from django.db.models import Count, Sum, Q, F, Prefetch
+from users.helpers.cache_ns import CacheNamespace, succeeded
+from users.helpers import dashboard_counters, ids, keyset, order_rollup, order_search
+from users.models import Order, OrderServiceRollup, OrderUserRollup, Service, User, Cart, CartItem
 
 
 class OrderService:
     CACHE_TTL = 300  
+    ADMIN_CACHE = CacheNamespace('orders:admin', ttl=CACHE_TTL)
+
+    @staticmethod
+    def _user_cache(user_id):
+        return CacheNamespace(f'orders:user:{user_id}', ttl=OrderService.CACHE_TTL, metric='orders:user')
+
+    @staticmethod
+    def _invalidate_orders(user_ids=()):
+        for user_id in set(user_ids):
+            OrderService._user_cache(user_id).invalidate()
+        OrderService.ADMIN_CACHE.invalidate()
 
     @staticmethod
     @transaction.atomic
@@ -38,6 +49,7 @@ class OrderService:
                     service_id=service,
                     order_number=order_number,
                     link=item.link,
+                    link_hash=order_search.link_hash(item.link),
                     quantity=item.quantity,
                     price_paid=price_paid,
                     profit=profit,
@@ -50,6 +62,7 @@ class OrderService:
                 service_updates[service.id] = service_updates.get(service.id, 0) + 1
             
             created_orders = Order.objects.bulk_create(orders_to_create)
+            order_rollup.apply(added=[order_rollup.row(order) for order in created_orders])
             
             for service_id, count in service_updates.items():
                 Service.objects.filter(id=service_id).update(
@@ -63,8 +76,7 @@ class OrderService:
 
             CartItem.objects.filter(cart_id=cart).delete()
             
-            cache.delete(f'user_orders_{user.id}')
-            cache.delete(f'user_stats_{user.id}')
+            OrderService._invalidate_orders([user.id])
             
             return {
                 'success': True,
@@ -79,99 +91,104 @@ class OrderService:
             return {'success': False, 'message': f'Failed to create orders: {str(e)}'}
     
     @staticmethod
-    def get_user_orders(user, page=1, per_page=20, status=None):
-        cache_key = f'user_orders_{user.id}_p{page}_s{status}'
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
+    def get_user_orders(user, page=1, per_page=20, status=None, cursor=None):
+        cache_key = f'user_orders_p{page}_s{status}'
 
-        queryset = Order.objects.filter(user_id=user).select_related('service_id').only(
-            'id', 'order_number', 'link', 'quantity', 'price_paid', 'status',
-            'start_count', 'remains', 'submitted_at', 'completed_at',
-            'service_id__id', 'service_id__name', 'service_id__photo'
-        ).order_by('-submitted_at')
-        
-        if status:
-            queryset = queryset.filter(status=status)
+        def load():
+            queryset = Order.objects.filter(user_id=user).select_related('service_id').only(
+                'id', 'order_number', 'link', 'quantity', 'price_paid', 'status',
+                'start_count', 'remains', 'submitted_at', 'completed_at',
+                'service_id__id', 'service_id__name', 'service_id__photo'
+            ).order_by('-submitted_at')
         
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+            if status:
+                queryset = queryset.filter(status=status)
         
-        orders = [
-            {
-                'id': order.id,
-                'order_number': order.order_number,
-                'service': {
-                    'id': order.service.id,
-                    'name': order.service.name,
-                    'photo': order.service.photo.url if order.service.photo else None
-                },
-                'link': order.link,
-                'quantity': order.quantity,
-                'price_paid': float(order.price_paid),
-                'status': order.status.status,
-                'start_count': order.start_count,
-                'remains': order.remains,
-                'submitted_at': order.submitted_at.isoformat() if order.submitted_at else None,
-                'completed_at': order.completed_at.isoformat() if order.completed_at else None,
-
-            }
-            for order in page_obj.object_list
-        ]
-        
-        result = {
-            'success': True,
-            'orders': orders,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_orders': paginator.count
-            }
-        }
-        
-        cache.set(cache_key, result, OrderService.CACHE_TTL)
-        return result
-    
-    @staticmethod
-    def get_order_by_number(user, order_number):
-        cache_key = f'order_{order_number}'
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
+            if cursor is not None:
+                rows, pagination = keyset.paginate(queryset, cursor, per_page)
+            else:
+                paginator = Paginator(queryset, per_page)
+                page_obj = paginator.get_page(page)
+                rows = page_obj.object_list
+                pagination = {
+                    'current_page': page_obj.number,
+                    'total_pages': paginator.num_pages,
+                    'total_orders': paginator.count
+                }
         
-        try:
-            order = Order.objects.select_related('service_id__category').get(
-                order_number=order_number,
-                user_id=user
-            )
-            
-            result = {
-                'success': True,
-                'order': {
+            orders = [
+                {
                     'id': order.id,
                     'order_number': order.order_number,
                     'service': {
-                        'id': order.service_id.id,
-                        'name': order.service_id.name,
-                        'category': order.service_id.category.name
+                        'id': order.service.id,
+                        'name': order.service.name,
+                        'photo': order.service.photo.url if order.service.photo else None
                     },
                     'link': order.link,
                     'quantity': order.quantity,
                     'price_paid': float(order.price_paid),
-                    'status': order.status,
+                    'status': order.status.status,
                     'start_count': order.start_count,
                     'remains': order.remains,
-                    'customer_note': order.customer_note,
                     'submitted_at': order.submitted_at.isoformat() if order.submitted_at else None,
-                    'completed_at': order.completed_at.isoformat() if order.completed_at else None
+                    'completed_at': order.completed_at.isoformat() if order.completed_at else None,
+
                 }
+                for order in rows
+            ]
+        
+            result = {
+                'success': True,
+                'orders': orders,
+                'pagination': pagination
             }
-            
-            cache.set(cache_key, result, OrderService.CACHE_TTL)
+        
             return result
+
+        if cursor is not None:
+            return load()
+        return OrderService._user_cache(user.id).fetch(cache_key, load)
+    
+    @staticmethod
+    def get_order_by_number(user, order_number):
+        cache_key = f'order_{order_number}'
+
+        def load():
+            try:
+                order = Order.objects.select_related('service_id__category').get(
+                    order_number=order_number,
+                    user_id=user
+                )
             
-        except Order.DoesNotExist:
-            return {'success': False, 'message': 'Order not found'}
+                result = {
+                    'success': True,
+                    'order': {
+                        'id': order.id,
+                        'order_number': order.order_number,
+                        'service': {
+                            'id': order.service_id.id,
+                            'name': order.service_id.name,
+                            'category': order.service_id.category.name
+                        },
+                        'link': order.link,
+                        'quantity': order.quantity,
+                        'price_paid': float(order.price_paid),
+                        'status': order.status,
+                        'start_count': order.start_count,
+                        'remains': order.remains,
+                        'customer_note': order.customer_note,
+                        'submitted_at': order.submitted_at.isoformat() if order.submitted_at else None,
+                        'completed_at': order.completed_at.isoformat() if order.completed_at else None
+                    }
+                }
+            
+                return result
+            
+            except Order.DoesNotExist:
+                return {'success': False, 'message': 'Order not found'}
+
+        return OrderService._user_cache(user.id).fetch(cache_key, load, cache_if=succeeded)
     
     @staticmethod
     @transaction.atomic
@@ -179,6 +196,7 @@ class OrderService:
         try:
             order = Order.objects.select_related('service_id').get(id=order_id)
             old_status = order.status
+            before = order_rollup.row(order)
             
             order.status = status
             if start_count is not None:
@@ -193,9 +211,9 @@ class OrderService:
                 )
             
             order.save()
+            order_rollup.apply(added=[order_rollup.row(order)], removed=[before])
             
-            cache.delete(f'order_{order.order_number}')
-            cache.delete(f'user_stats_{order.user_id.id}')
+            OrderService._invalidate_orders([order.user_id_id])
             
             return {'success': True, 'message': 'Order status updated'}
         except Order.DoesNotExist:
@@ -203,36 +221,35 @@ class OrderService:
     
     @staticmethod
     def get_order_stats(user):
-        cache_key = f'user_stats_{user.id}'
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
-        
-        stats = Order.objects.filter(user_id=user).aggregate(
-            total_orders=Count('id'),
-            pending=Count('id', filter=Q(status='PENDING')),
-            processing=Count('id', filter=Q(status='PROCESSING')),
-            completed=Count('id', filter=Q(status='COMPLETED')),
-            total_spent=Sum('price_paid')
-        )
+        cache_key = 'user_stats'
+
+        def load():
+            stats = Order.objects.filter(user_id=user).aggregate(
+                total_orders=Count('id'),
+                pending=Count('id', filter=Q(status='PENDING')),
+                processing=Count('id', filter=Q(status='PROCESSING')),
+                completed=Count('id', filter=Q(status='COMPLETED')),
+                total_spent=Sum('price_paid')
+            )
         
-        result = {
-            'success': True,
-            'stats': {
-                'total_orders': stats['total_orders'] or 0,
-                'pending_orders': stats['pending'] or 0,
-                'processing_orders': stats['processing'] or 0,
-                'completed_orders': stats['completed'] or 0,
-                'total_spent': float(stats['total_spent'] or 0)
+            result = {
+                'success': True,
+                'stats': {
+                    'total_orders': stats['total_orders'] or 0,
+                    'pending_orders': stats['pending'] or 0,
+                    'processing_orders': stats['processing'] or 0,
+                    'completed_orders': stats['completed'] or 0,
+                    'total_spent': float(stats['total_spent'] or 0)
+                }
             }
-        }
         
-        cache.set(cache_key, result, OrderService.CACHE_TTL)
-        return result
+            return result
+
+        return OrderService._user_cache(user.id).fetch(cache_key, load)
     
     
     @staticmethod
-    def get_all_orders_admin(page=1, per_page=20, status=None, user_id=None, search=None, order_by='-submitted_at'):
+    def get_all_orders_admin(page=1, per_page=20, status=None, user_id=None, search=None, order_by='-submitted_at', cursor=None):
         queryset = Order.objects.select_related(
             'user_id', 'service_id__category'
         ).only(
@@ -248,17 +265,24 @@ class OrderService:
         if user_id:
             queryset = queryset.filter(user_id=user_id)
         if search:
-            queryset = queryset.filter(
-                Q(order_number__icontains=search) |
-                Q(link__icontains=search) |
-                Q(user_id__email__icontains=search) |
-                Q(service_id__name__icontains=search)
-            )
+            queryset = order_search.filter_orders(queryset, search)
         
         queryset = queryset.order_by(order_by)
-        
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+
+        if cursor is not None and not keyset.supports(queryset):
+            cursor = None
+
+        if cursor is not None:
+            rows, pagination = keyset.paginate(queryset, cursor, per_page)
+        else:
+            paginator = Paginator(queryset, per_page)
+            page_obj = paginator.get_page(page)
+            rows = page_obj.object_list
+            pagination = {
+                'current_page': page_obj.number,
+                'total_pages': paginator.num_pages,
+                'total_orders': paginator.count
+            }
 
         orders = [
             {
@@ -286,17 +310,13 @@ class OrderService:
                 'submitted_at': order.submitted_at.isoformat() if order.submitted_at else None,  # ✅ Added null check
                 'completed_at': order.completed_at.isoformat() if order.completed_at else None
             }
-            for order in page_obj.object_list
+            for order in rows
         ]
         
         return {
             'success': True,
             'orders': orders,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_orders': paginator.count
-            }
+            'pagination': pagination
         }
 
     
@@ -346,6 +366,7 @@ class OrderService:
         try:
             order = Order.objects.select_related('service_id').get(id=order_id)
             old_status = order.status
+            before = order_rollup.row(order)
             
             allowed_fields = ['status', 'start_count', 'remains', 'admin_note', 'link', 'quantity']
             update_fields = []
@@ -354,6 +375,9 @@ class OrderService:
                 if field in allowed_fields and value is not None:
                     setattr(order, field, value)
                     update_fields.append(field)
+            if 'link' in update_fields:
+                order.link_hash = order_search.link_hash(order.link)
+                update_fields.append('link_hash')
 
             if kwargs.get('status') == 'COMPLETED' and old_status != 'COMPLETED':
                 order.completed_at = timezone.now()
@@ -363,10 +387,9 @@ class OrderService:
                 )
             
             order.save(update_fields=update_fields)
+            order_rollup.apply(added=[order_rollup.row(order)], removed=[before])
             
-            cache.delete(f'order_{order.order_number}')
-            cache.delete(f'user_stats_{order.user_id.id}')
-            cache.delete('admin_dashboard_stats')
+            OrderService._invalidate_orders([order.user_id_id])
             
             return {'success': True, 'message': 'Order updated successfully'}
         except Order.DoesNotExist:
@@ -401,9 +424,14 @@ class OrderService:
                         total_completed=F('total_completed') + item['count']
                     )
 
+            user_ids = list(orders.values_list('user_id', flat=True).distinct())
+            before = order_rollup.rows(orders) if 'status' in update_data else []
             updated_count = orders.update(**update_data)
+            order_rollup.apply(
+                added=[{**row, 'status': update_data['status']} for row in before], removed=before
+            )
             
-            cache.delete('admin_dashboard_stats')
+            OrderService._invalidate_orders(user_ids)
             
             return {
                 'success': True,
@@ -432,11 +460,10 @@ class OrderService:
             order_number = order.order_number
             user_id = order.user_id.id
             
+            order_rollup.apply(removed=[order_rollup.row(order)])
             order.delete()
             
-            cache.delete(f'order_{order_number}')
-            cache.delete(f'user_stats_{user_id}')
-            cache.delete('admin_dashboard_stats')
+            OrderService._invalidate_orders([user_id])
             
             return {
                 'success': True,
@@ -471,9 +498,11 @@ class OrderService:
                 )
             
             deleted_count = orders.count()
+            user_ids = list(orders.values_list('user_id', flat=True).distinct())
+            order_rollup.discard(orders)
             orders.delete()
             
-            cache.delete('admin_dashboard_stats')
+            OrderService._invalidate_orders(user_ids)
             
             return {
                 'success': True,
@@ -486,91 +515,91 @@ class OrderService:
 
     @staticmethod
     def get_admin_dashboard_stats():
+        stats = dashboard_counters.read()
+        if stats is not None:
+            return {'success': True, 'stats': stats}
+
         cache_key = 'admin_dashboard_stats'
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
-        
-        now = timezone.now()
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        week_start = now - timedelta(days=7)
-        month_start = now - timedelta(days=30)
+
+        def load():
+            today = timezone.localdate()
+            week_start = order_rollup.since(7)
+            month_start = order_rollup.since(30)
         
-        stats = Order.objects.aggregate(
-            total_orders=Count('id'),
-            pending=Count('id', filter=Q(status='PENDING')),
-            processing=Count('id', filter=Q(status='PROCESSING')),
-            completed=Count('id', filter=Q(status='COMPLETED')),
-            cancelled=Count('id', filter=Q(status='CANCELLED')),
-            partial=Count('id', filter=Q(status='PARTIAL')),
-            failed=Count('id', filter=Q(status='FAILED')),
-            total_revenue=Sum('price_paid'),
-            total_profit=Sum('profit'),
-            avg_order_value=Avg('price_paid'),
+            stats = OrderServiceRollup.objects.aggregate(
+                total_orders=Sum('orders'),
+                pending=Sum('pending'),
+                processing=Sum('processing'),
+                completed=Sum('completed'),
+                cancelled=Sum('cancelled'),
+                partial=Sum('partial'),
+                failed=Sum('failed'),
+                total_revenue=Sum('revenue'),
+                total_profit=Sum('profit'),
             
-            today_orders=Count('id', filter=Q(submitted_at__gte=today_start)),
-            today_revenue=Sum('price_paid', filter=Q(submitted_at__gte=today_start)),
-            today_profit=Sum('profit', filter=Q(submitted_at__gte=today_start)),
+                today_orders=Sum('orders', filter=Q(day=today)),
+                today_revenue=Sum('revenue', filter=Q(day=today)),
+                today_profit=Sum('profit', filter=Q(day=today)),
             
 
-            week_orders=Count('id', filter=Q(submitted_at__gte=week_start)),
-            week_revenue=Sum('price_paid', filter=Q(submitted_at__gte=week_start)),
-            week_profit=Sum('profit', filter=Q(submitted_at__gte=week_start)),
+                week_orders=Sum('orders', filter=Q(day__gte=week_start)),
+                week_revenue=Sum('revenue', filter=Q(day__gte=week_start)),
+                week_profit=Sum('profit', filter=Q(day__gte=week_start)),
             
-            month_orders=Count('id', filter=Q(submitted_at__gte=month_start)),
-            month_revenue=Sum('price_paid', filter=Q(submitted_at__gte=month_start)),
-            month_profit=Sum('profit', filter=Q(submitted_at__gte=month_start))
-        )
+                month_orders=Sum('orders', filter=Q(day__gte=month_start)),
+                month_revenue=Sum('revenue', filter=Q(day__gte=month_start)),
+                month_profit=Sum('profit', filter=Q(day__gte=month_start))
+            )
+            total_orders = stats['total_orders'] or 0
         
-        result = {
-            'success': True,
-            'stats': {
-                'total': {
-                    'orders': stats['total_orders'] or 0,
-                    'revenue': float(stats['total_revenue'] or 0),
-                    'profit': float(stats['total_profit'] or 0),
-                    'avg_order_value': float(stats['avg_order_value'] or 0)
-                },
-                'by_status': {
-                    'pending': stats['pending'] or 0,
-                    'processing': stats['processing'] or 0,
-                    'completed': stats['completed'] or 0,
-                    'cancelled': stats['cancelled'] or 0,
-                    'partial': stats['partial'] or 0,
-                    'failed': stats['failed'] or 0
-                },
-                'today': {
-                    'orders': stats['today_orders'] or 0,
-                    'revenue': float(stats['today_revenue'] or 0),
-                    'profit': float(stats['today_profit'] or 0)
-                },
-                'this_week': {
-                    'orders': stats['week_orders'] or 0,
-                    'revenue': float(stats['week_revenue'] or 0),
-                    'profit': float(stats['week_profit'] or 0)
-                },
-                'this_month': {
-                    'orders': stats['month_orders'] or 0,
-                    'revenue': float(stats['month_revenue'] or 0),
-                    'profit': float(stats['month_profit'] or 0)
+            result = {
+                'success': True,
+                'stats': {
+                    'total': {
+                        'orders': total_orders,
+                        'revenue': float(stats['total_revenue'] or 0),
+                        'profit': float(stats['total_profit'] or 0),
+                        'avg_order_value': float(stats['total_revenue'] / total_orders) if total_orders else 0.0
+                    },
+                    'by_status': {
+                        'pending': stats['pending'] or 0,
+                        'processing': stats['processing'] or 0,
+                        'completed': stats['completed'] or 0,
+                        'cancelled': stats['cancelled'] or 0,
+                        'partial': stats['partial'] or 0,
+                        'failed': stats['failed'] or 0
+                    },
+                    'today': {
+                        'orders': stats['today_orders'] or 0,
+                        'revenue': float(stats['today_revenue'] or 0),
+                        'profit': float(stats['today_profit'] or 0)
+                    },
+                    'this_week': {
+                        'orders': stats['week_orders'] or 0,
+                        'revenue': float(stats['week_revenue'] or 0),
+                        'profit': float(stats['week_profit'] or 0)
+                    },
+                    'this_month': {
+                        'orders': stats['month_orders'] or 0,
+                        'revenue': float(stats['month_revenue'] or 0),
+                        'profit': float(stats['month_profit'] or 0)
+                    }
                 }
             }
-        }
         
-        cache.set(cache_key, result, OrderService.CACHE_TTL)
-        return result
+            return result
+
+        return OrderService.ADMIN_CACHE.fetch(cache_key, load)
     
     @staticmethod
     def get_top_services_admin(limit=10, days=30):
-        cutoff_date = timezone.now() - timedelta(days=days)
-        
-        top_services = Order.objects.filter(
-            submitted_at__gte=cutoff_date
+        top_services = OrderServiceRollup.objects.filter(
+            day__gte=order_rollup.since(days)
         ).values(
             'service_id__id', 'service_id__name', 'service_id__category__name'
         ).annotate(
-            order_count=Count('id'),
-            total_revenue=Sum('price_paid'),
+            order_count=Sum('orders'),
+            total_revenue=Sum('revenue'),
             total_profit=Sum('profit')
         ).order_by('-order_count')[:limit]
         
@@ -591,15 +620,13 @@ class OrderService:
     
     @staticmethod
     def get_top_customers_admin(limit=10, days=30):
-        cutoff_date = timezone.now() - timedelta(days=days)
-        
-        top_customers = Order.objects.filter(
-            submitted_at__gte=cutoff_date
+        top_customers = OrderUserRollup.objects.filter(
+            day__gte=order_rollup.since(days)
         ).values(
             'user_id__id', 'user_id__email', 'user_id__first_name', 'user_id__last_name'
         ).annotate(
-            order_count=Count('id'),
-            total_spent=Sum('price_paid'),
+            order_count=Sum('orders'),
+            total_spent=Sum('revenue'),
             total_profit=Sum('profit')
         ).order_by('-total_spent')[:limit]
         
@@ -647,27 +674,26 @@ class OrderService:
     
     @staticmethod
     def get_revenue_by_period_admin(period='daily', start_date=None, end_date=None):
-        from django.db.models.functions import TruncDay, TruncWeek, TruncMonth
+        from django.db.models.functions import TruncWeek, TruncMonth
         
-        queryset = Order.objects.filter(status='COMPLETED')
+        queryset = OrderServiceRollup.objects.filter(completed__gt=0)
         
         if start_date:
-            queryset = queryset.filter(submitted_at__gte=start_date)
+            queryset = queryset.filter(day__gte=order_rollup.to_day(start_date))
         if end_date:
-            queryset = queryset.filter(submitted_at__lte=end_date)
+            queryset = queryset.filter(day__lte=order_rollup.to_day(end_date))
         
-        trunc_func = {
-            'daily': TruncDay,
-            'weekly': TruncWeek,
-            'monthly': TruncMonth
-        }.get(period, TruncDay)
+        period_expr = {
+            'weekly': TruncWeek('day'),
+            'monthly': TruncMonth('day')
+        }.get(period, F('day'))
         
         revenue_data = queryset.annotate(
-            period=trunc_func('submitted_at')
+            period=period_expr
         ).values('period').annotate(
-            order_count=Count('id'),
-            revenue=Sum('price_paid'),
-            profit=Sum('profit')
+            order_count=Sum('completed'),
+            period_revenue=Sum('completed_revenue'),
+            period_profit=Sum('completed_profit')
         ).order_by('period')
         
         return {
@@ -675,65 +701,62 @@ class OrderService:
             'period': period,
             'data': [
                 {
-                    'period': item['period'].isoformat(),
+                    'period': order_rollup.day_start(item['period']).isoformat(),
                     'order_count': item['order_count'],
-                    'revenue': float(item['revenue'] or 0),
-                    'profit': float(item['profit'] or 0)
+                    'revenue': float(item['period_revenue'] or 0),
+                    'profit': float(item['period_profit'] or 0)
                 }
                 for item in revenue_data
             ]
         }
     @staticmethod
     def get_order_analytics_admin(start_date=None, end_date=None):
-        from datetime import timedelta
-        
-        queryset = Order.objects.all()
-        
+        window = Q()
         if start_date:
-            queryset = queryset.filter(submitted_at__gte=start_date)
+            window &= Q(day__gte=order_rollup.to_day(start_date))
         if end_date:
-            queryset = queryset.filter(submitted_at__lte=end_date)
+            window &= Q(day__lte=order_rollup.to_day(end_date))
         
-        overall_stats = queryset.aggregate(
-            total_orders=Count('id'),
-            total_revenue=Sum('price_paid'),
+        overall_stats = OrderServiceRollup.objects.filter(window).aggregate(
+            total_orders=Sum('orders'),
+            total_revenue=Sum('revenue'),
             total_profit=Sum('profit'),
-            avg_order_value=Avg('price_paid'),
-            pending=Count('id', filter=Q(status='PENDING')),
-            processing=Count('id', filter=Q(status='PROCESSING')),
-            completed=Count('id', filter=Q(status='COMPLETED')),
-            cancelled=Count('id', filter=Q(status='CANCELLED')),
-            partial=Count('id', filter=Q(status='PARTIAL')),
-            failed=Count('id', filter=Q(status='FAILED'))
+            pending=Sum('pending'),
+            processing=Sum('processing'),
+            completed=Sum('completed'),
+            cancelled=Sum('cancelled'),
+            partial=Sum('partial'),
+            failed=Sum('failed')
         )
+        total_orders = overall_stats['total_orders'] or 0
         
-        top_services = queryset.values(
+        top_services = OrderServiceRollup.objects.filter(window).values(
             'service_id__id',
             'service_id__name'
         ).annotate(
-            order_count=Count('id'),
-            total_revenue=Sum('price_paid'),
+            order_count=Sum('orders'),
+            total_revenue=Sum('revenue'),
             total_profit=Sum('profit')
         ).order_by('-order_count')[:10]
         
-        top_customers = queryset.values(
+        top_customers = OrderUserRollup.objects.filter(window).values(
             'user_id__id',
             'user_id__email',
             'user_id__first_name',
             'user_id__last_name'
         ).annotate(
-            order_count=Count('id'),
-            total_spent=Sum('price_paid')
+            order_count=Sum('orders'),
+            total_spent=Sum('revenue')
         ).order_by('-total_spent')[:10]
         
         return {
             'success': True,
             'analytics': {
                 'overall': {
-                    'total_orders': overall_stats['total_orders'] or 0,
+                    'total_orders': total_orders,
                     'total_revenue': float(overall_stats['total_revenue'] or 0),
                     'total_profit': float(overall_stats['total_profit'] or 0),
-                    'avg_order_value': float(overall_stats['avg_order_value'] or 0),
+                    'avg_order_value': float(overall_stats['total_revenue'] / total_orders) if total_orders else 0.0,
                     'status_breakdown': {
                         'pending': overall_stats['pending'] or 0,
                         'processing': overall_stats['processing'] or 0,
@@ -810,7 +833,7 @@ class OrderService:
             }
         }
     @staticmethod
-    def get_user_order_history(user, page=1, per_page=20, filters=None):
+    def get_user_order_history(user, page=1, per_page=20, filters=None, cursor=None):
         queryset = Order.objects.filter(user_id=user).select_related(
         'service_id',
         'service_id__category'  # ✅ CORRECT
@@ -843,8 +866,18 @@ class OrderService:
         
         queryset = queryset.order_by('-submitted_at')
         
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        if cursor is not None:
+            rows, pagination = keyset.paginate(queryset, cursor, per_page)
+        else:
+            paginator = Paginator(queryset, per_page)
+            page_obj = paginator.get_page(page)
+            rows = page_obj.object_list
+            pagination = {
+                'current_page': page_obj.number,
+                'total_pages': paginator.num_pages,
+                'total_orders': paginator.count,
+                'per_page': per_page
+            }
         
         orders = [
             {
@@ -871,18 +904,13 @@ class OrderService:
                 'completed_at': order.completed_at.isoformat() if order.completed_at else None,
                 'estimated_completion': OrderService._estimate_completion(order)
             }
-            for order in page_obj.object_list
+            for order in rows
         ]
         
         return {
             'success': True,
             'orders': orders,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_orders': paginator.count,
-                'per_page': per_page
-            }
+            'pagination': pagination
         }
 
 
@@ -1045,6 +1073,7 @@ class OrderService:
 
 
     @staticmethod
+    @transaction.atomic
     def cancel_order(user, order_id):
         try:
             order = Order.objects.select_related('service_id').get(
@@ -1064,9 +1093,11 @@ class OrderService:
                     'message': 'This service does not allow cancellations'
                 }
             
+            before = order_rollup.row(order)
             order.status = 'CANCELLED'
             order.cancelled_at = timezone.now()
             order.save(update_fields=['status', 'cancelled_at'])
+            order_rollup.apply(added=[order_rollup.row(order)], removed=[before])
             
             user.balance = F('balance') + order.price_paid
             user.save(update_fields=['balance'])
@@ -1165,6 +1196,4 @@ class OrderService:
         
     @staticmethod
     def _generate_order_number():
-        timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
-        random_part = secrets.token_hex(4).upper()
-        return f"ORD-{timestamp}-{random_part}"
\ No newline at end of file
+        return ids.next_id('ORD')
\ No newline at end of file
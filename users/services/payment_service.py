@@ -1,11 +1,11 @@
 import requests
-import secrets
 from decimal import Decimal
 from django.db import transaction
 from django.utils import timezone
 from django.conf import settings
 from datetime import timedelta
 from users.models import Payment, PaymentGateway, User
+from users.helpers import ids, keyset
 
 
 class PaymentService:
@@ -250,13 +250,22 @@ class PaymentService:
 
     
     @staticmethod
-    def get_user_payments(user, page=1, per_page=20):
+    def get_user_payments(user, page=1, per_page=20, cursor=None):
         from django.core.paginator import Paginator
         
         queryset = Payment.objects.filter(user_id=user).select_related('gateway').order_by('-created_at')
         
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        if cursor is not None:
+            rows, pagination = keyset.paginate(queryset, cursor, per_page)
+        else:
+            paginator = Paginator(queryset, per_page)
+            page_obj = paginator.get_page(page)
+            rows = page_obj.object_list
+            pagination = {
+                'current_page': page_obj.number,
+                'total_pages': paginator.num_pages,
+                'total_payments': paginator.count
+            }
         
         payments = [{
             'transaction_id': p.transaction_id,
@@ -265,16 +274,12 @@ class PaymentService:
             'gateway': p.gateway.name if p.gateway else 'Unknown',
             'status': p.status,
             'created_at': p.created_at.isoformat()
-        } for p in page_obj.object_list]
+        } for p in rows]
         
         return {
             'success': True,
             'payments': payments,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_payments': paginator.count
-            }
+            'pagination': pagination
         }
     
     @staticmethod
@@ -299,7 +304,7 @@ class PaymentService:
     
     @staticmethod
     def _generate_transaction_id():
-        return f"TXN-{timezone.now().strftime('%Y%m%d')}-{secrets.token_hex(8).upper()}"
+        return ids.next_id('TXN')
     
 
 #List to do
@@ -2,6 +2,7 @@ from django.db import transaction, models
 from django.db.models import Avg, Count, Q, F
 from django.utils import timezone
 from django.core.paginator import Paginator
+from users.helpers import keyset
 from users.models import (
     ServiceComment, ServiceFavorite, CommentHelpful, 
     CommentReport, Service, Order, User
@@ -61,7 +62,7 @@ class ServiceFeaturesService:
             return {'success': False, 'message': f'Failed to add comment: {str(e)}'}
     
     @staticmethod
-    def get_service_comments(service_id, page=1, per_page=10, approved_only=True):
+    def get_service_comments(service_id, page=1, per_page=10, approved_only=True, cursor=None):
         queryset = ServiceComment.objects.filter(
             service_id=service_id
         ).select_related('user_id', 'replied_by')
@@ -71,8 +72,17 @@ class ServiceFeaturesService:
         
         queryset = queryset.order_by('-created_at')
         
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        if cursor is not None:
+            rows, pagination = keyset.paginate(queryset, cursor, per_page)
+        else:
+            paginator = Paginator(queryset, per_page)
+            page_obj = paginator.get_page(page)
+            rows = page_obj.object_list
+            pagination = {
+                'current_page': page_obj.number,
+                'total_pages': paginator.num_pages,
+                'total_comments': paginator.count
+            }
         
         comments = [
             {
@@ -90,17 +100,13 @@ class ServiceFeaturesService:
                 'replied_at': comment.replied_at.isoformat() if comment.replied_at else None,
                 'created_at': comment.created_at.isoformat()
             }
-            for comment in page_obj.object_list
+            for comment in rows
         ]
         
         return {
             'success': True,
             'comments': comments,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_comments': paginator.count
-            }
+            'pagination': pagination
         }
     
     @staticmethod
@@ -366,13 +372,22 @@ class ServiceFeaturesService:
             return {'success': False, 'message': 'Comment not found'}
     
     @staticmethod
-    def get_pending_comments_admin(page=1, per_page=20):
+    def get_pending_comments_admin(page=1, per_page=20, cursor=None):
         queryset = ServiceComment.objects.filter(
             status='PENDING'
         ).select_related('user_id', 'service_id').order_by('-created_at')
         
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        if cursor is not None:
+            rows, pagination = keyset.paginate(queryset, cursor, per_page)
+        else:
+            paginator = Paginator(queryset, per_page)
+            page_obj = paginator.get_page(page)
+            rows = page_obj.object_list
+            pagination = {
+                'current_page': page_obj.number,
+                'total_pages': paginator.num_pages,
+                'total_pending': paginator.count
+            }
         
         comments = [
             {
@@ -391,21 +406,17 @@ class ServiceFeaturesService:
                 'is_verified_purchase': comment.is_verified_purchase,
                 'created_at': comment.created_at.isoformat()
             }
-            for comment in page_obj.object_list
+            for comment in rows
         ]
         
         return {
             'success': True,
             'comments': comments,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_pending': paginator.count
-            }
+            'pagination': pagination
         }
     
     @staticmethod
-    def get_reported_comments_admin(page=1, per_page=20):
+    def get_reported_comments_admin(page=1, per_page=20, cursor=None):
         """Get all reported comments for admin review"""
         queryset = CommentReport.objects.filter(
             resolved=False
@@ -415,8 +426,17 @@ class ServiceFeaturesService:
             'reported_by'
         ).order_by('-created_at')
         
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        if cursor is not None:
+            rows, pagination = keyset.paginate(queryset, cursor, per_page)
+        else:
+            paginator = Paginator(queryset, per_page)
+            page_obj = paginator.get_page(page)
+            rows = page_obj.object_list
+            pagination = {
+                'current_page': page_obj.number,
+                'total_pages': paginator.num_pages,
+                'total_reports': paginator.count
+            }
         
         reports = [
             {
@@ -436,17 +456,13 @@ class ServiceFeaturesService:
                 'reported_by': report.reported_by.email,
                 'created_at': report.created_at.isoformat()
             }
-            for report in page_obj.object_list
+            for report in rows
         ]
         
         return {
             'success': True,
             'reports': reports,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_reports': paginator.count
-            }
+            'pagination': pagination
         }
     
     
@@ -1,34 +1,36 @@
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from asgiref.sync import sync_to_async
 from django.utils import timezone
 from users.models import SupportTicket, TicketMessage, User
+from users.helpers import dashboard_counters, ticket_access
 
 
 class TicketChatConsumer(AsyncWebsocketConsumer):
     
     async def connect(self):
         self.ticket_id = self.scope['url_route']['kwargs']['ticket_id']
-        self.user = self.scope['user'] or "AnonymousUser"  # safe fallback
+        self.user = self.scope['user']
+        self.room_group_name = f'ticket_{self.ticket_id}'
 
-        print("\n" + "="*50)
-        print(f"WEBSOCKET CONNECT: ticket/{self.ticket_id}")
-        print(f"User: {self.user} (authenticated: {self.user.is_authenticated if hasattr(self.user, 'is_authenticated') else 'NO'})")
-        print("="*50 + "\n")
+        if not self.user.is_authenticated:
+            await self.close(code=4401)
+            return
 
-        # FORCE ACCEPT EVERYTHING — FOR TESTING ONLY
-        self.room_group_name = f'ticket_{self.ticket_id}'
+        if not await self.verify_ticket_access():
+            await self.close(code=4403)
+            return
 
         await self.channel_layer.group_add(
             self.room_group_name,
             self.channel_name
         )
 
-        await self.accept()   # This is the only line that matters right now
+        await self.accept(subprotocol=self.scope.get('auth_subprotocol'))
 
         await self.send(text_data=json.dumps({
             'type': 'connection_established',
-            'message': 'YOU ARE CONNECTED! Development mode bypass active',
             'ticket_id': self.ticket_id,
             'user': str(self.user)
         }))
@@ -177,18 +179,7 @@ class TicketChatConsumer(AsyncWebsocketConsumer):
     
     @database_sync_to_async
     def verify_ticket_access(self):
-        try:
-            ticket = SupportTicket.objects.get(id=self.ticket_id)
-        
-            if ticket.user_id == self.user or ticket.assigned_to == self.user:
-                return True
-
-            if self.user.role == 'ADMIN':
-                return True
-            
-            return False
-        except SupportTicket.DoesNotExist:
-            return False
+        return ticket_access.can_access(self.user, self.ticket_id)
     
     @database_sync_to_async
     def save_message(self, message_text):
@@ -257,7 +248,7 @@ class TicketQueueConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
         
-        await self.accept()
+        await self.accept(subprotocol=self.scope.get('auth_subprotocol'))
     
     async def disconnect(self, close_code):
         await self.channel_layer.group_discard(
@@ -292,13 +283,20 @@ class AdminDashboardConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
         
-        await self.accept()
+        await self.accept(subprotocol=self.scope.get('auth_subprotocol'))
 
         stats = await self.get_dashboard_stats()
         await self.send(text_data=json.dumps({
             'type': 'initial_stats',
             'stats': stats
         }))
+
+        order_stats = await sync_to_async(dashboard_counters.read)()
+        if order_stats is not None:
+            await self.send(text_data=json.dumps({
+                'type': 'order_stats',
+                'stats': order_stats
+            }))
     
     async def disconnect(self, close_code):
         await self.channel_layer.group_discard(
@@ -316,6 +314,14 @@ class AdminDashboardConsumer(AsyncWebsocketConsumer):
             'type': event['event_type'],
             'data': event['data']
         }))
+
+    # Pushed by users/helpers/dashboard_counters.py, at most once per DASHBOARD_PUSH_INTERVAL.
+    async def order_stats(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'order_stats',
+            'delta': event['delta'],
+            'stats': event['stats']
+        }))
     
     @database_sync_to_async
     def get_dashboard_stats(self):
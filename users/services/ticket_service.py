@@ -1,5 +1,4 @@
 # services/ticket_service.py
-import secrets
 import redis
 import json
 from datetime import timedelta
@@ -7,7 +6,8 @@ from django.db import transaction, models
 from django.db.models import Count, Q, F, Avg
 from django.utils import timezone
 from django.core.paginator import Paginator
-from django.core.cache import cache
+from users.helpers import ids, keyset
+from users.helpers.cache_ns import CacheNamespace
 from django.core.files.storage import default_storage
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
@@ -165,10 +165,21 @@ class TicketNotificationService:
 class EnhancedTicketService:
     """Enhanced ticket service with real-time support"""
     
+    CACHE_TTL = 300
+
     def __init__(self):
         self.queue_manager = TicketQueueManager()
         self.file_manager = FileUploadManager()
         self.notifier = TicketNotificationService()
+
+    @staticmethod
+    def _user_cache(user_id):
+        return CacheNamespace(f'tickets:user:{user_id}', ttl=EnhancedTicketService.CACHE_TTL, metric='tickets:user')
+
+    @staticmethod
+    def invalidate_user_tickets(user_id):
+        """Drop the cached ticket list and unread counts of ``user_id`` (any ticket or message write)."""
+        EnhancedTicketService._user_cache(user_id).invalidate()
     
     @transaction.atomic
     def create_ticket(self, user, subject, message, category='GENERAL', 
@@ -246,67 +257,71 @@ class EnhancedTicketService:
         except Exception as e:
             return {'success': False, 'message': f'Failed to create ticket: {str(e)}'}
     
-    def get_user_tickets(self, user, page=1, per_page=20, status=None):
+    def get_user_tickets(self, user, page=1, per_page=20, status=None, cursor=None):
         """Get user tickets with caching"""
-        cache_key = f'user_tickets_{user.id}_{status}_{page}'
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        queryset = SupportTicket.objects.filter(user_id=user).select_related(
-            'assigned_to'
-        ).prefetch_related('messages')
-        
-        if status:
-            queryset = queryset.filter(status=status)
-        
-        queryset = queryset.order_by('-created_at')
-        
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        cache_key = f'list:{status}:{page}:{per_page}'
+
+        def load():
+            queryset = SupportTicket.objects.filter(user_id=user).select_related(
+                'assigned_to'
+            ).prefetch_related('messages')
+        
+            if status:
+                queryset = queryset.filter(status=status)
+        
+            queryset = queryset.order_by('-created_at')
+        
+            if cursor is not None:
+                rows, pagination = keyset.paginate(queryset, cursor, per_page)
+            else:
+                paginator = Paginator(queryset, per_page)
+                page_obj = paginator.get_page(page)
+                rows = page_obj.object_list
+                pagination = {
+                    'current_page': page_obj.number,
+                    'total_pages': paginator.num_pages,
+                    'total_tickets': paginator.count
+                }
         
-        tickets = []
-        for ticket in page_obj.object_list:
-            # Get live queue position if in queue
-            queue_position = 0
-            if ticket.queue_position > 0:
-                queue_position = self.queue_manager.get_position(ticket.id)
+            tickets = []
+            for ticket in rows:
+                # Get live queue position if in queue
+                queue_position = 0
+                if ticket.queue_position > 0:
+                    queue_position = self.queue_manager.get_position(ticket.id)
             
-            last_message = ticket.messages.order_by('-created_at').first()
+                last_message = ticket.messages.order_by('-created_at').first()
             
-            tickets.append({
-                'id': ticket.id,
-                'ticket_number': ticket.ticket_number,
-                'subject': ticket.subject,
-                'category': ticket.category,
-                'priority': ticket.priority,
-                'status': ticket.status,
-                'assigned_to': {
-                    'name': f"{ticket.assigned_to.first_name} {ticket.assigned_to.last_name}"
-                } if ticket.assigned_to else None,
-                'queue_position': queue_position,
-                'last_message': {
-                    'message': last_message.message[:100],
-                    'created_at': last_message.created_at.isoformat()
-                } if last_message else None,
-                'unread_count': self._get_unread_count(ticket, user),
-                'created_at': ticket.created_at.isoformat(),
-                'updated_at': ticket.updated_at.isoformat()
-            })
+                tickets.append({
+                    'id': ticket.id,
+                    'ticket_number': ticket.ticket_number,
+                    'subject': ticket.subject,
+                    'category': ticket.category,
+                    'priority': ticket.priority,
+                    'status': ticket.status,
+                    'assigned_to': {
+                        'name': f"{ticket.assigned_to.first_name} {ticket.assigned_to.last_name}"
+                    } if ticket.assigned_to else None,
+                    'queue_position': queue_position,
+                    'last_message': {
+                        'message': last_message.message[:100],
+                        'created_at': last_message.created_at.isoformat()
+                    } if last_message else None,
+                    'unread_count': self._get_unread_count(ticket, user),
+                    'created_at': ticket.created_at.isoformat(),
+                    'updated_at': ticket.updated_at.isoformat()
+                })
         
-        result = {
-            'success': True,
-            'tickets': tickets,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_tickets': paginator.count
+            result = {
+                'success': True,
+                'tickets': tickets,
+                'pagination': pagination
             }
-        }
-        
-        cache.set(cache_key, result, 300)  # Cache for 5 minutes
-        return result
+            return result
+
+        if cursor is not None:
+            return load()
+        return self._user_cache(user.id).fetch(cache_key, load)
     
     @transaction.atomic
     def add_message(self, user, ticket_id, message, attachments=None):
@@ -634,17 +649,13 @@ class EnhancedTicketService:
     
     def _get_unread_count(self, ticket, user):
         """Get unread messages count for user"""
-        cache_key = f'unread_count_{ticket.id}_{user.id}'
-        count = cache.get(cache_key)
-        
-        if count is None:
-            count = TicketMessage.objects.filter(
+        def load():
+            return TicketMessage.objects.filter(
                 ticket_id=ticket,
                 is_internal=False
             ).exclude(user_id=user).count()
-            cache.set(cache_key, count, 300)
-        
-        return count
+
+        return self._user_cache(user.id).fetch(f'unread:{ticket.id}', load)
     
     def _get_available_admins_count(self):
         """Get count of available admins"""
@@ -673,11 +684,9 @@ class EnhancedTicketService:
     @staticmethod
     def _generate_ticket_number():
         """Generate unique ticket number"""
-        timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
-        random_part = secrets.token_hex(3).upper()
-        return f"TKT-{timestamp}-{random_part}"
+        return ids.next_id('TKT')
     
-    def get_my_tickets_admin(self, admin_user, page=1, per_page=20, status=None):
+    def get_my_tickets_admin(self, admin_user, page=1, per_page=20, status=None, cursor=None):
         """Get tickets assigned to admin"""
         queryset = SupportTicket.objects.filter(
             assigned_to=admin_user
@@ -688,8 +697,17 @@ class EnhancedTicketService:
         
         queryset = queryset.order_by('-priority', 'created_at')
         
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        if cursor is not None:
+            rows, pagination = keyset.paginate(queryset, cursor, per_page)
+        else:
+            paginator = Paginator(queryset, per_page)
+            page_obj = paginator.get_page(page)
+            rows = page_obj.object_list
+            pagination = {
+                'current_page': page_obj.number,
+                'total_pages': paginator.num_pages,
+                'total_tickets': paginator.count
+            }
         
         tickets = [
             {
@@ -706,20 +724,16 @@ class EnhancedTicketService:
                 'created_at': ticket.created_at.isoformat(),
                 'updated_at': ticket.updated_at.isoformat()
             }
-            for ticket in page_obj.object_list
+            for ticket in rows
         ]
         
         return {
             'success': True,
             'tickets': tickets,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_tickets': paginator.count
-            }
+            'pagination': pagination
         }
     
-    def get_all_tickets_admin(self, page=1, per_page=20, filters=None):
+    def get_all_tickets_admin(self, page=1, per_page=20, filters=None, cursor=None):
         """Get all tickets with filters for admin"""
         queryset = SupportTicket.objects.select_related(
             'user_id',
@@ -740,8 +754,17 @@ class EnhancedTicketService:
         
         queryset = queryset.order_by('-priority', 'created_at')
         
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        if cursor is not None:
+            rows, pagination = keyset.paginate(queryset, cursor, per_page)
+        else:
+            paginator = Paginator(queryset, per_page)
+            page_obj = paginator.get_page(page)
+            rows = page_obj.object_list
+            pagination = {
+                'current_page': page_obj.number,
+                'total_pages': paginator.num_pages,
+                'total_tickets': paginator.count
+            }
         
         tickets = [
             {
@@ -764,17 +787,13 @@ class EnhancedTicketService:
                 'created_at': ticket.created_at.isoformat(),
                 'updated_at': ticket.updated_at.isoformat()
             }
-            for ticket in page_obj.object_list
+            for ticket in rows
         ]
         
         return {
             'success': True,
             'tickets': tickets,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_tickets': paginator.count
-            }
+            'pagination': pagination
         }
     
     @transaction.atomic
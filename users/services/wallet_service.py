@@ -1,6 +1,7 @@
 from decimal import Decimal
 from django.db import transaction
 from django.core.paginator import Paginator
+from users.helpers import keyset
 from users.models import User, Transaction, Payment
 
 
@@ -120,14 +121,23 @@ class WalletService:
             return {'success': False, 'message': f'Failed to process refund: {str(e)}'}
     
     @staticmethod
-    def get_transactions(user, page=1, per_page=20, transaction_type=None):
+    def get_transactions(user, page=1, per_page=20, transaction_type=None, cursor=None):
         queryset = Transaction.objects.filter(user_id=user).order_by('-created_at')
         
         if transaction_type:
             queryset = queryset.filter(type=transaction_type)
         
-        paginator = Paginator(queryset, per_page)
-        page_obj = paginator.get_page(page)
+        if cursor is not None:
+            rows, pagination = keyset.paginate(queryset, cursor, per_page)
+        else:
+            paginator = Paginator(queryset, per_page)
+            page_obj = paginator.get_page(page)
+            rows = page_obj.object_list
+            pagination = {
+                'current_page': page_obj.number,
+                'total_pages': paginator.num_pages,
+                'total_transactions': paginator.count
+            }
         
         transactions = [{
             'id': t.id,
@@ -138,16 +148,12 @@ class WalletService:
             'description': t.description,
             'reference_id': t.reference_id,
             'created_at': t.created_at.isoformat()
-        } for t in page_obj.object_list]
+        } for t in rows]
         
         return {
             'success': True,
             'transactions': transactions,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_transactions': paginator.count
-            }
+            'pagination': pagination
         }
     
     @staticmethod
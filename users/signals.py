@@ -0,0 +1,36 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework_api_key.models import APIKey
+from users.models import SupportTicket, TicketMessage
+from users.helpers import api_key_resolver, ticket_access
+from users.services.ticket_service import EnhancedTicketService
+
+
+@receiver(post_save, sender=APIKey)
+@receiver(post_delete, sender=APIKey)
+def invalidate_api_key(sender, instance, **kwargs):
+    api_key_resolver.invalidate_prefix(instance.prefix)
+
+
+@receiver(post_save, sender=SupportTicket)
+@receiver(post_delete, sender=SupportTicket)
+def invalidate_ticket_access(sender, instance, update_fields=None, **kwargs):
+    # Chat messages bump updated_at on every send; only ownership matters here.
+    if update_fields and not {'user_id', 'assigned_to'} & set(update_fields):
+        return
+    ticket_access.invalidate(instance.id)
+
+
+@receiver(post_save, sender=SupportTicket)
+@receiver(post_delete, sender=SupportTicket)
+def invalidate_user_tickets(sender, instance, **kwargs):
+    EnhancedTicketService.invalidate_user_tickets(instance.user_id_id)
+
+
+@receiver(post_save, sender=TicketMessage)
+@receiver(post_delete, sender=TicketMessage)
+def invalidate_ticket_messages(sender, instance, **kwargs):
+    # The owner's list shows the last message and the unread count.
+    user_id = SupportTicket.objects.filter(id=instance.ticket_id_id).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        EnhancedTicketService.invalidate_user_tickets(user_id)
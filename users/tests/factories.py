@@ -0,0 +1,42 @@
+"""Minimal model fixtures shared by the users tests."""
+from decimal import Decimal
+from itertools import count
+
+from users.models import Category, Order, Service, Supplier, User
+
+_seq = count(1)
+
+
+def make_user(**fields):
+    n = next(_seq)
+    return User.objects.create(**{
+        'first_name': 'Test', 'last_name': f'User {n}', 'email': f'user{n}@example.com',
+        'password': '!', 'phone_number': str(n), **fields
+    })
+
+
+def make_service(**fields):
+    n = next(_seq)
+    category = fields.pop('category', None) or Category.objects.create(
+        name=f'Category {n}', slug=f'category-{n}', description='', icon='', sort_order=str(n),
+        status='ACTIVE', meta_title='', meta_description=''
+    )
+    supplier = Supplier.objects.create(
+        first_name='Test', last_name='Supplier', api_url='https://supplier.invalid/api',
+        api_key='key', api_type='V2', currency='USD', rate_multipler='1',
+        status='ACTIVE', min_order_amount=1, max_order_amount=1000, support_url='https://supplier.invalid'
+    )
+    return Service.objects.create(**{
+        'category': category, 'supplier': supplier, 'name': f'Service {n}', 'slug': f'service-{n}',
+        'description': '', 'supplier_service_id': n, 'price_per_100': Decimal('2.00'),
+        'supplier_price_per_100': Decimal('1.00'), 'sort_order': n, 'meta_title': '', **fields
+    })
+
+
+def make_order(user, service, **fields):
+    n = next(_seq)
+    return Order.objects.create(**{
+        'user_id': user, 'service_id': service, 'order_number': f'ORD-TEST-{n:06d}',
+        'link': f'https://example.com/p/{n}', 'quantity': 100,
+        'price_paid': Decimal('2.00'), 'profit': Decimal('1.00'), **fields
+    })
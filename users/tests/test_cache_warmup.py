@@ -0,0 +1,29 @@
+from unittest import mock
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.test import RequestFactory, SimpleTestCase
+from users.helpers import cache_warmup
+
+
+class CountedTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(cache_warmup, 'record')
+        self.record = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def view(self, response):
+        params = lambda request: {'limit': int(request.GET.get('limit', 10))}
+        return cache_warmup.counted('featured', params)(lambda request: response)
+
+    def test_counts_200_and_304_responses(self):
+        # catalog_conditional answers 304s and memo hits without reaching the view body.
+        self.view(HttpResponse())(RequestFactory().get('/', {'limit': 5}))
+        self.view(HttpResponseNotModified())(RequestFactory().get('/'))
+        self.assertEqual(self.record.call_args_list, [
+            mock.call('featured', limit=5), mock.call('featured', limit=10)
+        ])
+
+    def test_skips_errors_and_bad_params(self):
+        self.view(HttpResponse(status=400))(RequestFactory().get('/'))
+        self.view(HttpResponse())(RequestFactory().get('/', {'limit': 'x'}))
+        self.record.assert_not_called()
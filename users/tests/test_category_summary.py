@@ -0,0 +1,30 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from admins.services.category_service import CategoryService
+from users.helpers import catalog_snapshot, category_summary
+from .factories import make_service
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CategorySummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.service = make_service(price_per_100=Decimal('1.50'))
+        category_summary.refresh([self.service.category_id])
+
+    def test_refresh_stores_the_active_services(self):
+        self.service.category.refresh_from_db()
+        self.assertEqual(self.service.category.active_services, 1)
+        self.assertEqual(self.service.category.min_price_per_100, Decimal('1.50'))
+        self.assertEqual(category_summary.reconcile(), [])
+
+    def test_public_prices_are_floats(self):
+        categories = catalog_snapshot.build().categories
+        with mock.patch.object(catalog_snapshot, 'current', return_value=None):
+            categories += tuple(CategoryService.get_active_categories()['categories'])
+        for category in categories:
+            self.assertEqual((category['min_price_per_100'], category['max_price_per_100']), (1.5, 1.5))
+            self.assertIsInstance(category['min_price_per_100'], float)
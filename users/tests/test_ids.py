@@ -0,0 +1,79 @@
+import re
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+from users.helpers import ids
+
+ID_RE = re.compile(r'^ORD-\d{14}-[0-9A-HJKMNP-TV-Z]{7}$')
+
+
+class NextIdTests(SimpleTestCase):
+    def setUp(self):
+        # A fixed node keeps Redis out of it; every test starts from a fresh process state.
+        for patcher in (
+            mock.patch.object(ids, 'ID_NODE', 5),
+            mock.patch.dict(ids._state, {'pid': None, 'node': None, 'token': None, 'renew_at': 0.0,
+                                         'last_ms': 0, 'sequence': 0}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def suffix(self, value):
+        number = 0
+        for char in value.rsplit('-', 1)[1]:
+            number = number * 32 + ids.ALPHABET.index(char)
+        return number >> (ids.NODE_BITS + ids.SEQUENCE_BITS), (number >> ids.SEQUENCE_BITS) & ids.MAX_NODE, number & ids.MAX_SEQUENCE
+
+    def test_format_and_node(self):
+        value = ids.next_id('ORD')
+        self.assertRegex(value, ID_RE)
+        self.assertEqual(self.suffix(value)[1], 5)
+
+    def test_ids_increase_within_a_process(self):
+        values = [ids.next_id('ORD') for _ in range(10000)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+
+    def test_unique_across_threads(self):
+        values, lock = [], threading.Lock()
+
+        def generate():
+            batch = [ids.next_id('TXN') for _ in range(2000)]
+            with lock:
+                values.extend(batch)
+
+        threads = [threading.Thread(target=generate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(values)), 8000)
+
+    def test_sequence_overflow_moves_to_the_next_millisecond(self):
+        now_ns = 1_800_000_000_123 * 1_000_000
+        with mock.patch.object(ids.time, 'time_ns', return_value=now_ns):
+            first = ids.next_id('ORD')
+            ids._state['sequence'] = ids.MAX_SEQUENCE
+            second = ids.next_id('ORD')
+        self.assertEqual(self.suffix(first), (123, 5, 0))
+        self.assertEqual(self.suffix(second), (124, 5, 0))
+        self.assertLess(first, second)
+
+    def test_clock_stepping_back_keeps_ids_increasing(self):
+        with mock.patch.object(ids.time, 'time_ns', return_value=1_800_000_000_500 * 1_000_000):
+            first = ids.next_id('ORD')
+        with mock.patch.object(ids.time, 'time_ns', return_value=1_800_000_000_100 * 1_000_000):
+            second = ids.next_id('ORD')
+        self.assertLess(first, second)
+
+    def test_forked_process_leases_its_own_node(self):
+        ids.next_id('ORD')
+        with mock.patch.object(ids, 'ID_NODE', None), \
+                mock.patch.object(ids.os, 'getpid', return_value=-1), \
+                mock.patch.object(ids, 'get_redis_connection', side_effect=ConnectionError), \
+                mock.patch.object(ids.secrets, 'randbelow', return_value=77), \
+                self.assertLogs(ids.logger, 'WARNING'):
+            value = ids.next_id('ORD')
+        self.assertEqual(self.suffix(value)[1], 77)
+        self.assertEqual(ids._state['pid'], -1)
@@ -0,0 +1,43 @@
+import datetime
+import decimal
+import json
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from users.helpers import json_render
+
+
+class DumpsTests(SimpleTestCase):
+    payload = {
+        'price': decimal.Decimal('1.50'),
+        'at': datetime.datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+        'local': datetime.datetime(2026, 1, 2, 3, 4, 5),
+        'day': datetime.date(2026, 1, 2),
+        'time': datetime.time(1, 2, 3, 456789),
+        'duration': datetime.timedelta(seconds=90),
+        'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'label': gettext_lazy('Pending'),
+        'items': [1, 'é', None, True],
+    }
+
+    def expected(self):
+        return json.dumps(self.payload, cls=DjangoJSONEncoder, separators=(',', ':'), ensure_ascii=False).encode()
+
+    def test_matches_django_json_encoder(self):
+        self.assertEqual(json_render.dumps(self.payload), self.expected())
+
+    def test_decimal_and_datetime_wire_format(self):
+        data = json.loads(json_render.dumps({'price': decimal.Decimal('10.00'), 'at': timezone.now()}))
+        self.assertEqual(data['price'], '10.00')
+        self.assertRegex(data['at'], r'^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}Z$')
+
+    def test_stdlib_fallback_matches(self):
+        fallback = json.dumps(self.payload, default=json_render._default, separators=(',', ':'), ensure_ascii=False)
+        self.assertEqual(fallback.encode(), self.expected())
+
+    def test_unknown_types_raise(self):
+        with self.assertRaises(TypeError):
+            json_render.dumps({'x': object()})
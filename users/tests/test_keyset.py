@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.core import signing
+from django.test import TestCase
+from django.utils import timezone
+from users.helpers import keyset
+from users.models import Order
+from .factories import make_order, make_service, make_user
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user, service = make_user(), make_service()
+        start = timezone.now()
+        for i in range(25):
+            order = make_order(user, service)
+            # Groups of three share a timestamp, so the id tie-breaker matters.
+            Order.objects.filter(id=order.id).update(submitted_at=start - timedelta(minutes=i // 3))
+
+    def setUp(self):
+        self.queryset = Order.objects.order_by('-submitted_at')
+        self.expected = list(Order.objects.order_by('-submitted_at', '-id').values_list('id', flat=True))
+
+    def walk(self, per_page):
+        pages, cursor = [], keyset.PageCursor()
+        while True:
+            rows, pagination = keyset.paginate(self.queryset, cursor, per_page)
+            pages.append([row.id for row in rows])
+            if not pagination['has_next']:
+                return pages, pagination
+            cursor = keyset.PageCursor(after=keyset.decode(pagination['next_cursor']))
+
+    def test_forward_pages_cover_every_row_once_in_order(self):
+        pages, last = self.walk(per_page=7)
+        self.assertEqual([len(page) for page in pages], [7, 7, 7, 4])
+        self.assertEqual(sum(pages, []), self.expected)
+        self.assertIsNone(last['next_cursor'])
+
+    def test_backward_pages_mirror_forward_pages(self):
+        pages, last = self.walk(per_page=7)
+        cursor, back = last['previous_cursor'], []
+        while cursor:
+            rows, pagination = keyset.paginate(self.queryset, keyset.PageCursor(before=keyset.decode(cursor)), 7)
+            back.insert(0, [row.id for row in rows])
+            cursor = pagination['previous_cursor']
+        self.assertEqual(back, pages[:-1])
+
+    def test_tampered_cursor_is_rejected(self):
+        _, pagination = keyset.paginate(self.queryset, keyset.PageCursor(), 5)
+        token = pagination['next_cursor']
+        with self.assertRaises(signing.BadSignature):
+            keyset.decode(token[:-2] + ('AA' if not token.endswith('AA') else 'BB'))
+
+    def test_cursor_from_another_ordering_restarts(self):
+        rows, pagination = keyset.paginate(self.queryset, keyset.PageCursor(after=['1']), 5)
+        self.assertEqual([row.id for row in rows], self.expected[:5])
+        self.assertFalse(pagination['has_previous'])
+
+    def test_nullable_ordering_is_not_supported(self):
+        self.assertTrue(keyset.supports(self.queryset))
+        self.assertFalse(keyset.supports(Order.objects.order_by('-completed_at')))
+
+    def test_approximate_count(self):
+        _, pagination = keyset.paginate(self.queryset, keyset.PageCursor(with_count=True), 5)
+        self.assertEqual(pagination['approximate_count'], 25)
@@ -0,0 +1,81 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from admins.services.category_service import CategoryService
+from django.utils import timezone
+from users.helpers import order_rollup
+from users.models import Order, OrderServiceRollup, OrderUserRollup
+from .factories import make_order, make_service, make_user
+
+
+class OrderRollupTests(TestCase):
+    def setUp(self):
+        self.user, self.service = make_user(), make_service()
+        self.today = timezone.localdate()
+
+    def place(self, **fields):
+        order = make_order(self.user, self.service, **fields)
+        order_rollup.apply(added=[order_rollup.row(order)])
+        return order
+
+    def service_rollup(self):
+        return OrderServiceRollup.objects.get(day=self.today, service_id=self.service)
+
+    def test_new_orders_are_added_to_both_tables(self):
+        self.place(price_paid=Decimal('3.00'), profit=Decimal('1.25'))
+        self.place(price_paid=Decimal('2.00'), profit=Decimal('0.50'))
+
+        rollup = self.service_rollup()
+        self.assertEqual((rollup.orders, rollup.pending), (2, 2))
+        self.assertEqual((rollup.revenue, rollup.profit), (Decimal('5.00'), Decimal('1.75')))
+        user_rollup = OrderUserRollup.objects.get(day=self.today, user_id=self.user)
+        self.assertEqual((user_rollup.orders, user_rollup.revenue), (2, Decimal('5.00')))
+
+    def test_status_change_only_moves_status_columns(self):
+        order = self.place(price_paid=Decimal('3.00'))
+        before = order_rollup.row(order)
+        order.status = 'COMPLETED'
+        order.save(update_fields=['status'])
+        order_rollup.apply(added=[order_rollup.row(order)], removed=[before])
+
+        rollup = self.service_rollup()
+        self.assertEqual((rollup.orders, rollup.pending, rollup.completed), (1, 0, 1))
+        self.assertEqual((rollup.revenue, rollup.completed_revenue), (Decimal('3.00'), Decimal('3.00')))
+
+    def test_removed_and_discarded_orders_are_taken_out(self):
+        first, second, third = self.place(), self.place(), self.place()
+        order_rollup.apply(removed=[order_rollup.row(first)])
+        first.delete()
+        order_rollup.discard(Order.objects.filter(id__in=[second.id, third.id]))
+        Order.objects.filter(id__in=[second.id, third.id]).delete()
+
+        rollup = self.service_rollup()
+        self.assertEqual((rollup.orders, rollup.pending, rollup.revenue), (0, 0, Decimal('0')))
+        self.assertEqual(order_rollup.verify(), [])
+
+    def test_category_delete_discards_its_orders(self):
+        self.place(), self.place()
+        result = CategoryService.delete_category(self.service.category_id)
+
+        self.assertTrue(result['success'])
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(OrderUserRollup.objects.get(day=self.today, user_id=self.user).orders, 0)
+        self.assertEqual(order_rollup.verify(), [])
+
+    def test_verify_reports_drift_and_rebuild_fixes_it(self):
+        self.place()
+        make_order(self.user, self.service)  # written without apply()
+        mismatches = order_rollup.verify()
+        self.assertEqual({table for table, _, _ in mismatches}, {'OrderServiceRollup', 'OrderUserRollup'})
+        self.assertEqual(mismatches[0][2]['orders'], (2, 1))
+
+        order_rollup.rebuild()
+        self.assertEqual(order_rollup.verify(), [])
+        self.assertEqual(self.service_rollup().orders, 2)
+
+    def test_to_day(self):
+        self.assertEqual(order_rollup.to_day('2026-03-04'), date(2026, 3, 4))
+        self.assertIsNone(order_rollup.to_day(''))
+        with self.assertRaises(ValueError):
+            order_rollup.to_day('not a date')
@@ -0,0 +1,118 @@
+from django.test import SimpleTestCase, TestCase
+from users.helpers import order_search
+from users.models import Order
+from .factories import make_order, make_service, make_user
+
+
+class ClassifyTests(SimpleTestCase):
+    def assertKind(self, search, kind):
+        self.assertEqual(order_search.classify(search)[0], kind, search)
+
+    def test_links(self):
+        for search in (
+            'https://www.instagram.com/p/Cx1/?igshid=abc',
+            'instagram.com/p/Cx1',
+            'https://www.tiktok.com/@someuser/video/7234567890',
+            'tiktok.com/@someuser',
+            'http://example.com',
+        ):
+            self.assertKind(search, 'link')
+
+    def test_emails(self):
+        for search in ('bob@example.com', 'Bob@Example.com', 'bob@', 'bob@exam', '@gmail.com'):
+            self.assertKind(search, 'email')
+
+    def test_order_numbers_references_and_services(self):
+        self.assertKind('ORD-20261017', 'order_number')
+        self.assertKind('ord-2026', 'order_number')
+        self.assertKind('A1B2C3', 'reference')
+        self.assertKind('12345', 'reference')
+        self.assertKind('instagram likes', 'service')
+        self.assertKind('instagram.com', 'service')
+
+    def test_forced_kind_and_empty(self):
+        self.assertEqual(order_search.classify('email: bob'), ('email', 'bob'))
+        self.assertEqual(order_search.classify('service:123'), ('service', '123'))
+        self.assertEqual(order_search.classify('   '), (None, ''))
+
+
+class NormalizeLinkTests(SimpleTestCase):
+    def test_same_target_same_hash(self):
+        variants = (
+            'https://www.instagram.com/p/Cx1/',
+            'http://instagram.com/p/Cx1',
+            'instagram.com/p/Cx1?utm_source=ig&igshid=abc',
+            'https://m.instagram.com/p/Cx1/#comments',
+        )
+        self.assertEqual({order_search.link_hash(link) for link in variants}, {order_search.link_hash(variants[0])})
+
+    def test_path_case_and_real_parameters_are_kept(self):
+        self.assertEqual(
+            order_search.normalize_link('https://www.YouTube.com/watch?t=5&v=AbC&feature=share'),
+            'youtube.com/watch?v=AbC'
+        )
+        self.assertNotEqual(order_search.link_hash('instagram.com/p/Cx1'), order_search.link_hash('instagram.com/p/cx1'))
+
+    def test_empty_link(self):
+        self.assertEqual(order_search.link_hash(''), '')
+        self.assertEqual(len(order_search.link_hash('example.com')), 32)
+
+
+class FilterOrdersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = make_user(email='alice@example.com')
+        cls.bob = make_user(email='Bob.Smith@example.com')
+        cls.likes = make_service(name='Instagram Likes')
+        cls.views = make_service(name='TikTok Views')
+        cls.followers = make_service(name='1000 Followers 10K Pack')
+
+        def order(user, service, link, **fields):
+            return make_order(user, service, link=link, link_hash=order_search.link_hash(link), **fields)
+
+        cls.post = order(cls.alice, cls.likes, 'https://www.instagram.com/p/Cx1/', order_number='ORD-20261017-0001')
+        cls.video = order(cls.bob, cls.views, 'https://www.tiktok.com/@bob/video/72345', supplier_order_id='SUP-9981')
+        cls.other = order(cls.bob, cls.likes, 'https://instagram.com/p/Other', order_number='ORD-20261018-0002')
+        cls.carol = make_user(email='carol@Gmail.com')
+        cls.pack = order(cls.carol, cls.followers, 'https://instagram.com/carol')
+
+    def ids(self, search):
+        return set(order_search.filter_orders(Order.objects.all(), search).values_list('id', flat=True))
+
+    def test_link_matches_every_pasted_form(self):
+        self.assertEqual(self.ids('instagram.com/p/Cx1?igshid=zz'), {self.post.id})
+        self.assertEqual(self.ids('https://tiktok.com/@bob/video/72345/'), {self.video.id})
+
+    def test_email_exact_and_prefix(self):
+        self.assertEqual(self.ids('alice@example.com'), {self.post.id})
+        self.assertEqual(self.ids('bob.smith@example.com'), {self.video.id, self.other.id})
+        self.assertEqual(self.ids('Bob.Smith@'), {self.video.id, self.other.id})
+        self.assertEqual(self.ids('nobody@'), set())
+
+    def test_leading_at_matches_the_domain(self):
+        self.assertEqual(self.ids('@gmail.com'), {self.pack.id})
+        self.assertEqual(self.ids('@example.com'), {self.post.id, self.video.id, self.other.id})
+        self.assertEqual(self.ids('@gmail'), {self.pack.id})
+
+    def test_order_number_and_reference_prefixes(self):
+        self.assertEqual(self.ids('ORD-20261017-0001'), {self.post.id})
+        self.assertEqual(self.ids('ord-202610'), {self.post.id, self.other.id})
+        self.assertEqual(self.ids('sup-99'), {self.video.id})
+
+    def test_service_names_go_through_the_service_index(self):
+        self.assertEqual(self.ids('instagram likes'), {self.post.id, self.other.id})
+        self.assertEqual(self.ids('tiktok'), {self.video.id})
+
+    def test_reference_like_searches_also_match_service_names(self):
+        self.assertEqual(order_search.classify('1000')[0], 'reference')
+        self.assertEqual(self.ids('1000'), {self.pack.id})
+        self.assertEqual(self.ids('10k'), {self.pack.id})
+        self.assertEqual(self.ids('sup-9981'), {self.video.id})
+
+    def test_empty_search_leaves_the_queryset_alone(self):
+        self.assertEqual(len(self.ids('')), 4)
+
+    def test_backfill_fixes_missing_hashes(self):
+        Order.objects.update(link_hash='')
+        self.assertEqual(order_search.backfill_link_hashes(batch_size=2), 4)
+        self.assertEqual(self.ids('instagram.com/p/Cx1'), {self.post.id})
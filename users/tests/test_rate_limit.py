@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from users.helpers import rate_limit
+
+
+class LocalSlidingWindowTests(SimpleTestCase):
+    def setUp(self):
+        self.window = rate_limit.LocalSlidingWindow()
+        self.now = 1000.0
+        patcher = mock.patch.object(rate_limit.time, 'monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_allows_up_to_limit_then_blocks(self):
+        results = [self.window.hit('k', 3, 60)[0] for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_hits_slide_out_of_the_window(self):
+        self.window.hit('k', 2, 60)
+        self.now += 30
+        self.window.hit('k', 2, 60)
+        self.assertFalse(self.window.hit('k', 2, 60)[0])
+
+        self.now += 31
+        allowed, count, reset = self.window.hit('k', 2, 60)
+        self.assertTrue(allowed)
+        self.assertEqual(count, 2)
+        self.assertAlmostEqual(reset, 29)
+
+    def test_keys_are_counted_separately(self):
+        self.window.hit('a', 1, 60)
+        self.assertFalse(self.window.hit('a', 1, 60)[0])
+        self.assertTrue(self.window.hit('b', 1, 60)[0])
+
+
+@override_settings(RATE_LIMITS={'default': (2, 60)})
+class EnforceTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(rate_limit, '_backend', rate_limit.LocalSlidingWindow())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def request(self):
+        return RequestFactory().get('/api/services')
+
+    def test_over_budget_gets_429_with_retry_after(self):
+        self.assertIsNone(rate_limit.enforce(self.request(), 'user:1'))
+        self.assertIsNone(rate_limit.enforce(self.request(), 'user:1'))
+
+        response = rate_limit.enforce(self.request(), 'user:1')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['X-RateLimit-Remaining'], '0')
+        self.assertEqual(response['Retry-After'], '60')
+
+    def test_headers_report_the_remaining_budget(self):
+        request = self.request()
+        rate_limit.enforce(request, 'user:1')
+        response = rate_limit.add_headers(request, rate_limit.HttpResponse())
+        self.assertEqual(response['X-RateLimit-Limit'], '2')
+        self.assertEqual(response['X-RateLimit-Remaining'], '1')
+
+    def test_fails_open_when_the_backend_errors(self):
+        with mock.patch.object(rate_limit._backend, 'hit', side_effect=ConnectionError):
+            self.assertIsNone(rate_limit.enforce(self.request(), 'user:1'))
+
+    @override_settings(RATE_LIMIT_ENABLED=False)
+    def test_disabled(self):
+        for _ in range(5):
+            self.assertIsNone(rate_limit.enforce(self.request(), 'user:1'))
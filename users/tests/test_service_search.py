@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.test import TestCase
+from admins.services.service_service import ServiceService
+from users.helpers import catalog_snapshot, service_search
+from users.models import Service
+from .factories import make_service
+
+
+class ServiceSearchIndexTests(TestCase):
+    def search(self, text):
+        queryset, _, _ = service_search.filter_services(Service.objects.all(), text)
+        return set(queryset.values_list('id', flat=True))
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        # On SQLite the index is an FTS5 table kept by triggers, which a table
+        # rebuild (e.g. AddField on Service) silently drops.
+        service = make_service(name='Spotify Plays')
+        self.assertEqual(self.search('spotify'), {service.id})
+
+        service.name = 'Soundcloud Plays'
+        service.save()
+        self.assertEqual(self.search('spotify'), set())
+        self.assertEqual(self.search('soundcloud'), {service.id})
+
+        service.delete()
+        self.assertEqual(self.search('soundcloud'), set())
+
+
+    def test_ranked_backends_must_define_query(self):
+        with self.assertRaises(TypeError):
+            service_search.RankedBackend()
+        for backend in (service_search.SQLiteFTSBackend, service_search.PostgresBackend,
+                        service_search.MySQLBackend):
+            backend()
+
+
+class ServiceSearchLimitTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.active = [make_service(name=f'Youtube Views {i}') for i in range(4)]
+        cls.inactive = [make_service(name=f'Youtube Views old {i}', status='INACTIVE') for i in range(6)]
+
+    def setUp(self):
+        if service_search.get_backend().name == 'basic':
+            self.skipTest('the icontains fallback has no cap')
+        patcher = mock.patch.object(service_search, 'SERVICE_SEARCH_LIMIT', 3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_filters_apply_before_the_cap(self):
+        queryset, _, truncated = service_search.filter_services(Service.objects.filter(status='ACTIVE'), 'youtube')
+        self.assertEqual(queryset.count(), 3)
+        self.assertTrue(truncated)
+        self.assertTrue(set(queryset.values_list('id', flat=True)) <= {service.id for service in self.active})
+
+    def test_no_truncation_under_the_cap(self):
+        category = self.active[0].category
+        queryset, _, truncated = service_search.filter_services(Service.objects.filter(category=category), 'youtube')
+        self.assertEqual(set(queryset.values_list('id', flat=True)), {self.active[0].id})
+        self.assertFalse(truncated)
+
+    def test_listing_reports_truncation(self):
+        with mock.patch.object(catalog_snapshot, 'current', return_value=None), \
+                mock.patch.object(ServiceService.CACHE, 'fetch', side_effect=lambda key, compute: compute()):
+            result = ServiceService.get_all_services(search='youtube', per_page=10)
+        self.assertEqual(result['pagination']['total_services'], 3)
+        self.assertTrue(result['pagination']['search_truncated'])
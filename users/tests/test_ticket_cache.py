@@ -0,0 +1,40 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from users.models import SupportTicket, TicketMessage
+from users.services.ticket_service import EnhancedTicketService
+from .factories import make_user
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class UserTicketCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()  # the local-memory cache outlives each test's rollback
+        self.user, self.admin = make_user(), make_user(role='ADMIN')
+        self.service = EnhancedTicketService()
+        self.ticket = self.open_ticket('TKT-1')
+
+    def open_ticket(self, number):
+        return SupportTicket.objects.create(user_id=self.user, ticket_number=number, subject='Help')
+
+    def test_page_size_is_part_of_the_key(self):
+        self.open_ticket('TKT-2')
+        self.assertEqual(len(self.service.get_user_tickets(self.user, per_page=1)['tickets']), 1)
+        self.assertEqual(len(self.service.get_user_tickets(self.user, per_page=20)['tickets']), 2)
+
+    def test_ticket_writes_invalidate_the_list(self):
+        self.assertEqual(self.service.get_user_tickets(self.user)['pagination']['total_tickets'], 1)
+        self.open_ticket('TKT-2')
+        self.assertEqual(self.service.get_user_tickets(self.user)['pagination']['total_tickets'], 2)
+
+        self.ticket.status = 'CLOSED'
+        self.ticket.save(update_fields=['status'])
+        statuses = {t['id']: t['status'] for t in self.service.get_user_tickets(self.user)['tickets']}
+        self.assertEqual(statuses[self.ticket.id], 'CLOSED')
+
+    def test_new_messages_refresh_unread_count(self):
+        self.assertEqual(self.service.get_user_tickets(self.user)['tickets'][0]['unread_count'], 0)
+        TicketMessage.objects.create(ticket_id=self.ticket, user_id=self.admin, message_type='ADMIN', message='Hi')
+
+        ticket = self.service.get_user_tickets(self.user)['tickets'][0]
+        self.assertEqual(ticket['unread_count'], 1)
+        self.assertEqual(ticket['last_message']['message'], 'Hi')
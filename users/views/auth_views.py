@@ -5,11 +5,19 @@ from django.views.decorators.http import require_http_methods
 from ..services.auth_service import AuthService
 from ..helpers.response import APIResponse
 from ..helpers.request import get_client_ip, get_user_agent, get_token_from_request, parse_json_body
+from ..helpers.auth_context import get_request_auth
+from ..helpers import password_pool
+
+
+def _busy(error):
+    response = APIResponse.error(message='Server is busy, please retry shortly', status_code=503)
+    response['Retry-After'] = str(error.retry_after)
+    return response
 
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def register(request):
+async def register(request):
     data, error = parse_json_body(request)
     if error:
         return error
@@ -23,23 +31,27 @@ def register(request):
             message=f'Missing required fields: {", ".join(missing)}'
         )
     
-    result = AuthService.register(
-        first_name=data['first_name'],
-        last_name=data['last_name'],
-        email=data['email'],
-        password=data['password'],
-        phone_number=data['phone_number'],
-        country=data.get('country', 'RU'),
-        timezone=data.get('timezone', 'UTC+5'),
-        ip_address=get_client_ip(request),
-        user_agent=get_user_agent(request)
-    )
+    try:
+        result = await AuthService.aregister(
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            email=data['email'],
+            password=data['password'],
+            phone_number=data['phone_number'],
+            country=data.get('country', 'RU'),
+            timezone=data.get('timezone', 'UTC+5'),
+            ip_address=get_client_ip(request),
+            user_agent=get_user_agent(request)
+        )
+    except password_pool.PoolBusy as e:
+        return _busy(e)
     
     if result['success']:
         user = result['user']
         return APIResponse.created(
             data={
                 'token': result['token'],
+                'refresh_token': result['refresh_token'],
                 'user': {
                     'id': user.id,
                     'email': user.email,
@@ -57,7 +69,7 @@ def register(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def login(request):
+async def login(request):
     data, error = parse_json_body(request)
     if error:
         return error
@@ -74,18 +86,22 @@ def login(request):
             message=f'Missing required fields: {", ".join(missing)}'
         )
     
-    result = AuthService.login(
-        email=data['email'],
-        password=data['password'],
-        ip_address=get_client_ip(request),
-        user_agent=get_user_agent(request)
-    )
+    try:
+        result = await AuthService.alogin(
+            email=data['email'],
+            password=data['password'],
+            ip_address=get_client_ip(request),
+            user_agent=get_user_agent(request)
+        )
+    except password_pool.PoolBusy as e:
+        return _busy(e)
     
     if result['success']:
         user = result['user']
         return APIResponse.success(
             data={
                 'token': result['token'],
+                'refresh_token': result['refresh_token'],
                 'user': {
                     'id': user.id,
                     'email': user.email,
@@ -108,7 +124,14 @@ def logout(request):
     if not token:
         return APIResponse.unauthorized(message='Token not provided')
     
-    result = AuthService.logout(token)
+    refresh_token = None
+    if request.body:
+        data, error = parse_json_body(request)
+        if error:
+            return error
+        refresh_token = data.get('refresh_token')
+    
+    result = AuthService.logout(token, refresh_token=refresh_token)
     
     if result['success']:
         return APIResponse.success(message=result['message'])
@@ -131,7 +154,7 @@ def refresh_token(request):
     
     if result['success']:
         return APIResponse.success(
-            data={'token': result['token']},
+            data={'token': result['token'], 'refresh_token': result['refresh_token']},
             message=result['message']
         )
     
@@ -141,11 +164,11 @@ def refresh_token(request):
 @csrf_exempt
 @require_http_methods(["GET"])
 def me(request):
-    token = get_token_from_request(request)
-    if not token:
+    auth = get_request_auth(request)
+    if not auth.token:
         return APIResponse.unauthorized(message='Token not provided')
     
-    user = AuthService.get_user_from_token(token)
+    user = auth.user
     if not user:
         return APIResponse.unauthorized(message='Invalid or expired token')
     
@@ -3,11 +3,13 @@ from django.views.decorators.http import require_http_methods
 from admins.services.category_service import CategoryService
 from ..helpers.response import APIResponse
 from ..helpers.api_key_require import api_key_required
+from ..helpers.conditional import catalog_conditional
 
 
 @csrf_exempt
 @api_key_required
 @require_http_methods(["GET"])
+@catalog_conditional
 def list_categories(request):
     result = CategoryService.get_active_categories()
     return APIResponse.success(data=result['categories'])
@@ -5,7 +5,7 @@ from users.services.payment_service import PaymentService
 from users.services.order_service import OrderService
 from users.services.auth_service import AuthService
 from users.helpers.response import APIResponse
-from users.helpers.request import parse_json_body
+from users.helpers.request import parse_json_body, get_page_cursor
 from users.helpers.require_login import user_required
 
 
@@ -115,7 +115,11 @@ def get_user_payments(request):
     page = int(request.GET.get('page', 1))
     per_page = int(request.GET.get('per_page', 20))
     
-    result = PaymentService.get_user_payments(request.user, page, per_page)
+    cursor, error = get_page_cursor(request)
+    if error:
+        return error
+
+    result = PaymentService.get_user_payments(request.user, page, per_page, cursor=cursor)
     return APIResponse.success(data=result)
 
 
@@ -0,0 +1,23 @@
+import re
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.views.static import serve
+from users.helpers.image_variants import VARIANT_DIR
+
+MEDIA_CACHE_MAX_AGE = getattr(settings, 'MEDIA_CACHE_MAX_AGE', 86400)
+# Variant names carry a hash of their content, so they never change in place.
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def serve_media(request, path):
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if response.status_code in (200, 304):
+        if path.startswith(f'{VARIANT_DIR}/'):
+            patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+        else:
+            patch_cache_control(response, public=True, max_age=MEDIA_CACHE_MAX_AGE)
+    return response
+
+
+def media_pattern():
+    return r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/'))
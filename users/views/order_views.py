@@ -3,6 +3,7 @@ from django.views.decorators.http import require_http_methods
 from users.services.order_service import OrderService
 from users.services.auth_service import AuthService
 from users.helpers.response import APIResponse
+from users.helpers.request import get_page_cursor
 from users.helpers.api_key_require import api_key_required
 from users.helpers.require_login import user_required
 
@@ -15,7 +16,11 @@ def get_user_orders(request):
     per_page = int(request.GET.get('per_page', 20))
     status = request.GET.get('status')
     
-    result = OrderService.get_user_orders(request.user, page, per_page, status)
+    cursor, error = get_page_cursor(request)
+    if error:
+        return error
+
+    result = OrderService.get_user_orders(request.user, page, per_page, status, cursor=cursor)
     return APIResponse.success(data=result)
 
 
@@ -60,11 +65,16 @@ def get_order_history(request):
     if request.GET.get('search'):
         filters['search'] = request.GET.get('search')
     
+    cursor, error = get_page_cursor(request)
+    if error:
+        return error
+
     result = OrderService.get_user_order_history(
         user=user,
         page=page,
         per_page=per_page,
-        filters=filters if filters else None
+        filters=filters if filters else None,
+        cursor=cursor
     )
     
     return APIResponse.success(data=result)
@@ -2,7 +2,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from users.services.service_features_service import ServiceFeaturesService
 from users.helpers.response import APIResponse
-from users.helpers.request import parse_json_body
+from users.helpers.request import parse_json_body, get_page_cursor
 from users.helpers.require_login import user_required
 
 
@@ -45,11 +45,16 @@ def get_service_comments(request, service_id):
     page = int(request.GET.get('page', 1))
     per_page = int(request.GET.get('per_page', 10))
     
+    cursor, error = get_page_cursor(request)
+    if error:
+        return error
+
     result = ServiceFeaturesService.get_service_comments(
         service_id=service_id,
         page=page,
         per_page=per_page,
-        approved_only=True
+        approved_only=True,
+        cursor=cursor
     )
     
     return APIResponse.success(data=result)
@@ -1,13 +1,39 @@
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from admins.services.service_service import ServiceService
+from users.helpers import cache_warmup
 from users.helpers.api_key_require import api_key_required
 from users.helpers.response import APIResponse
+from users.helpers.request import get_fields
+from users.helpers.conditional import catalog_conditional
+
+
+def _list_params(request):
+    # The arguments list_services passes to get_all_services_encoded; searches are not warmed.
+    if request.GET.get('search'):
+        return None
+    fields, error = get_fields(request, ServiceService.PUBLIC_LISTING)
+    if error:
+        return None
+    is_featured = request.GET.get('is_featured')
+    return {
+        'page': int(request.GET.get('page', 1)),
+        'per_page': int(request.GET.get('per_page', 20)),
+        'category_id': request.GET.get('category_id'),
+        'is_featured': is_featured.lower() == 'true' if is_featured else is_featured,
+        'fields': fields,
+    }
+
+
+def _featured_params(request):
+    return {'limit': int(request.GET.get('limit', 10))}
 
 
 @csrf_exempt
 @require_http_methods(["GET"])
 @api_key_required
+@cache_warmup.counted('list', _list_params)
+@catalog_conditional
 def list_services(request):
     page = int(request.GET.get('page', 1))
     per_page = int(request.GET.get('per_page', 20))
@@ -18,13 +44,18 @@ def list_services(request):
     if is_featured:
         is_featured = is_featured.lower() == 'true'
     
-    result = ServiceService.get_all_services(
+    fields, error = get_fields(request, ServiceService.PUBLIC_LISTING)
+    if error:
+        return error
+    
+    result = ServiceService.get_all_services_encoded(
         page=page,
         per_page=per_page,
         search=search,
         category_id=category_id,
         is_featured=is_featured,
-        status='ACTIVE'
+        status='ACTIVE',
+        fields=fields
     )
     
     return APIResponse.success(data=result)
@@ -33,6 +64,8 @@ def list_services(request):
 @csrf_exempt
 @require_http_methods(["GET"])
 @api_key_required
+@cache_warmup.counted('featured', _featured_params)
+@catalog_conditional
 def get_featured_services(request):
     limit = int(request.GET.get('limit', 10))
     result = ServiceService.get_featured_services(limit=limit)
@@ -49,6 +82,10 @@ def get_services_by_category(request, category_slug):
     result = ServiceService.get_services_by_category(category_slug, page, per_page, request)
     
     if result['success']:
+        cache_warmup.record(
+            'category', slug=category_slug, page=page, per_page=per_page,
+            host=request.get_host(), secure=request.is_secure()
+        )
         return APIResponse.success(data=result)
     
     return APIResponse.not_found(message=result['message'])
@@ -57,6 +94,7 @@ def get_services_by_category(request, category_slug):
 @csrf_exempt
 @require_http_methods(["GET"])
 @api_key_required
+@catalog_conditional
 def get_service(request, slug):
     result = ServiceService.get_service_by_slug(slug)
     
@@ -9,6 +9,7 @@ from django.shortcuts import get_object_or_404
 from users.services import ticket_service
 from users.services import ticket_service
 from users.models import SupportTicket, User
+from users.helpers.request import get_page_cursor
 
 
 @api_view(['POST'])
@@ -72,11 +73,16 @@ def get_my_tickets(request):
     per_page = int(request.GET.get('per_page', 20))
     status_filter = request.GET.get('status')
     
+    cursor, error = get_page_cursor(request)
+    if error:
+        return error
+
     result = ticket_service.get_user_tickets(
         user=request.user,
         page=page,
         per_page=per_page,
-        status=status_filter
+        status=status_filter,
+        cursor=cursor
     )
     
     return Response(result)
@@ -279,10 +285,15 @@ def admin_get_all_tickets(request):
         filters['unassigned'] = True
     
     # ✅ Use the instance directly
+    cursor, error = get_page_cursor(request)
+    if error:
+        return error
+
     result = ticket_service.get_all_tickets_admin(
         page=page,
         per_page=per_page,
-        filters=filters
+        filters=filters,
+        cursor=cursor
     )
     
     return Response(result)
@@ -307,11 +318,16 @@ def admin_get_my_tickets(request):
     status_filter = request.GET.get('status')
     
     # ✅ Use the instance directly
+    cursor, error = get_page_cursor(request)
+    if error:
+        return error
+
     result = ticket_service.get_my_tickets_admin(
         admin_user=request.user,
         page=page,
         per_page=per_page,
-        status=status_filter
+        status=status_filter,
+        cursor=cursor
     )
     
     return Response(result)
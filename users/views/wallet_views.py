@@ -3,7 +3,7 @@ from django.views.decorators.http import require_http_methods
 from users.services.wallet_service import WalletService
 from users.services.checkout_service import CheckoutService
 from users.helpers.response import APIResponse
-from users.helpers.request import parse_json_body
+from users.helpers.request import parse_json_body, get_page_cursor
 from users.helpers.require_login import user_required
 
 
@@ -23,7 +23,11 @@ def get_transactions(request):
     per_page = int(request.GET.get('per_page', 20))
     transaction_type = request.GET.get('type')
     
-    result = WalletService.get_transactions(request.user, page, per_page, transaction_type)
+    cursor, error = get_page_cursor(request)
+    if error:
+        return error
+
+    result = WalletService.get_transactions(request.user, page, per_page, transaction_type, cursor=cursor)
     return APIResponse.success(data=result)
 
 